@@ -3,16 +3,29 @@ Main Streamlit application for Text to Speech Pro.
 A professional TTS application with multiple modes: Basic, Advanced, and Voice Cloning.
 """
 import streamlit as st
+import io
 import logging
 import os
+import time
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Union
 
 # Import utilities and models
+# Engines and the WebRTC stack are imported where they are first used, so the
+# header and sidebar render before their dependencies load
 from models.schemas import BasicTTSRequest, AdvancedTTSRequest, VoiceCloneRequest
-from utils.tts_basic import BasicTTS
-from utils.tts_advanced import AdvancedTTS
-from utils.voice_clone import VoiceClone
+from utils.audio_utils import AudioUtils
+from utils.audio_encoder import PROFILES, AudioEncoder
+from utils.embedding_cache import SpeakerEmbeddingCache
+from utils.synthesis_cache import SynthesisCache
+from utils.job_queue import JobQueue
+from utils import prewarm
+from utils.model_registry import ModelRegistry
+from utils.prewarm import ModelPrewarmer
+
+if TYPE_CHECKING:
+    from utils.webrtc_playback import PlaybackSession
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -310,6 +323,164 @@ class SessionState:
             st.session_state.history = []
         if 'current_tab' not in st.session_state:
             st.session_state.current_tab = "Basic TTS"
+        if 'pending_history' not in st.session_state:
+            st.session_state.pending_history = {}
+        
+        # Resume tracking jobs listed in the URL (survives reloads and restarts)
+        params = st.experimental_get_query_params()
+        for key in ("advanced_job", "clone_job"):
+            if key in params and key not in st.session_state:
+                st.session_state[key] = params[key][0]
+
+
+def track_job(key: str, job_id: str, history_entry: dict):
+    """Remember a submitted job in the session and the URL."""
+    st.session_state[key] = job_id
+    st.session_state.pending_history[job_id] = history_entry
+    params = st.experimental_get_query_params()
+    params[key] = job_id
+    st.experimental_set_query_params(**params)
+
+
+def poll_job(key: str) -> Optional[dict]:
+    """
+    Show progress of the job tracked under ``key``.
+    
+    While the job is queued or running the page re-polls every second;
+    once it has finished the job state is returned.
+    """
+    job_id = st.session_state.get(key)
+    if job_id is None:
+        return None
+    
+    job_queue = JobQueue.shared()
+    job = job_queue.get(job_id)
+    if job is None:
+        return None
+    
+    if job["status"] in (JobQueue.QUEUED, JobQueue.RUNNING):
+        depth = job_queue.queue_depth()
+        st.info(
+            f"🔄 Job {job_id[:8]} is {job['status']} "
+            f"({depth[JobQueue.QUEUED]} queued, {depth[JobQueue.RUNNING]} running)"
+        )
+        time.sleep(1)
+        st.experimental_rerun()
+    
+    history_entry = st.session_state.pending_history.pop(job_id, None)
+    if history_entry and job["status"] == JobQueue.DONE:
+        history_entry["timestamp"] = datetime.now().isoformat()
+        st.session_state.history.append(history_entry)
+    return job
+
+
+def start_live_playback(key: str, session: "PlaybackSession", history_entry: dict):
+    """Remember a live playback session and record it in the history."""
+    st.session_state[key] = session
+    history_entry["timestamp"] = datetime.now().isoformat()
+    st.session_state.history.append(history_entry)
+
+
+def render_live_playback(key: str, file_name: str):
+    """
+    Play the live session tracked under ``key`` through WebRTC.
+    
+    Audio starts as soon as the first sentence is synthesized; the page
+    re-polls until the whole text has been rendered, then offers the WAV.
+    """
+    session = st.session_state.get(key)
+    if session is None:
+        return
+    
+    from streamlit_webrtc import WebRtcMode, webrtc_streamer
+    
+    st.markdown("### 🔊 Live Playback")
+    webrtc_streamer(
+        key=f"{key}_player",
+        mode=WebRtcMode.RECVONLY,
+        source_audio_track=session.track,
+        media_stream_constraints={"video": False, "audio": True},
+        desired_playing_state=True
+    )
+    
+    if session.time_to_first_audio is not None:
+        st.caption(f"⏱️ First audio after {session.time_to_first_audio:.2f}s")
+    
+    if not session.done.is_set():
+        st.info(f"🔄 {session.sentences_done} sentences rendered so far...")
+        time.sleep(1)
+        st.experimental_rerun()
+    elif session.error:
+        st.error(f"❌ Error: {session.error}")
+    else:
+        st.success(f"✅ Finished: {session.sentences_done} sentences")
+        if isinstance(session.output_path, io.BytesIO):
+            data = session.output_path.getvalue()
+        else:
+            with open(session.output_path, "rb") as f:
+                data = f.read()
+        st.download_button(
+            label="⬇️ Download Audio",
+            data=data,
+            file_name=file_name,
+            mime="audio/wav",
+            key=f"{key}_download"
+        )
+
+
+def job_audio(job: dict) -> Optional[bytes]:
+    """Audio of a finished job: its output file, or the in-memory result (None once either is gone)."""
+    if job["output_path"]:
+        try:
+            with open(job["output_path"], "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            # Collected by the output store's retention policy
+            return None
+    return JobQueue.shared().result_audio(job["id"])
+
+
+# Extra download formats, encoded in process only when the user asks for them
+DOWNLOAD_FORMATS = {
+    "MP3": PROFILES["mp3"],
+    "OGG (Opus)": PROFILES["opus"],
+    "FLAC": PROFILES["flac"],
+}
+
+
+def render_format_downloads(source: Union[str, bytes], file_stem: str, key: str):
+    """
+    Offer a result in other formats without encoding anything up front.
+    
+    Each format is encoded on its first click and memoized per result by
+    AudioEncoder, so reruns and repeated downloads reuse the same bytes.
+    
+    Args:
+        source: Result file path or in-memory audio
+        file_stem: Download file name without extension
+        key: Widget key prefix, unique per result
+    """
+    requested = st.session_state.setdefault("requested_formats", {}).setdefault(key, set())
+    columns = st.columns(len(DOWNLOAD_FORMATS))
+    for column, (label, profile) in zip(columns, DOWNLOAD_FORMATS.items()):
+        with column:
+            if label not in requested:
+                if not st.button(f"🎵 Prepare {label}", key=f"{key}_{profile.format}_prepare"):
+                    continue
+                requested.add(label)
+            try:
+                with st.spinner(f"Encoding {label}..."):
+                    data = AudioEncoder.shared().derivative(source, profile)
+            except Exception as e:
+                st.error(f"❌ Could not encode {label}: {str(e)}")
+                continue
+            st.download_button(
+                label=f"⬇️ Download as {label}",
+                data=data,
+                file_name=f"{file_stem}.{profile.extension}",
+                mime=profile.mime,
+                key=f"{key}_{profile.format}_download"
+            )
 
 
 def create_directories():
@@ -319,6 +490,34 @@ def create_directories():
         Path(dir_name).mkdir(parents=True, exist_ok=True)
 
 
+MODEL_STATE_LABELS = {
+    prewarm.WARM: "🟢 warm",
+    prewarm.LOADED: "🟢 loaded",
+    prewarm.WARMING: "🟡 warming up",
+    prewarm.LOADING: "🟡 loading",
+    prewarm.COLD: "⚪ cold",
+    prewarm.FAILED: "🔴 failed",
+}
+
+
+def render_model_status():
+    """Show the prewarm state of each Coqui model."""
+    status = ModelPrewarmer.shared().status()
+    st.markdown("### 🔥 Models")
+    if status["ready"]:
+        st.success("All models are ready")
+    elif status["running"]:
+        st.info("Models are loading in the background; the first conversion may be slow until they are warm.")
+    for model_name, detail in status["models"].items():
+        label = MODEL_STATE_LABELS.get(detail["state"], detail["state"])
+        st.caption(f"{model_name.split('/')[-1]}: {label}")
+    
+    stats = ModelRegistry.shared().stats()
+    if stats["resident"]:
+        budget = f" of {stats['max_bytes'] / 2 ** 20:.0f}MB" if stats["max_bytes"] else ""
+        st.caption(f"Resident: {len(stats['resident'])} models, {stats['bytes'] / 2 ** 20:.0f}MB{budget}")
+
+
 def render_header():
     """Render the application header."""
     st.markdown("""
@@ -352,6 +551,22 @@ def render_sidebar():
         else:
             st.metric("Total Conversions", 0)
         
+        depth = JobQueue.shared().queue_depth()
+        st.metric("Jobs in Queue", depth[JobQueue.QUEUED], delta=f"{depth[JobQueue.RUNNING]} running", delta_color="off")
+        
+        cache_stats = SpeakerEmbeddingCache.shared().stats()
+        st.caption(
+            f"Voice cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['entries']}/{cache_stats['max_entries']} voices)"
+        )
+        output_cache_stats = SynthesisCache.shared().stats()
+        st.caption(
+            f"Output cache: {output_cache_stats['hits']} hits / {output_cache_stats['misses']} misses "
+            f"({output_cache_stats['bytes'] / (1024 * 1024):.1f}MB)"
+        )
+        
+        render_model_status()
+        
         st.markdown("---")
         st.markdown("### ℹ️ Help")
         with st.expander("How to use"):
@@ -368,6 +583,8 @@ def render_sidebar():
 
 def render_basic_tts():
     """Render Basic TTS tab."""
+    from utils.tts_basic import BasicTTS
+    
     st.markdown('<div class="fade-in">', unsafe_allow_html=True)
     
     col1, col2 = st.columns([2, 1])
@@ -459,6 +676,8 @@ def render_basic_tts():
 
 def render_advanced_tts():
     """Render Advanced TTS tab."""
+    from utils.tts_advanced import AdvancedTTS
+    
     st.markdown('<div class="fade-in">', unsafe_allow_html=True)
     
     col1, col2 = st.columns([2, 1])
@@ -490,7 +709,25 @@ def render_advanced_tts():
         st.caption(models[model_name]['description'])
         
         # Speed
-        speed = st.slider("Speed", min_value=0.5, max_value=2.0, value=1.0, step=0.1)
+        speed = st.slider(
+            "Speed", min_value=0.5, max_value=2.0, value=1.0, step=0.1,
+            disabled=not AdvancedTTS.supports_speed(model_name),
+            help="Glow-TTS and YourTTS only; Tacotron2 has no duration control"
+        )
+        
+        # Runtime (ONNX Runtime is available for Glow-TTS)
+        backend = "torch"
+        if AdvancedTTS.supports_backend(model_name, "onnx"):
+            backend = st.radio(
+                "Runtime",
+                options=["torch", "onnx"],
+                format_func=lambda x: {"torch": "PyTorch", "onnx": "ONNX Runtime (CPU)"}[x],
+                horizontal=True,
+                key="advanced_backend"
+            )
+        
+        # Progressive playback
+        live = st.checkbox("Live playback (start with the first sentence)", value=False, key="advanced_live")
         
         # Character count
         if text_input:
@@ -504,53 +741,75 @@ def render_advanced_tts():
         if not text_input.strip():
             st.error("Please enter some text to convert.")
         else:
-            with st.spinner("Generating high-quality speech... This may take a moment."):
-                try:
-                    # Validate and create request
-                    request = AdvancedTTSRequest(
-                        text=text_input,
-                        model_name=model_name,
-                        speed=speed
-                    )
+            try:
+                # Validate and create request
+                request = AdvancedTTSRequest(
+                    text=text_input,
+                    model_name=model_name,
+                    speed=speed,
+                    backend=backend
+                )
+                
+                history_entry = {
+                    "type": "Advanced TTS",
+                    "text": text_input[:100] + "...",
+                    "model": models[model_name]['name'],
+                }
+                
+                if live:
+                    # Stream sentences straight into the WebRTC track
+                    from utils.webrtc_playback import PlaybackSession
                     
-                    # Convert
                     tts = AdvancedTTS()
-                    result = tts.convert(request)
-                    
-                    if result.success:
-                        st.success(result.message)
-                        
-                        # Display audio player
-                        st.markdown("### 🎧 Generated Audio")
-                        st.audio(result.file_path, format="audio/wav")
-                        
-                        # Download button
-                        with open(result.file_path, "rb") as f:
-                            st.download_button(
-                                label="⬇️ Download Audio",
-                                data=f.read(),
-                                file_name="advanced_tts_output.wav",
-                                mime="audio/wav"
-                            )
-                        
-                        # Add to history
-                        st.session_state.history.append({
-                            "type": "Advanced TTS",
-                            "text": text_input[:100] + "...",
-                            "model": models[model_name]['name'],
-                            "timestamp": datetime.now().isoformat()
-                        })
-                    else:
-                        st.error(f"Error: {result.error}")
-                        
-                except Exception as e:
-                    st.error(f"Conversion failed: {str(e)}")
+                    sample_rate = tts.get_sample_rate(model_name)
+                    output_path = tts.output_store.allocate("advanced_live", ".wav")
+                    session = PlaybackSession(
+                        tts.convert_stream(request, output_path=str(output_path)),
+                        sample_rate,
+                        output_path=str(output_path),
+                        on_finished=lambda: tts.output_store.commit(output_path)
+                    )
+                    start_live_playback("advanced_live_session", session, history_entry)
+                else:
+                    # Queue synthesis so the script thread is not pinned
+                    job_id = JobQueue.shared().submit(request)
+                    track_job("advanced_job", job_id, history_entry)
+                
+            except Exception as e:
+                st.error(f"Conversion failed: {str(e)}")
+    
+    render_live_playback("advanced_live_session", "advanced_tts_output.wav")
+    
+    job = poll_job("advanced_job")
+    if job is not None:
+        audio_data = job_audio(job) if job["status"] == JobQueue.DONE else None
+        if job["status"] == JobQueue.DONE and audio_data is None:
+            st.warning("⚠️ This result has been cleaned up from the outputs folder. Please convert again.")
+        elif job["status"] == JobQueue.DONE:
+            st.success(job["message"])
+            
+            # Display audio player
+            st.markdown("### 🎧 Generated Audio")
+            st.audio(audio_data, format="audio/wav")
+            
+            # Download button
+            st.download_button(
+                label="⬇️ Download Audio",
+                data=audio_data,
+                file_name="advanced_tts_output.wav",
+                mime="audio/wav"
+            )
+            render_format_downloads(job["output_path"], "advanced_tts_output", f"advanced_{job['id']}")
+        else:
+            st.error(f"Error: {job['error']}")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
 
 def render_voice_clone():
     """Render Voice Cloning tab."""
+    from utils.voice_clone import VoiceClone
+    
     st.markdown('<div class="fade-in">', unsafe_allow_html=True)
     
     st.markdown("""
@@ -573,24 +832,19 @@ def render_voice_clone():
         )
         
         if uploaded_file:
-            # Save uploaded file temporarily
-            temp_dir = Path("temp")
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            
-            temp_audio_path = temp_dir / f"ref_{uploaded_file.name}"
-            with open(temp_audio_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+            # Keep the upload in memory; it is never written to disk
+            reference_audio = uploaded_file.getvalue()
             
             # Validate audio
             voice_clone = VoiceClone()
-            validation = voice_clone.validate_reference_audio(str(temp_audio_path))
+            validation = voice_clone.validate_reference_audio(reference_audio)
             
             if validation.get("valid"):
                 st.success(f"✅ Audio valid: {validation['duration']}s | {validation['sample_rate']}Hz | {validation['channels']}")
                 
                 # Display audio player
                 st.markdown("#### 🎧 Preview Reference Voice")
-                st.audio(str(temp_audio_path), format="audio/wav")
+                st.audio(reference_audio, format=uploaded_file.type or "audio/wav")
             else:
                 st.error(f"❌ Invalid audio: {validation.get('message')}")
                 
@@ -619,6 +873,12 @@ def render_voice_clone():
         
         # Pitch control
         pitch = st.slider("Pitch Adjustment", min_value=-12, max_value=12, value=0, step=1)
+        
+        # Progressive playback
+        live = st.checkbox("Live playback (start with the first sentence)", value=False, key="clone_live")
+        
+        # Only write the result to outputs/ when asked to
+        persist = st.checkbox("Save output to the outputs folder", value=False, key="clone_persist")
     
     st.markdown("---")
     
@@ -658,10 +918,6 @@ def render_voice_clone():
         elif not text_input.strip():
             st.error("⚠️ Please enter some text to speak.")
         else:
-            # Progress message
-            progress_placeholder = st.empty()
-            progress_placeholder.info("🔄 Initializing voice cloning model...")
-            
             try:
                 # Create request
                 request = VoiceCloneRequest(
@@ -669,73 +925,84 @@ def render_voice_clone():
                     language=language
                 )
                 
-                # Update progress
-                progress_placeholder.info("🔄 Processing reference audio...")
+                history_entry = {
+                    "type": "Voice Cloning",
+                    "text": text_input[:100] + "...",
+                    "language": language,
+                    "style": voice_style,
+                }
                 
-                # Clone voice
-                voice_clone = VoiceClone()
-                result = voice_clone.clone_voice(
-                    request=request,
-                    reference_audio_path=str(temp_audio_path)
-                )
-                
-                if result.success:
-                    progress_placeholder.success("✅ Voice cloned successfully!")
-                    
-                    # Display results in a nice card
-                    st.markdown("""
-                    <div class="card">
-                        <h3>🎧 Generated Audio</h3>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Display audio player
-                    st.audio(result.file_path, format="audio/wav")
-                    
-                    # Get audio info
-                    audio_info = AudioUtils.get_audio_info(result.file_path)
-                    if audio_info.get("success"):
-                        col_info1, col_info2, col_info3 = st.columns(3)
-                        with col_info1:
-                            st.metric("Duration", f"{audio_info.get('duration', 0)}s")
-                        with col_info2:
-                            st.metric("Sample Rate", f"{audio_info.get('sample_rate', 0)}Hz")
-                        with col_info3:
-                            st.metric("File Size", f"{audio_info.get('file_size_mb', 0)}MB")
-                    
-                    # Download button
-                    with open(result.file_path, "rb") as f:
-                        st.download_button(
-                            label="⬇️ Download Cloned Voice Audio",
-                            data=f.read(),
-                            file_name="cloned_voice.wav",
-                            mime="audio/wav"
-                        )
-                    
-                    # Also offer MP3 option
-                    mp3_path = result.file_path.replace('.wav', '.mp3')
-                    if AudioUtils.convert_format(result.file_path, mp3_path):
-                        with open(mp3_path, "rb") as f:
-                            st.download_button(
-                                label="⬇️ Download as MP3",
-                                data=f.read(),
-                                file_name="cloned_voice.mp3",
-                                mime="audio/mp3"
-                            )
+                if live:
+                    # Stream sentences straight into the WebRTC track
+                    from utils.webrtc_playback import PlaybackSession
                     
-                    # Add to history
-                    st.session_state.history.append({
-                        "type": "Voice Cloning",
-                        "text": text_input[:100] + "...",
-                        "language": language,
-                        "style": voice_style,
-                        "timestamp": datetime.now().isoformat()
-                    })
+                    voice_clone = VoiceClone()
+                    if persist:
+                        output = str(voice_clone.output_store.allocate("cloned_voice_live", ".wav"))
+                    else:
+                        output = io.BytesIO()
+                    session = PlaybackSession(
+                        voice_clone.clone_voice_stream(
+                            request,
+                            reference_audio=reference_audio,
+                            output_path=output
+                        ),
+                        voice_clone.sample_rate,
+                        output_path=output,
+                        on_finished=lambda: voice_clone.output_store.commit(output) if persist else None
+                    )
+                    start_live_playback("clone_live_session", session, history_entry)
                 else:
-                    progress_placeholder.error(f"❌ Error: {result.error}")
-                    
+                    # Queue cloning; the job holds the upload buffer in memory
+                    job_id = JobQueue.shared().submit(request, reference_audio=reference_audio, persist=persist)
+                    track_job("clone_job", job_id, history_entry)
+                
             except Exception as e:
-                progress_placeholder.error(f"❌ Voice cloning failed: {str(e)}")
+                st.error(f"❌ Voice cloning failed: {str(e)}")
+    
+    render_live_playback("clone_live_session", "cloned_voice.wav")
+    
+    job = poll_job("clone_job")
+    if job is not None:
+        audio_data = job_audio(job) if job["status"] == JobQueue.DONE else None
+        if job["status"] == JobQueue.DONE and audio_data is None:
+            st.warning("⚠️ This result is no longer available (not saved, or cleaned up). Please clone again.")
+        elif job["status"] == JobQueue.DONE:
+            st.success(f"✅ Voice cloned successfully! ({job['run_seconds']}s)")
+            
+            # Display results in a nice card
+            st.markdown("""
+            <div class="card">
+                <h3>🎧 Generated Audio</h3>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            # Display audio player
+            st.audio(audio_data, format="audio/wav")
+            
+            # Get audio info
+            audio_info = AudioUtils.get_audio_info(audio_data)
+            if audio_info.get("success"):
+                col_info1, col_info2, col_info3 = st.columns(3)
+                with col_info1:
+                    st.metric("Duration", f"{audio_info.get('duration', 0)}s")
+                with col_info2:
+                    st.metric("Sample Rate", f"{audio_info.get('sample_rate', 0)}Hz")
+                with col_info3:
+                    st.metric("File Size", f"{audio_info.get('file_size_mb', 0)}MB")
+            
+            # Download button
+            st.download_button(
+                label="⬇️ Download Cloned Voice Audio",
+                data=audio_data,
+                file_name="cloned_voice.wav",
+                mime="audio/wav"
+            )
+            
+            # Other formats are only encoded when asked for
+            render_format_downloads(audio_data, "cloned_voice", f"clone_{job['id']}")
+        else:
+            st.error(f"❌ Error: {job['error']}")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -760,6 +1027,9 @@ def main():
     SessionState.init()
     create_directories()
     
+    # Load and warm models off the script thread, once per process (opt-in with TTS_PREWARM=1)
+    ModelPrewarmer.shared().start()
+    
     # Render header
     render_header()
     
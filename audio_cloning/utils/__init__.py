@@ -1,5 +1,6 @@
 """Utils package for Voice Cloning."""
 from utils.voice_clone import VoiceClone
+from utils.model_registry import ModelRegistry
 
-__all__ = ['VoiceClone']
+__all__ = ['VoiceClone', 'ModelRegistry']
 
@@ -0,0 +1,106 @@
+"""
+Process-wide registry of loaded Coqui TTS models.
+"""
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """Thread-safe registry that loads each TTS model once per process."""
+
+    _shared: Optional["ModelRegistry"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, loader: Optional[Callable[[str], object]] = None, progress_bar: bool = True):
+        """
+        Initialize an empty registry.
+
+        Args:
+            loader: Callable that builds a model from its name (defaults to ``TTS(model_name=...)``)
+            progress_bar: Whether the default loader shows the download progress bar
+        """
+        self._loader = loader or self._load_tts
+        self._progress_bar = progress_bar
+        self._models: Dict[str, object] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "ModelRegistry":
+        """Get the registry shared by every session in this process."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def get(self, model_name: str):
+        """
+        Get a loaded model, loading it on first use.
+
+        Concurrent callers asking for the same model wait on a per-model lock,
+        so the model is only loaded once; other models can load in parallel.
+
+        Args:
+            model_name: Coqui model name (e.g. 'tts_models/en/ljspeech/glow-tts')
+
+        Returns:
+            Loaded TTS instance
+        """
+        model = self._models.get(model_name)
+        if model is not None:
+            return model
+
+        with self._model_lock(model_name):
+            model = self._models.get(model_name)
+            if model is None:
+                logger.info(f"Loading model into registry: {model_name}")
+                model = self._loader(model_name)
+                self._models[model_name] = model
+                logger.info(f"Model loaded: {model_name}")
+        return model
+
+    def is_loaded(self, model_name: str) -> bool:
+        """Check whether a model is already resident."""
+        return model_name in self._models
+
+    def loaded_models(self) -> List[str]:
+        """Get names of all resident models."""
+        return list(self._models)
+
+    def unload(self, model_name: str) -> bool:
+        """
+        Drop a model from the registry.
+
+        Args:
+            model_name: Model to unload
+
+        Returns:
+            True if the model was resident, False otherwise
+        """
+        with self._model_lock(model_name):
+            model = self._models.pop(model_name, None)
+        if model is not None:
+            logger.info(f"Model unloaded: {model_name}")
+        return model is not None
+
+    def clear(self) -> None:
+        """Unload every model."""
+        for model_name in self.loaded_models():
+            self.unload(model_name)
+
+    def _model_lock(self, model_name: str) -> threading.Lock:
+        """Get (or create) the lock guarding a single model."""
+        with self._lock:
+            lock = self._locks.get(model_name)
+            if lock is None:
+                lock = self._locks[model_name] = threading.Lock()
+            return lock
+
+    def _load_tts(self, model_name: str):
+        """Default loader building a Coqui ``TTS`` instance."""
+        from TTS.api import TTS
+        return TTS(model_name=model_name, progress_bar=self._progress_bar)
@@ -5,8 +5,10 @@ import logging
 import numpy as np
 import soundfile as sf
 from pathlib import Path
+from typing import Optional
 from TTS.api import TTS
 from models.schemas import VoiceCloneRequest, TTSResponse
+from utils.model_registry import ModelRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,8 @@ logger = logging.getLogger(__name__)
 class VoiceClone:
     """Voice cloning using Coqui TTS."""
     
+    MODEL_NAME = "tts_models/multilingual/multi-dataset/your_tts"
+    
     SUPPORTED_LANGUAGES = {
         'en': 'English',
         'es': 'Spanish',
@@ -27,24 +31,32 @@ class VoiceClone:
         'zh': 'Chinese',
     }
     
-    def __init__(self, output_dir: str = "outputs", temp_dir: str = "temp"):
-        """Initialize VoiceClone with output and temp directories."""
+    def __init__(
+        self,
+        output_dir: str = "outputs",
+        temp_dir: str = "temp",
+        registry: Optional[ModelRegistry] = None
+    ):
+        """
+        Initialize VoiceClone with output and temp directories.
+        
+        Args:
+            output_dir: Directory for generated audio
+            temp_dir: Directory for intermediate files
+            registry: Model registry to borrow the model from (defaults to the process-wide one)
+        """
         self.output_dir = Path(output_dir)
         self.temp_dir = Path(temp_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self.registry = registry or ModelRegistry.shared()
         self._tts = None
     
     @property
     def tts(self) -> TTS:
-        """Lazy loading of TTS model."""
+        """Lazy loading of TTS model from the shared registry."""
         if self._tts is None:
-            logger.info("Loading voice cloning model...")
-            self._tts = TTS(
-                model_name="tts_models/multilingual/multi-dataset/your_tts",
-                progress_bar=True
-            )
-            logger.info("Voice cloning model loaded successfully")
+            self._tts = self.registry.get(self.MODEL_NAME)
         return self._tts
     
     def clone_voice(
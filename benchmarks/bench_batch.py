@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Compare VoiceClone.clone_batch against calling clone_voice in a loop.
+
+Usage:
+    python benchmarks/bench_batch.py english.wav --count 50
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.schemas import VoiceCloneRequest  # noqa: E402
+from utils.voice_clone import VoiceClone  # noqa: E402
+
+PROMPTS = [
+    "Welcome back, your order is on its way.",
+    "Please hold while we connect your call.",
+    "The meeting has been moved to three o'clock.",
+    "Thank you for your patience. We appreciate it.",
+    "Your password was changed successfully.",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("reference", help="Reference audio file")
+    parser.add_argument("--count", type=int, default=20, help="Number of prompts")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--batch-size", type=int, default=VoiceClone.BATCH_SIZE)
+    args = parser.parse_args()
+
+    texts = [PROMPTS[i % len(PROMPTS)] + f" Item {i}." for i in range(args.count)]
+    voice_clone = VoiceClone(output_dir="outputs/bench")
+
+    # Warm the model so neither side pays for loading
+    voice_clone.tts
+
+    voice_clone.embedding_cache.clear()
+    start = time.perf_counter()
+    for text in texts:
+        voice_clone.clone_voice(VoiceCloneRequest(text=text, language=args.language), args.reference)
+    loop_time = time.perf_counter() - start
+
+    voice_clone.embedding_cache.clear()
+    start = time.perf_counter()
+    results = voice_clone.clone_batch(texts, args.reference, args.language, batch_size=args.batch_size)
+    batch_time = time.perf_counter() - start
+
+    failed = sum(not r.success for r in results)
+    print(f"items:       {args.count} ({failed} failed)")
+    print(f"loop:        {loop_time:.2f}s  {args.count / loop_time:.2f} items/s")
+    print(f"clone_batch: {batch_time:.2f}s  {args.count / batch_time:.2f} items/s")
+    print(f"speedup:     {loop_time / batch_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Measure bytes written per voice-clone request: temp-file pipeline vs in-memory.
+
+The file pipeline mirrors the old Streamlit flow (upload saved to temp/,
+output WAV written, MP3 exported by pydub/ffmpeg). The in-memory pipeline
+passes the upload buffer through validation, cloning and MP3 encoding.
+Counters come from /proc/self/io (Linux), which includes reaped ffmpeg
+children. The synthesis cache is disabled so every request synthesizes.
+
+Usage:
+    python benchmarks/bench_clone_io.py english.wav --count 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.schemas import VoiceCloneRequest  # noqa: E402
+from utils.audio_utils import AudioUtils  # noqa: E402
+from utils.synthesis_cache import SynthesisCache  # noqa: E402
+from utils.voice_clone import VoiceClone  # noqa: E402
+
+TEXT = "Thank you for calling. Your request number {} has been received."
+
+
+def io_counters() -> dict:
+    """Characters passed to write() and bytes sent to storage so far."""
+    with open("/proc/self/io") as f:
+        fields = dict(line.split(": ") for line in f.read().splitlines())
+    return {"wchar": int(fields["wchar"]), "write_bytes": int(fields["write_bytes"])}
+
+
+def file_pipeline(voice_clone: VoiceClone, upload: bytes, name: str, request: VoiceCloneRequest) -> int:
+    """Old flow; returns the size of the MP3 offered for download."""
+    temp_audio_path = voice_clone.temp_dir / f"ref_{name}"
+    with open(temp_audio_path, "wb") as f:
+        f.write(upload)
+    voice_clone.validate_reference_audio(str(temp_audio_path))
+    result = voice_clone.clone_voice(request, reference_audio_path=str(temp_audio_path))
+    with open(result.file_path, "rb") as f:
+        f.read()
+    mp3_path = result.file_path.replace(".wav", ".mp3")
+    AudioUtils.convert_format(result.file_path, mp3_path)
+    return os.path.getsize(mp3_path)
+
+
+def memory_pipeline(voice_clone: VoiceClone, upload: bytes, request: VoiceCloneRequest) -> int:
+    """New flow; returns the size of the MP3 offered for download."""
+    voice_clone.validate_reference_audio(upload)
+    result = voice_clone.clone_voice(request, reference_audio=upload, persist=False)
+    return len(AudioUtils.transcode(result.audio_data, "mp3") or b"")
+
+
+def measure(label: str, run, count: int) -> None:
+    before = io_counters()
+    for i in range(count):
+        run(i)
+    after = io_counters()
+    per_request = {key: (after[key] - before[key]) / count for key in before}
+    print(
+        f"{label:<10} wchar {per_request['wchar'] / 1024:10.1f} KiB/request   "
+        f"write_bytes {per_request['write_bytes'] / 1024:10.1f} KiB/request"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("reference", help="Reference audio file (stands in for the upload)")
+    parser.add_argument("--count", type=int, default=5, help="Requests per pipeline")
+    parser.add_argument("--language", default="en")
+    args = parser.parse_args()
+
+    upload = Path(args.reference).read_bytes()
+    with tempfile.TemporaryDirectory() as workdir:
+        voice_clone = VoiceClone(
+            output_dir=os.path.join(workdir, "outputs"),
+            temp_dir=os.path.join(workdir, "temp"),
+            synthesis_cache=SynthesisCache(max_bytes=0),
+        )
+        # Load the model and warm the embedding cache so both sides only pay for the pipeline
+        voice_clone.get_speaker_embedding(upload)
+
+        def request(i: int) -> VoiceCloneRequest:
+            return VoiceCloneRequest(text=TEXT.format(i), language=args.language)
+
+        measure("file", lambda i: file_pipeline(voice_clone, upload, Path(args.reference).name, request(i)), args.count)
+        measure("in-memory", lambda i: memory_pipeline(voice_clone, upload, request(i + args.count)), args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Compare the NumPy effects path of AudioUtils with the pydub fallback.
+
+Generates a 10-minute 44.1kHz stereo WAV (speech-like bursts with silent
+lead-in and tail) and times trim_silence, change_volume, normalize_audio,
+convert_format and merge_audio on both paths. Conversions to compressed
+formats through pydub need ffmpeg; they are skipped without it.
+
+Usage:
+    python benchmarks/bench_effects.py --minutes 10
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.audio_utils import AudioUtils  # noqa: E402
+
+SAMPLE_RATE = 44100
+
+
+def make_file(path: Path, minutes: float, block_seconds: int = 60) -> None:
+    """Write a test file block by block: 2s silence, bursts of tone and noise, 2s silence."""
+    rng = np.random.default_rng(0)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    silence = 2 * SAMPLE_RATE
+    with sf.SoundFile(str(path), "w", SAMPLE_RATE, 2, subtype="PCM_16") as f:
+        for start in range(0, total, block_seconds * SAMPLE_RATE):
+            n = min(block_seconds * SAMPLE_RATE, total - start)
+            t = (start + np.arange(n)) / SAMPLE_RATE
+            envelope = (np.sin(2 * np.pi * 0.7 * t) > -0.3).astype(np.float32)
+            mono = envelope * (0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(n))
+            index = start + np.arange(n)
+            mono[(index < silence) | (index >= total - silence)] = 0
+            f.write(np.stack([mono, 0.8 * mono], axis=1).astype(np.float32))
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    ok = fn()
+    elapsed = time.perf_counter() - start
+    if not ok:
+        raise RuntimeError("operation failed")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10.0, help="Length of the test file")
+    args = parser.parse_args()
+
+    has_ffmpeg = shutil.which("ffmpeg") is not None
+    with tempfile.TemporaryDirectory() as workdir:
+        work = Path(workdir)
+        source = work / "long.wav"
+        half = work / "half.wav"
+        make_file(source, args.minutes)
+        make_file(half, args.minutes / 2)
+        print(f"Test file: {args.minutes:.0f} min stereo, {source.stat().st_size / 2 ** 20:.0f}MB")
+
+        cases = [
+            ("trim_silence",
+             lambda: AudioUtils.trim_silence(str(source), str(work / "n_trim.wav")),
+             lambda: AudioUtils._trim_silence_pydub(str(source), str(work / "p_trim.wav")),
+             True),
+            ("change_volume",
+             lambda: AudioUtils.change_volume(str(source), str(work / "n_vol.wav"), -6.0),
+             lambda: AudioUtils._change_volume_pydub(str(source), str(work / "p_vol.wav"), -6.0),
+             True),
+            ("merge_audio",
+             lambda: AudioUtils.merge_audio([str(half), str(half)], str(work / "n_merge.wav")),
+             lambda: AudioUtils._merge_audio_pydub([str(half), str(half)], str(work / "p_merge.wav")),
+             True),
+            ("convert wav->flac",
+             lambda: AudioUtils.convert_format(str(source), str(work / "n_conv.flac")),
+             lambda: AudioUtils._convert_format_pydub(str(source), str(work / "p_conv.flac"), "flac"),
+             has_ffmpeg),
+        ]
+
+        print(f"{'operation':<20}{'numpy':>10}{'pydub':>10}{'speedup':>10}")
+        for name, numpy_fn, pydub_fn, run_pydub in cases:
+            numpy_time = timed(numpy_fn)
+            if run_pydub:
+                pydub_time = timed(pydub_fn)
+                print(f"{name:<20}{numpy_time:>9.2f}s{pydub_time:>9.2f}s{pydub_time / numpy_time:>9.1f}x")
+            else:
+                print(f"{name:<20}{numpy_time:>9.2f}s{'n/a':>10}{'(no ffmpeg)':>12}")
+
+
+if __name__ == "__main__":
+    main()
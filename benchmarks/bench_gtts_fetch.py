@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Compare serial gTTS segment fetching with the pooled parallel SegmentFetcher.
+
+Runs against a local stand-in for the Google Translate batchexecute endpoint
+that answers in the same response format after an injected latency (and
+optionally fails a share of requests with 503 to exercise retries). The
+"audio" of each segment is its text, so the reassembled output can be
+checked for order. The serial baseline mirrors gTTS.stream: one request at
+a time, each over a new connection.
+
+Usage:
+    python benchmarks/bench_gtts_fetch.py --chars 5000 --latency-ms 150 --workers 8
+    python benchmarks/bench_gtts_fetch.py --serve --port 8765   # stand-in only, for TTS_GTTS_BASE_URL
+"""
+import argparse
+import base64
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from gtts import gTTS
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.segment_fetcher import AUDIO_PATTERN, SegmentFetcher  # noqa: E402
+
+SENTENCE = "The quick brown fox jumps over the lazy dog while the band plays on. "
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Mimics the translate batchexecute endpoint used by gTTS."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+        time.sleep(max(0.0, self.server.latency + random.uniform(-self.server.jitter, self.server.jitter)))
+        with self.server.stats_lock:
+            self.server.requests += 1
+        if random.random() < self.server.fail_rate:
+            self._reply(503, b"")
+            return
+
+        # f.req = [[["jQ1olc", "[text, lang, speed, \"null\"]", null, "generic"]]]
+        rpc = json.loads(parse_qs(body)["f.req"][0])
+        text = json.loads(rpc[0][0][1])[0]
+        audio = base64.b64encode(text.encode()).decode()
+        line = json.dumps([["wrb.fr", "jQ1olc", f'["{audio}"]', None, None, None, "generic"]], separators=(",", ":"))
+        payload = ")]}'\n\n" + line
+        self._reply(200, payload.encode())
+
+    def _reply(self, status: int, payload: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in(port: int, latency: float, jitter: float, fail_rate: float) -> ThreadingHTTPServer:
+    """Start the stand-in server on a daemon thread."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInHandler)
+    server.daemon_threads = True
+    server.latency, server.jitter, server.fail_rate = latency, jitter, fail_rate
+    server.stats_lock = threading.Lock()
+    server.connections = server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fetch_serial(tts: gTTS, base_url: str) -> bytes:
+    """gTTS.stream's strategy: segments one after another, a new connection each."""
+    audio = []
+    for request in tts._prepare_requests():
+        request.url = base_url + urlsplit(request.url).path
+        with requests.Session() as session:
+            response = session.send(request, timeout=SegmentFetcher.DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        audio.append(base64.b64decode(AUDIO_PATTERN.search(response.text).group(1)))
+    return b"".join(audio)
+
+
+def measure(server: ThreadingHTTPServer, fetch) -> tuple:
+    """Run one fetch; return (seconds, audio, connections opened, requests served)."""
+    connections, served = server.connections, server.requests
+    start = time.perf_counter()
+    audio = fetch()
+    return time.perf_counter() - start, audio, server.connections - connections, server.requests - served
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chars", type=int, default=5000, help="Length of the synthesized text")
+    parser.add_argument("--workers", type=int, default=SegmentFetcher.DEFAULT_WORKERS)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Stand-in response latency")
+    parser.add_argument("--jitter-ms", type=float, default=30.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--serve", action="store_true", help="Only run the stand-in server")
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args()
+
+    server = start_stand_in(args.port, args.latency_ms / 1000, args.jitter_ms / 1000, args.fail_rate)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    if args.serve:
+        print(f"Stand-in translate endpoint on {base_url} (set TTS_GTTS_BASE_URL={base_url})")
+        threading.Event().wait()
+
+    text = (SENTENCE * (args.chars // len(SENTENCE) + 1))[:args.chars]
+    tts = gTTS(text=text, lang="en")
+    segments = tts._tokenize(text)
+    expected = "".join(segments).encode()
+    fetcher = SegmentFetcher(max_workers=args.workers, base_url=base_url)
+
+    print(f"{len(text)} chars, {len(segments)} segments, {args.latency_ms:.0f}ms latency, "
+          f"{args.fail_rate:.0%} failures")
+    results = []
+    if args.fail_rate == 0:
+        results.append(("serial", measure(server, lambda: fetch_serial(tts, base_url))))
+    # The first pooled pass opens the connections; the second reuses them
+    results.append((f"pooled x{args.workers} (cold)", measure(server, lambda: fetcher.fetch(tts))))
+    results.append((f"pooled x{args.workers} (warm)", measure(server, lambda: fetcher.fetch(tts))))
+
+    baseline = results[0][1][0]
+    for name, (seconds, audio, connections, served) in results:
+        status = "ok" if audio == expected else "OUT OF ORDER"
+        print(f"  {name:<22}{seconds:>7.2f}s  {baseline / seconds:>5.1f}x  "
+              f"{connections:>3} connections  {served:>3} requests  {status}")
+    fetcher.close()
+
+
+if __name__ == "__main__":
+    main()
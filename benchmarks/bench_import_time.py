@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Report cold import time of the packages and engine modules.
+
+Each target is imported in a fresh interpreter under ``python -X importtime``.
+The report lists the wall-clock import time (best of --repeat runs), the
+cumulative time Python attributes to the target, whether heavy dependencies
+(torch, TTS, pydub, aiortc, ...) were loaded, and the slowest modules.
+Exits non-zero if a target listed with --forbid-heavy loads a heavy module.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --targets utils utils.tts_advanced --top 15
+"""
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_TARGETS = [
+    "models",
+    "utils",
+    "utils.audio_utils",
+    "utils.tts_basic",
+    "utils.tts_advanced",
+    "utils.voice_clone",
+    "utils.job_queue",
+]
+
+# Top-level packages that should only load when a model or fallback is used
+HEAVY_MODULES = ("torch", "TTS", "pydub", "aiortc", "av", "streamlit_webrtc", "librosa", "scipy")
+
+
+def import_profile(target: str) -> Tuple[float, List[Tuple[int, int, str]]]:
+    """
+    Import ``target`` in a fresh interpreter with -X importtime.
+
+    Returns:
+        Tuple of (wall seconds, [(self us, cumulative us, module name), ...])
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+        raise RuntimeError(f"import {target} failed: {last_line}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return elapsed, entries
+
+
+def heavy_loaded(entries: List[Tuple[int, int, str]]) -> List[str]:
+    """Heavy top-level packages among the imported modules."""
+    loaded = {name.strip().split(".")[0] for _, _, name in entries}
+    return [name for name in HEAVY_MODULES if name in loaded]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--targets", nargs="+", default=DEFAULT_TARGETS, help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per target (best is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list per target")
+    parser.add_argument("--forbid-heavy", nargs="*", default=["models", "utils", "utils.tts_advanced", "utils.voice_clone"],
+                        help="Targets that must not load any heavy module")
+    args = parser.parse_args()
+
+    failures = 0
+    profiles: Dict[str, List[Tuple[int, int, str]]] = {}
+    print(f"{'target':<24}{'wall':>10}{'cumulative':>12}{'modules':>9}  heavy modules loaded")
+    for target in args.targets:
+        try:
+            runs = [import_profile(target) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{target:<24}  {e}")
+            failures += 1
+            continue
+        wall, entries = min(runs, key=lambda run: run[0])
+        profiles[target] = entries
+        cumulative = next((cum for _, cum, name in entries if name.strip() == target), 0)
+        heavy = heavy_loaded(entries)
+        status = ", ".join(heavy) or "-"
+        if heavy and target in args.forbid_heavy:
+            status += "  FORBIDDEN"
+            failures += 1
+        print(f"{target:<24}{wall * 1000:>8.0f}ms{cumulative / 1000:>10.0f}ms{len(entries):>9}  {status}")
+
+    for target, entries in profiles.items():
+        print(f"\nSlowest imports for {target} (self / cumulative ms):")
+        for self_us, cumulative_us, name in sorted(entries, key=lambda e: e[0], reverse=True)[:args.top]:
+            print(f"  {self_us / 1000:>8.1f}{cumulative_us / 1000:>10.1f}  {name.strip()}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Compare the real-time factor (RTF) of Coqui models across inference profiles.
+
+Each profile loads its own copy of every model (quantization changes the
+model in place), synthesizes one warmup sentence, then times the prompts.
+RTF is synthesis seconds per second of audio; below 1.0 is faster than real
+time. The first profile is the baseline for the speedup column, and output
+lengths are compared against it to catch models that quantize badly.
+
+Usage:
+    python benchmarks/bench_inference_profile.py --profiles default cpu int8
+    python benchmarks/bench_inference_profile.py --models tts_models/en/ljspeech/glow-tts --threads 4
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.inference_profile import PROFILES, InferenceProfile  # noqa: E402
+from utils.model_registry import ModelRegistry  # noqa: E402
+from utils.prewarm import ModelPrewarmer  # noqa: E402
+
+PROMPTS = [
+    "Welcome back, your order is on its way.",
+    "The meeting has been moved to three o'clock on Thursday afternoon.",
+    "Please hold while we connect your call to the next available agent.",
+    "Thank you for your patience. We appreciate your business.",
+]
+
+
+def measure(model, prompts, kwargs: dict) -> tuple:
+    """Synthesize prompts and return (seconds, audio seconds, samples per prompt)."""
+    sample_rate = model.synthesizer.output_sample_rate
+    lengths = []
+    start = time.perf_counter()
+    for prompt in prompts:
+        lengths.append(len(np.asarray(model.tts(text=prompt, **kwargs))))
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(lengths) / sample_rate, lengths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models", nargs="+", help="Models to compare (defaults to every served model)")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--threads", type=int, help="Override the intra-op thread budget of every profile")
+    parser.add_argument("--repeat", type=int, default=2, help="Passes over the prompts")
+    args = parser.parse_args()
+
+    model_names = args.models or ModelPrewarmer.default_models()
+    prompts = PROMPTS * args.repeat
+
+    print(f"{'model':<16}{'profile':<10}{'load':>8}{'synth':>9}{'audio':>9}{'RTF':>8}{'speedup':>12}")
+    for model_name in model_names:
+        baseline = None
+        baseline_lengths = None
+        for profile_name in args.profiles:
+            profile = InferenceProfile.named(profile_name)
+            if args.threads:
+                profile = profile.with_threads(args.threads)
+            registry = ModelRegistry(progress_bar=False, inference_profile=profile)
+
+            start = time.perf_counter()
+            model = registry.get(model_name)
+            load_time = time.perf_counter() - start
+            kwargs = ModelPrewarmer._warmup_kwargs(model)
+            model.tts(text=ModelPrewarmer.DEFAULT_WARMUP_TEXT, **kwargs)
+
+            elapsed, audio_seconds, lengths = measure(model, prompts, kwargs)
+            rtf = elapsed / audio_seconds
+            if baseline is None:
+                baseline, baseline_lengths = rtf, lengths
+            speedup = f"{baseline / rtf:.2f}x"
+            # Duration predictors that quantize badly show up as much shorter/longer audio
+            drift = max(abs(a - b) / b for a, b in zip(lengths, baseline_lengths))
+            if drift > 0.25:
+                speedup += " (len!)"
+            print(f"{model_name.split('/')[-1]:<16}{profile_name:<10}{load_time:>7.1f}s{elapsed:>8.2f}s"
+                  f"{audio_seconds:>8.1f}s{rtf:>8.3f}{speedup:>12}")
+            registry.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Check ONNX Runtime parity with PyTorch for Glow-TTS and compare latency/RTF.
+
+Parity runs with sampling noise disabled on both paths, so they must produce
+the same waveform. Each prompt is compared by length (duration rounding may
+move a frame) and by signal-to-noise ratio against the PyTorch output.
+Latency then uses the model's default noise, with one warmup synthesis per
+path. Exits non-zero if any prompt misses --min-snr.
+
+Usage:
+    python benchmarks/bench_onnx.py --profile cpu --repeat 3
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.inference_profile import PROFILES, InferenceProfile  # noqa: E402
+from utils.model_registry import ModelRegistry  # noqa: E402
+from utils.onnx_backend import ONNX_PREFIX, SUPPORTED_MODELS  # noqa: E402
+
+PROMPTS = [
+    "Welcome back, your order is on its way.",
+    "The meeting has been moved to three o'clock on Thursday afternoon.",
+    "Please hold while we connect your call to the next available agent.",
+    "A quick brown fox jumps over the lazy dog, again and again.",
+]
+
+
+def snr_db(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """SNR of candidate against reference over their common length."""
+    n = min(len(reference), len(candidate))
+    noise = reference[:n] - candidate[:n]
+    return 10 * np.log10(np.sum(reference[:n] ** 2) / max(np.sum(noise ** 2), 1e-20))
+
+
+def torch_sentence(model, sentence: str) -> np.ndarray:
+    """Synthesize one sentence on PyTorch without sampling noise (no sentence silence)."""
+    glow = model.synthesizer.tts_model
+    noise_scale = glow.inference_noise_scale
+    glow.inference_noise_scale = 0.0
+    try:
+        wav = np.asarray(model.tts(text=sentence), dtype=np.float32)
+    finally:
+        glow.inference_noise_scale = noise_scale
+    # TTS.tts appends 10000 samples of silence after the sentence
+    return wav[:-10000]
+
+
+def timed(fn, prompts, sample_rate: int) -> tuple:
+    """Mean latency per prompt and RTF."""
+    audio_samples = 0
+    start = time.perf_counter()
+    for prompt in prompts:
+        audio_samples += len(fn(prompt))
+    elapsed = time.perf_counter() - start
+    return elapsed / len(prompts), elapsed / (audio_samples / sample_rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=SUPPORTED_MODELS[0], choices=SUPPORTED_MODELS)
+    parser.add_argument("--profile", default="default", choices=list(PROFILES), help="Inference profile for both paths")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the prompts for timing")
+    parser.add_argument("--min-snr", type=float, default=30.0, help="Parity threshold in dB")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(progress_bar=False, inference_profile=InferenceProfile.named(args.profile))
+    torch_model = registry.get(args.model)
+    onnx_model = registry.get(ONNX_PREFIX + args.model)
+    sample_rate = torch_model.synthesizer.output_sample_rate
+
+    failures = 0
+    print(f"Parity ({args.model}, noise 0):")
+    for prompt in PROMPTS:
+        reference = torch_sentence(torch_model, prompt)
+        candidate = onnx_model.synthesize_sentence(prompt, noise_scale=0.0)
+        snr = snr_db(reference, candidate)
+        status = "ok"
+        if snr < args.min_snr:
+            status = "MISMATCH"
+            failures += 1
+        print(f"  {len(reference):>7} vs {len(candidate):>7} samples  max|diff| "
+              f"{np.max(np.abs(reference[:len(candidate)] - candidate[:len(reference)])):.2e}  "
+              f"SNR {snr:6.1f}dB  {status}")
+
+    prompts = PROMPTS * args.repeat
+    torch_model.tts(text=PROMPTS[0])
+    onnx_model.tts(text=PROMPTS[0])
+    torch_latency, torch_rtf = timed(lambda text: torch_model.tts(text=text), prompts, sample_rate)
+    onnx_latency, onnx_rtf = timed(lambda text: onnx_model.tts(text=text), prompts, sample_rate)
+
+    print(f"\nLatency (profile {args.profile}, {len(prompts)} prompts):")
+    print(f"  pytorch: {torch_latency * 1000:7.1f}ms/prompt  RTF {torch_rtf:.3f}")
+    print(f"  onnx:    {onnx_latency * 1000:7.1f}ms/prompt  RTF {onnx_rtf:.3f}  ({torch_rtf / onnx_rtf:.2f}x)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
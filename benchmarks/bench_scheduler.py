@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Measure voice-cloning throughput with concurrent sessions, with and without micro-batching.
+
+Each session is a thread that calls VoiceClone.synthesize with its own
+prompt, the way concurrent Streamlit sessions do. The first pass caps the
+model's scheduler at one sentence per batch (serialized, no batching); the
+second uses --max-batch-size, so sentences from different sessions share
+forward passes.
+
+Usage:
+    python benchmarks/bench_scheduler.py english.wav --sessions 8 --requests 4
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.inference_scheduler import InferenceScheduler  # noqa: E402
+from utils.voice_clone import VoiceClone  # noqa: E402
+
+PROMPTS = [
+    "Welcome back, your order is on its way.",
+    "Please hold while we connect your call.",
+    "The meeting has been moved to three o'clock.",
+    "Thank you for your patience. We appreciate it.",
+    "Your password was changed successfully.",
+]
+
+
+def run_sessions(voice_clone: VoiceClone, embedding, sessions: int, requests: int, language: str) -> tuple:
+    """Run concurrent sessions; return (wall seconds, per-request latencies)."""
+    latencies = []
+    lock = threading.Lock()
+
+    def session(index: int):
+        for i in range(requests):
+            start = time.perf_counter()
+            voice_clone.synthesize(PROMPTS[(index + i) % len(PROMPTS)], embedding, language)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("reference", help="Reference audio file")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions")
+    parser.add_argument("--requests", type=int, default=4, help="Requests per session")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--max-batch-size", type=int, default=InferenceScheduler.DEFAULT_MAX_BATCH_SIZE)
+    args = parser.parse_args()
+
+    voice_clone = VoiceClone(output_dir="outputs/bench")
+    embedding = voice_clone.get_speaker_embedding(args.reference)
+    scheduler = InferenceScheduler.for_model(VoiceClone.MODEL_NAME, voice_clone.registry)
+    # Warm the model so neither pass pays for loading or first inference
+    voice_clone.synthesize(PROMPTS[0], embedding, args.language)
+
+    total = args.sessions * args.requests
+    print(f"{'max batch':<11}{'wall':>8}{'req/s':>8}{'p50':>9}{'p95':>9}{'mean batch':>12}")
+    for max_batch_size in (1, args.max_batch_size):
+        scheduler.max_batch_size = max_batch_size
+        before = scheduler.stats()
+        wall, latencies = run_sessions(voice_clone, embedding, args.sessions, args.requests, args.language)
+        after = scheduler.stats()
+        batches = after["batches"] - before["batches"]
+        mean_batch = (after["items"] - before["items"]) / batches if batches else 0.0
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"{max_batch_size:<11}{wall:>7.2f}s{total / wall:>8.2f}{p50:>8.2f}s{p95:>8.2f}s{mean_batch:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Check that the streaming mode of AudioUtils stays under its memory ceiling.
+
+Generates a long 44.1kHz stereo WAV, runs normalize_audio, change_volume,
+trim_silence and convert_format in streaming and in-memory mode under
+tracemalloc (NumPy reports its buffers there), and compares peak Python
+heap use against AudioUtils.STREAMING_MAX_MEMORY. The streaming outputs
+are also checked sample for sample against the in-memory outputs.
+Exits non-zero if the ceiling is exceeded or the outputs differ.
+
+Usage:
+    python benchmarks/bench_streaming_memory.py --minutes 60 --max-memory-mb 32
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_effects import make_file  # noqa: E402
+from utils.audio_probe import AudioProbe  # noqa: E402
+from utils.audio_utils import AudioUtils  # noqa: E402
+
+
+def measured(fn):
+    """Run fn under tracemalloc and return (seconds, peak bytes)."""
+    AudioProbe.shared().clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+    ok = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if not ok:
+        raise RuntimeError("operation failed")
+    return elapsed, peak
+
+
+def same_audio(a: Path, b: Path, block_frames: int = 1 << 20) -> bool:
+    """Compare two files block by block."""
+    with sf.SoundFile(str(a)) as fa, sf.SoundFile(str(b)) as fb:
+        if fa.frames != fb.frames or fa.channels != fb.channels:
+            return False
+        for block_a, block_b in zip(fa.blocks(block_frames, dtype="int16"), fb.blocks(block_frames, dtype="int16")):
+            if not np.array_equal(block_a, block_b):
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=30.0, help="Length of the test file")
+    parser.add_argument("--max-memory-mb", type=float, default=32.0, help="Streaming memory ceiling")
+    parser.add_argument("--skip-in-memory", action="store_true", help="Only run the streaming mode")
+    args = parser.parse_args()
+
+    ceiling = int(args.max_memory_mb * 2 ** 20)
+    AudioUtils.STREAMING_MAX_MEMORY = ceiling
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        work = Path(workdir)
+        source = work / "long.wav"
+        make_file(source, args.minutes)
+        size = source.stat().st_size
+        print(f"Test file: {args.minutes:.0f} min stereo, {size / 2 ** 20:.0f}MB; ceiling {args.max_memory_mb:.0f}MB")
+
+        cases = [
+            ("normalize_audio", lambda out, streaming: AudioUtils.normalize_audio(str(source), out, streaming=streaming), ".wav"),
+            ("change_volume", lambda out, streaming: AudioUtils.change_volume(str(source), out, -6.0, streaming=streaming), ".wav"),
+            ("trim_silence", lambda out, streaming: AudioUtils.trim_silence(str(source), out, streaming=streaming), ".wav"),
+            ("convert wav->flac", lambda out, streaming: AudioUtils.convert_format(str(source), out, streaming=streaming), ".flac"),
+        ]
+
+        print(f"{'operation':<20}{'stream peak':>13}{'stream MB/s':>13}{'memory peak':>13}{'memory MB/s':>13}  check")
+        for name, fn, suffix in cases:
+            streamed = work / f"stream{suffix}"
+            stream_time, stream_peak = measured(lambda: fn(str(streamed), True))
+            row = f"{name:<20}{stream_peak / 2 ** 20:>11.1f}MB{size / 2 ** 20 / stream_time:>13.0f}"
+
+            status = "ok"
+            if stream_peak > ceiling:
+                status = "OVER CEILING"
+                failures += 1
+            if args.skip_in_memory:
+                row += f"{'-':>13}{'-':>13}"
+            else:
+                in_memory = work / f"memory{suffix}"
+                memory_time, memory_peak = measured(lambda: fn(str(in_memory), False))
+                row += f"{memory_peak / 2 ** 20:>11.1f}MB{size / 2 ** 20 / memory_time:>13.0f}"
+                if not same_audio(streamed, in_memory):
+                    status = "OUTPUT MISMATCH"
+                    failures += 1
+                in_memory.unlink()
+            streamed.unlink()
+            print(f"{row}  {status}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Bulk audio format conversion for whole directory trees.
+
+Mirrors SOURCE_DIR into OUTPUT_DIR with every supported audio file converted
+to --format, on a process pool sized to the available CPUs. Outputs that are
+already up to date are skipped, and progress is kept in a manifest so an
+interrupted run picks up where it stopped.
+
+Usage:
+    python convert_audio.py recordings/ converted/ --format wav
+    python convert_audio.py recordings/ converted/ --format mp3 --workers 4 --check hash
+"""
+import argparse
+import logging
+import sys
+
+from utils.audio_utils import AudioUtils
+from utils.batch_convert import BatchConverter
+
+
+def main():
+    """Run a batch conversion and print a throughput summary."""
+    parser = argparse.ArgumentParser(description="Bulk audio format conversion")
+    parser.add_argument("source_dir", help="Directory tree to convert")
+    parser.add_argument("output_dir", help="Directory for converted files")
+    parser.add_argument("--format", required=True, choices=AudioUtils.SUPPORTED_FORMATS, help="Target format")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: available CPUs)")
+    parser.add_argument("--check", choices=["mtime", "hash"], default="mtime",
+                        help="Up-to-date check: size+mtime, or also content hash when only the mtime changed")
+    parser.add_argument("--manifest", help="Manifest path (default: OUTPUT_DIR/.conversion_manifest.json)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    converter = BatchConverter(
+        args.source_dir,
+        args.output_dir,
+        args.format,
+        workers=args.workers,
+        check=args.check,
+        manifest_path=args.manifest,
+    )
+    report = converter.run()
+
+    print(f"Converted {report.converted}, skipped {report.skipped}, failed {report.failed} "
+          f"in {report.elapsed:.1f}s")
+    print(f"Throughput: {report.files_per_second:.1f} files/s, "
+          f"{report.bytes_per_second / 2 ** 20:.1f} MB/s in, {report.bytes_out / 2 ** 20:.1f} MB written")
+    for path, error in sorted(report.errors.items()):
+        print(f"  failed: {path}: {error}")
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Export Coqui models to ONNX for the onnxruntime backend of AdvancedTTS.
+
+Writes acoustic.onnx, vocoder.onnx and meta.json under
+OUTPUT_DIR/<model name with '/' replaced by '--'>. The backend also exports
+on first use; running this ahead of time keeps the export (and the
+PyTorch tracing it needs) out of the first request.
+
+Usage:
+    python export_onnx.py
+    python export_onnx.py --model tts_models/en/ljspeech/glow-tts --output onnx_models --opset 17
+"""
+import argparse
+import logging
+from pathlib import Path
+
+from utils.model_registry import ModelRegistry
+from utils.onnx_backend import DEFAULT_OPSET, SUPPORTED_MODELS, export_dir_for, export_glow_tts, onnx_root
+
+
+def main():
+    """Export the requested models."""
+    parser = argparse.ArgumentParser(description="Export Coqui models to ONNX")
+    parser.add_argument("--model", nargs="+", default=list(SUPPORTED_MODELS), choices=SUPPORTED_MODELS)
+    parser.add_argument("--output", help="Export root (default: TTS_ONNX_DIR or ./onnx_models)")
+    parser.add_argument("--opset", type=int, default=DEFAULT_OPSET, help="ONNX opset version")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    registry = ModelRegistry.shared()
+    root = Path(args.output) if args.output else onnx_root()
+    for model_name in args.model:
+        # Always trace the float model, whatever inference profile the environment selects
+        tts = registry.load_unprofiled(model_name)
+        export_dir = export_glow_tts(tts, export_dir_for(model_name, root), opset=args.opset)
+        sizes = ", ".join(f"{path.name} {path.stat().st_size / 2 ** 20:.1f}MB" for path in sorted(export_dir.glob("*.onnx")))
+        print(f"{model_name}: {export_dir} ({sizes})")
+
+
+if __name__ == "__main__":
+    main()
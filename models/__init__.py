@@ -1,14 +1,11 @@
 """
 Models package for TTS application.
+
+Schemas are imported on first access (PEP 562), so importing the package
+does not load pydantic until a schema is used.
 """
-from models.schemas import (
-    BasicTTSRequest,
-    AdvancedTTSRequest,
-    VoiceCloneRequest,
-    AudioConversionRequest,
-    TTSResponse,
-    AppConfig,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 __all__ = [
     "BasicTTSRequest",
@@ -16,6 +13,30 @@ __all__ = [
     "VoiceCloneRequest",
     "AudioConversionRequest",
     "TTSResponse",
+    "VoiceProfile",
     "AppConfig",
 ]
 
+if TYPE_CHECKING:
+    from models.schemas import (
+        BasicTTSRequest,
+        AdvancedTTSRequest,
+        VoiceCloneRequest,
+        AudioConversionRequest,
+        TTSResponse,
+        VoiceProfile,
+        AppConfig,
+    )
+
+
+def __getattr__(name: str):
+    """Import a schema from models.schemas on first access."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module("models.schemas"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
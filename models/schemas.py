@@ -1,7 +1,7 @@
 """
 Pydantic schemas for data validation in the TTS application.
 """
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import BaseModel, Field, field_validator
 import re
 
@@ -33,6 +33,7 @@ class AdvancedTTSRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=5000, description="Text to convert to speech")
     model_name: str = Field(default="tts_models/en/ljspeech/tacotron2-DDC", description="TTS model name")
     speed: float = Field(default=1.0, ge=0.5, le=2.0, description="Speech speed multiplier")
+    backend: str = Field(default="torch", description="Inference runtime: torch or onnx (Glow-TTS only)")
     
     @field_validator('text')
     @classmethod
@@ -40,6 +41,13 @@ class AdvancedTTSRequest(BaseModel):
         if not v.strip():
             raise ValueError("Text cannot be empty or whitespace only")
         return v.strip()
+    
+    @field_validator('backend')
+    @classmethod
+    def validate_backend(cls, v: str) -> str:
+        if v not in ("torch", "onnx"):
+            raise ValueError("Backend must be 'torch' or 'onnx'")
+        return v
 
 
 class VoiceCloneRequest(BaseModel):
@@ -84,6 +92,29 @@ class TTSResponse(BaseModel):
     file_path: Optional[str] = None
     audio_data: Optional[bytes] = None
     error: Optional[str] = None
+    # Why the request failed when it was the caller's fault: "invalid_request", "not_found"
+    # or "unprocessable" (e.g. an unusable reference clip); None for engine errors
+    error_type: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None
+
+
+class VoiceProfile(BaseModel):
+    """Schema for an enrolled voice in the voice library."""
+    voice_id: str = Field(..., description="Unique voice identifier")
+    name: str = Field(default="", description="Display name")
+    source_hashes: List[str] = Field(default_factory=list, description="Content hashes of the enrolled clips")
+    source_files: List[str] = Field(default_factory=list, description="Names of the enrolled clips")
+    embedding_dim: int = Field(default=0, description="Length of the averaged speaker embedding")
+    model_name: str = Field(default="", description="Model whose speaker encoder produced the embedding")
+    created_at: str = Field(default="", description="ISO timestamp of enrollment")
+    metadata: Dict[str, str] = Field(default_factory=dict, description="Free-form metadata")
+    
+    @field_validator('voice_id')
+    @classmethod
+    def validate_voice_id(cls, v: str) -> str:
+        if not re.fullmatch(r"[A-Za-z0-9_-]{1,64}", v):
+            raise ValueError("Voice ID may only contain letters, digits, '-' and '_' (max 64 characters)")
+        return v
 
 
 class AppConfig(BaseModel):
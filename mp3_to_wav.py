@@ -1,15 +1,13 @@
-from pydub import AudioSegment
+import sys
 
-# Ensure ffmpeg is available
-AudioSegment.converter = "/opt/homebrew/bin/ffmpeg"  # adjust path if needed
+from utils.audio_utils import AudioUtils
 
-# Load the .mp3 file (replace with your actual path)
-mp3_path = "audio.mp3"
-wav_path = "output.wav"
+# Convert one file; use convert_audio.py for whole directories.
+# ffmpeg (only needed for formats libsndfile cannot decode) is found on PATH.
+mp3_path = sys.argv[1] if len(sys.argv) > 1 else "audio.mp3"
+wav_path = sys.argv[2] if len(sys.argv) > 2 else "output.wav"
 
-try:
-    audio = AudioSegment.from_file(mp3_path, format="mp3")
-    audio.export(wav_path, format="wav")
+if AudioUtils.mp3_to_wav(mp3_path, wav_path):
     print("Conversion successful.")
-except Exception as e:
-    print("Error during conversion:", e)
+else:
+    print("Error during conversion, see the log for details.")
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Headless HTTP synthesis service for Text to Speech Pro.
+
+Exposes BasicTTS, AdvancedTTS and VoiceClone behind the request schemas in
+models.schemas, keeps models resident in the process-wide registry and caps
+concurrent work per engine.
+
+Usage:
+    python server.py --port 8000 --preload --models-dir /srv/tts-models --offline
+"""
+import argparse
+import base64
+import json
+import logging
+import os
+import struct
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from pydantic import ValidationError
+
+from models.schemas import AdvancedTTSRequest, BasicTTSRequest, TTSResponse, VoiceCloneRequest
+from utils.inference_profile import PROFILES, InferenceProfile
+from utils.inference_scheduler import InferenceScheduler
+from utils.model_registry import ModelRegistry
+from utils.prewarm import COLD, READY_STATES, ModelPrewarmer
+from utils.voice_library import VoiceNotFoundError
+
+logger = logging.getLogger(__name__)
+
+# HTTP status of a failed TTSResponse, by its error_type
+ERROR_STATUSES = {
+    "invalid_request": HTTPStatus.BAD_REQUEST,
+    "not_found": HTTPStatus.NOT_FOUND,
+    "unprocessable": HTTPStatus.UNPROCESSABLE_ENTITY,
+}
+
+
+class ServiceBusy(Exception):
+    """Raised when an engine has no free concurrency slot."""
+
+
+class SynthesisService:
+    """Engines, concurrency limits and readiness state behind the HTTP handler."""
+
+    def __init__(
+        self,
+        concurrency: Dict[str, int],
+        queue_timeout: float = 30.0,
+        offline: bool = False
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            concurrency: Maximum concurrent requests per engine ('basic', 'advanced', 'clone')
+            queue_timeout: Seconds a request waits for a free slot before 503
+            offline: Disable engines that need network access (gTTS)
+        """
+        self.registry = ModelRegistry.shared()
+        self.prewarmer = ModelPrewarmer.shared()
+        self.semaphores = {name: threading.BoundedSemaphore(limit) for name, limit in concurrency.items()}
+        self.queue_timeout = queue_timeout
+        self.offline = offline
+
+    def model_names(self) -> list:
+        """Coqui models this service can serve."""
+        return ModelPrewarmer.default_models()
+
+    def preload(self) -> None:
+        """Load and warm every servable model before returning."""
+        self.prewarmer.warm_all(self.model_names())
+
+    def prewarm(self) -> None:
+        """Load and warm every servable model on a background thread."""
+        self.prewarmer.start(self.model_names())
+
+    def readiness(self) -> dict:
+        """Report which models are warm, loading or cold."""
+        status = self.prewarmer.status(self.model_names())
+        ready = status["ready"]
+        if not ready and (self.registry.max_bytes or self.registry.idle_ttl) and not status["running"]:
+            # With bounded residency, models unloaded after prewarming reload on demand
+            ready = all(detail["state"] in READY_STATES + (COLD,) for detail in status["models"].values())
+        return {
+            "ready": ready,
+            "prewarming": status["running"],
+            "models": {name: detail["state"] for name, detail in status["models"].items()},
+            "details": status["models"],
+            "engines": {
+                "basic": "disabled" if self.offline else "available",
+                "advanced": "available",
+                "clone": "available",
+            },
+        }
+
+    def slot(self, engine: str) -> "_Slot":
+        """Context manager holding one concurrency slot of ``engine``."""
+        return _Slot(self.semaphores[engine], self.queue_timeout, engine)
+
+
+class _Slot:
+    """Acquire a semaphore with a timeout, raising ServiceBusy on expiry."""
+
+    def __init__(self, semaphore: threading.BoundedSemaphore, timeout: float, engine: str):
+        self.semaphore = semaphore
+        self.timeout = timeout
+        self.engine = engine
+
+    def __enter__(self):
+        if not self.semaphore.acquire(timeout=self.timeout):
+            raise ServiceBusy(f"{self.engine} engine is at capacity")
+        return self
+
+    def __exit__(self, *exc):
+        self.semaphore.release()
+
+
+def _wav_stream_header(sample_rate: int, channels: int = 1) -> bytes:
+    """WAV header with unknown (maximum) length for streamed PCM16."""
+    byte_rate = sample_rate * channels * 2
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, channels * 2, 16)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+def _pcm16(samples: np.ndarray) -> bytes:
+    """Convert float samples to little-endian PCM16 bytes."""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+class TTSRequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the synthesis service."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "TextToSpeechPro/1.0"
+
+    @property
+    def service(self) -> SynthesisService:
+        return self.server.service
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        elif path == "/ready":
+            readiness = self.service.readiness()
+            status = HTTPStatus.OK if readiness["ready"] else HTTPStatus.SERVICE_UNAVAILABLE
+            self._send_json(status, readiness)
+        elif path == "/models":
+            stats = self.service.registry.stats()
+            stats["schedulers"] = InferenceScheduler.all_stats()
+            self._send_json(HTTPStatus.OK, stats)
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        stream = parse_qs(url.query).get("stream", ["0"])[0] in ("1", "true")
+        routes = {
+            "/v1/tts/basic": self._basic,
+            "/v1/tts/advanced": self._advanced,
+            "/v1/voice-clone": self._clone,
+        }
+        route = routes.get(url.path)
+        if route is None:
+            # The unread body would be parsed as the next request on a kept-alive connection
+            self.close_connection = True
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"}, {"Connection": "close"})
+            return
+        try:
+            body = self._read_json()
+            route(body, stream)
+        except ValidationError as e:
+            self._send_json(HTTPStatus.UNPROCESSABLE_ENTITY, {"error": "Invalid request", "details": e.errors()})
+        except VoiceNotFoundError as e:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": str(e)})
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except ServiceBusy as e:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)}, {"Retry-After": "1"})
+        except Exception as e:
+            logger.error(f"Error handling {url.path}: {str(e)}")
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+    def _basic(self, body: dict, stream: bool) -> None:
+        if self.service.offline:
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Basic TTS needs network access"})
+            return
+        from utils.tts_basic import BasicTTS
+        request = BasicTTSRequest(**body)
+        with self.service.slot("basic"):
+            result = BasicTTS().convert(request)
+        self._send_result(result, "audio/mpeg")
+
+    def _advanced(self, body: dict, stream: bool) -> None:
+        from utils.tts_advanced import AdvancedTTS
+        request = AdvancedTTSRequest(**body)
+        with self.service.slot("advanced"):
+            if stream:
+                self._send_stream(AdvancedTTS().convert_stream(request))
+            else:
+                self._send_result(AdvancedTTS().convert(request), "audio/wav")
+
+    def _clone(self, body: dict, stream: bool) -> None:
+        from utils.voice_clone import VoiceClone
+        voice_id = body.pop("voice_id", None)
+        reference_audio = body.pop("reference_audio", None)
+        if "reference_audio_path" in body:
+            # Server-side paths would let any client make the server read arbitrary files
+            raise ValueError("reference_audio_path is not accepted over HTTP; send voice_id or base64 reference_audio")
+        request = VoiceCloneRequest(**body)
+
+        if reference_audio is not None:
+            # Uploaded audio stays in memory from request body to response
+            reference_audio = base64.b64decode(reference_audio)
+        if reference_audio is None and voice_id is None:
+            raise ValueError("Provide voice_id or base64 reference_audio")
+
+        with self.service.slot("clone"):
+            voice_clone = VoiceClone()
+            if stream:
+                self._send_stream(voice_clone.clone_voice_stream(
+                    request, voice_id=voice_id, reference_audio=reference_audio
+                ))
+            else:
+                self._send_result(voice_clone.clone_voice(
+                    request, voice_id=voice_id, reference_audio=reference_audio, persist=False
+                ), "audio/wav")
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_result(self, result: TTSResponse, content_type: str) -> None:
+        if not result.success:
+            # Caller errors are not retried by clients; everything else is a server fault
+            status = ERROR_STATUSES.get(result.error_type, HTTPStatus.INTERNAL_SERVER_ERROR)
+            self._send_json(status, {"error": result.error, "message": result.message})
+            return
+        data = result.audio_data if result.audio_data is not None else Path(result.file_path).read_bytes()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, chunks: Iterator) -> None:
+        """Send sentence chunks as a chunked WAV response while they are synthesized."""
+        first = next(chunks, None)
+        if first is None:
+            raise ValueError("Nothing to synthesize")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._write_chunk(_wav_stream_header(first.sample_rate) + _pcm16(first.samples))
+        try:
+            for chunk in chunks:
+                self._write_chunk(_pcm16(chunk.samples))
+        except Exception as e:
+            # Headers are already sent; end the stream early
+            logger.error(f"Error while streaming audio: {str(e)}")
+            self.close_connection = True
+        finally:
+            chunks.close()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} - {format % args}")
+
+
+def main():
+    """Run the synthesis server."""
+    parser = argparse.ArgumentParser(description="Headless HTTP synthesis service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--basic-concurrency", type=int, default=8, help="Concurrent gTTS requests")
+    parser.add_argument("--advanced-concurrency", type=int, default=2, help="Concurrent Coqui TTS requests")
+    parser.add_argument("--clone-concurrency", type=int, default=2, help="Concurrent voice cloning requests")
+    parser.add_argument("--queue-timeout", type=float, default=30.0, help="Seconds to wait for a free slot")
+    parser.add_argument("--prewarm", choices=["background", "blocking", "off"], default="background",
+                        help="Load and warm all models in the background (default), before serving, or not at all")
+    parser.add_argument("--preload", action="store_true", help="Same as --prewarm blocking")
+    parser.add_argument("--warmup-text", default=ModelPrewarmer.DEFAULT_WARMUP_TEXT,
+                        help="Text synthesized once per model when prewarming (empty to only load)")
+    parser.add_argument("--inference-profile", choices=list(PROFILES),
+                        help="CPU inference profile (defaults to TTS_INFERENCE_PROFILE or 'default')")
+    parser.add_argument("--torch-threads", type=int, help="Intra-op thread budget (overrides the profile)")
+    parser.add_argument("--model-budget-mb", type=float,
+                        help="Memory budget for resident models; least recently used ones are evicted (TTS_MODEL_BUDGET_MB)")
+    parser.add_argument("--model-idle-ttl", type=float,
+                        help="Unload models unused for this many seconds (TTS_MODEL_IDLE_TTL)")
+    parser.add_argument("--max-batch-size", type=int,
+                        help="Most sentences per micro-batch on one model (TTS_MAX_BATCH_SIZE, default 16)")
+    parser.add_argument("--max-batch-wait-ms", type=float,
+                        help="How long a micro-batch waits for more requests (TTS_MAX_BATCH_WAIT_MS, default 10)")
+    parser.add_argument("--models-dir", help="Local Coqui model directory (sets TTS_HOME)")
+    parser.add_argument("--offline", action="store_true", help="Disable engines that need network access")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.models_dir:
+        # Coqui resolves models under TTS_HOME and skips downloads for models present there
+        os.environ["TTS_HOME"] = str(Path(args.models_dir).resolve())
+    # Read when the shared registry and the model schedulers are created
+    if args.max_batch_size:
+        os.environ["TTS_MAX_BATCH_SIZE"] = str(args.max_batch_size)
+    if args.max_batch_wait_ms is not None:
+        os.environ["TTS_MAX_BATCH_WAIT_MS"] = str(args.max_batch_wait_ms)
+    if args.model_budget_mb:
+        os.environ["TTS_MODEL_BUDGET_MB"] = str(args.model_budget_mb)
+    if args.model_idle_ttl:
+        os.environ["TTS_MODEL_IDLE_TTL"] = str(args.model_idle_ttl)
+
+    registry = ModelRegistry.shared()
+    if args.inference_profile:
+        registry.inference_profile = InferenceProfile.named(args.inference_profile)
+    if args.torch_threads:
+        registry.inference_profile = registry.inference_profile.with_threads(args.torch_threads)
+
+    service = SynthesisService(
+        concurrency={
+            "basic": args.basic_concurrency,
+            "advanced": args.advanced_concurrency,
+            "clone": args.clone_concurrency,
+        },
+        queue_timeout=args.queue_timeout,
+        offline=args.offline,
+    )
+    service.prewarmer.warmup_text = args.warmup_text
+    if args.preload or args.prewarm == "blocking":
+        service.preload()
+    elif args.prewarm == "background":
+        service.prewarm()
+
+    server = ThreadingHTTPServer((args.host, args.port), TTSRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    logger.info(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
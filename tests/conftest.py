@@ -0,0 +1,10 @@
+"""
+Shared pytest setup.
+
+Makes the repository root importable (``utils``, ``models``) when pytest is
+run from any directory, the same way the benchmark scripts do.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
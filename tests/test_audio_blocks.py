@@ -0,0 +1,65 @@
+"""
+Check that BlockAudioProcessor stays under its memory ceiling on files much larger than it.
+
+Peak allocation is measured with tracemalloc, which sees NumPy's buffers.
+The file is generated block by block before tracing starts.
+"""
+import tracemalloc
+
+import pytest
+
+np = pytest.importorskip("numpy")
+sf = pytest.importorskip("soundfile")
+
+from utils.audio_blocks import BlockAudioProcessor  # noqa: E402
+from utils.audio_probe import AudioProbe  # noqa: E402
+
+SAMPLE_RATE = 44100
+SECONDS = 120
+MAX_MEMORY = 1024 * 1024
+
+
+@pytest.fixture(scope="module")
+def long_file(tmp_path_factory):
+    """Two minutes of 44.1kHz stereo 16-bit (about 20x the ceiling) with silent ends."""
+    path = tmp_path_factory.mktemp("blocks") / "long.wav"
+    rng = np.random.default_rng(0)
+    silence = 2 * SAMPLE_RATE
+    total = SECONDS * SAMPLE_RATE
+    with sf.SoundFile(str(path), "w", SAMPLE_RATE, 2, subtype="PCM_16") as f:
+        for start in range(0, total, 10 * SAMPLE_RATE):
+            n = min(10 * SAMPLE_RATE, total - start)
+            t = (start + np.arange(n)) / SAMPLE_RATE
+            mono = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(n)
+            index = start + np.arange(n)
+            mono[(index < silence) | (index >= total - silence)] = 0
+            f.write(np.stack([mono, 0.8 * mono], axis=1).astype(np.float32))
+    assert path.stat().st_size > 10 * MAX_MEMORY
+    return path
+
+
+OPERATIONS = {
+    "normalize": lambda processor, source, output: processor.normalize(source, output),
+    "volume": lambda processor, source, output: processor.change_volume(source, output, -6.0),
+    "trim": lambda processor, source, output: processor.trim_silence(source, output),
+    "convert": lambda processor, source, output: processor.convert(source, output, "flac"),
+}
+
+
+@pytest.mark.parametrize("name", list(OPERATIONS))
+def test_peak_memory_under_ceiling(long_file, tmp_path, name):
+    processor = BlockAudioProcessor(max_memory=MAX_MEMORY)
+    output = tmp_path / ("out.flac" if name == "convert" else "out.wav")
+    AudioProbe.shared().clear()
+
+    tracemalloc.start()
+    try:
+        OPERATIONS[name](processor, str(long_file), str(output))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < MAX_MEMORY
+    with sf.SoundFile(str(output)) as result:
+        assert result.channels == 2
+        assert result.frames > 0
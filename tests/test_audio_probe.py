@@ -0,0 +1,46 @@
+"""
+Check that AudioProbe only takes verified MPEG frames for MP3.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("soundfile")
+
+from utils.audio_encoder import PROFILES, AudioEncoder  # noqa: E402
+from utils.audio_probe import AudioProbe  # noqa: E402
+
+# MPEG-1 layer III, 128k, 44.1kHz frame header
+FRAME_SYNC = b"\xff\xfb\x90\x64"
+
+
+def junk(size: int) -> bytearray:
+    """Random bytes without any 0xFF, so the only sync is the one planted."""
+    data = np.random.default_rng(0).integers(0, 0xFF, size, dtype=np.uint8).tobytes()
+    return bytearray(b"JUNK" + data[4:])
+
+
+def test_encoded_mp3_is_probed():
+    audio = (0.3 * np.sin(np.arange(48000) / 10)).astype(np.float32)
+    info = AudioProbe().probe(AudioEncoder.encode(audio, 24000, PROFILES["mp3"]))
+    assert info.format == "MP3"
+    assert info.sample_rate == 24000
+    assert info.frames == 48000
+
+
+@pytest.mark.parametrize("id3", [False, True])
+def test_sync_at_buffer_end_is_not_mp3(id3):
+    data = junk(70000)
+    # A plausible frame header whose successor would lie past the 64KB scan buffer
+    data[65530:65534] = FRAME_SYNC
+    if id3:
+        data = b"ID3\x03\x00\x00\x00\x00\x00\x00" + data
+    with pytest.raises(ValueError):
+        AudioProbe().probe(bytes(data))
+
+
+def test_unknown_magic_without_id3_is_rejected():
+    data = junk(4096)
+    data[100:104] = FRAME_SYNC
+    data[100 + 417:100 + 421] = FRAME_SYNC
+    with pytest.raises(ValueError):
+        AudioProbe().probe(bytes(data))
@@ -0,0 +1,61 @@
+"""
+Check that batched Glow-TTS synthesis matches ``TTS.tts`` sentence by sentence.
+
+Needs torch and Coqui TTS, plus the Glow-TTS model (it is downloaded on
+first use); the module is skipped when either package is missing.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+pytest.importorskip("TTS.api")
+
+from utils.inference_profile import InferenceProfile  # noqa: E402
+from utils.model_registry import ModelRegistry  # noqa: E402
+from utils.tts_advanced import AdvancedTTS, _TextJob  # noqa: E402
+
+MODEL_NAME = "tts_models/en/ljspeech/glow-tts"
+TEXTS = [
+    "Welcome back. Your order is on its way.",
+    "The meeting has been moved to three o'clock on Thursday afternoon.",
+    "Thanks!",
+]
+MIN_SNR_DB = 30.0
+
+
+def snr_db(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """SNR of candidate against reference over their common length."""
+    n = min(len(reference), len(candidate))
+    noise = reference[:n] - candidate[:n]
+    return 10 * np.log10(np.sum(reference[:n] ** 2) / max(np.sum(noise ** 2), 1e-20))
+
+
+@pytest.fixture(scope="module")
+def tts():
+    registry = ModelRegistry(progress_bar=False, inference_profile=InferenceProfile())
+    tts = registry.get(MODEL_NAME)
+    glow = tts.synthesizer.tts_model
+    noise_scale = glow.inference_noise_scale
+    # No sampling noise, so batched and single runs are comparable
+    glow.inference_noise_scale = 0.0
+    yield tts
+    glow.inference_noise_scale = noise_scale
+
+
+def test_glow_tts_runs_batched(tts):
+    assert AdvancedTTS._supports_batch_inference(tts)
+
+
+@pytest.mark.parametrize("speed", [1.0, 1.5])
+def test_batch_matches_single(tts, speed):
+    import torch
+
+    with torch.inference_mode():
+        batched = AdvancedTTS._synthesize_jobs(tts, [_TextJob(text, speed) for text in TEXTS])
+        single = [AdvancedTTS._at_speed(tts, speed, lambda: np.asarray(tts.tts(text=text), dtype=np.float32))
+                  for text in TEXTS]
+    hop = tts.synthesizer.tts_model.ap.hop_length
+    for reference, candidate in zip(single, batched):
+        # Duration rounding may move a frame per sentence
+        assert abs(len(reference) - len(candidate)) <= 2 * hop
+        assert snr_db(reference, candidate) >= MIN_SNR_DB
@@ -0,0 +1,50 @@
+"""
+Check that borrowed models stay pinned in the ModelRegistry.
+
+Uses a stand-in loader, so no Coqui model is needed.
+"""
+from utils.model_registry import ModelRegistry
+
+
+class FakeModel:
+    def memory_bytes(self) -> int:
+        return 1024
+
+
+def make_registry():
+    loads = []
+
+    def loader(model_name):
+        loads.append(model_name)
+        return FakeModel()
+
+    return ModelRegistry(loader=loader), loads
+
+
+def test_borrowed_model_is_not_evicted():
+    registry, _ = make_registry()
+    with registry.borrow("a") as model:
+        assert registry.evict_idle(idle_ttl=1e-9) == []
+        assert registry.get("a") is model
+    assert registry.evict_idle(idle_ttl=1e-9) == ["a"]
+
+
+def test_eviction_before_pinning_reloads(monkeypatch):
+    registry, loads = make_registry()
+    get = registry.get
+    calls = []
+
+    def get_then_evict(model_name):
+        model = get(model_name)
+        calls.append(model_name)
+        if len(calls) == 1:
+            # The evictor wins the race between get() and the pin
+            registry.unload(model_name)
+        return model
+
+    monkeypatch.setattr(registry, "get", get_then_evict)
+    with registry.borrow("a") as model:
+        assert len(loads) == 2
+        assert registry.stats()["resident"]["a"]["pins"] == 1
+        assert get("a") is model
+    assert registry.stats()["resident"]["a"]["pins"] == 0
@@ -0,0 +1,87 @@
+"""
+Export Glow-TTS to ONNX and check the onnxruntime output against PyTorch.
+
+Needs torch, onnx, onnxruntime and Coqui TTS, plus the Glow-TTS model (it
+is downloaded on first use); the module is skipped when any of the
+packages is missing.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("TTS.api")
+
+from utils.inference_profile import InferenceProfile  # noqa: E402
+from utils.model_registry import ModelRegistry  # noqa: E402
+from utils.onnx_backend import (  # noqa: E402
+    ACOUSTIC_FILE,
+    SENTENCE_SILENCE_SAMPLES,
+    SUPPORTED_MODELS,
+    OnnxGlowTTS,
+    export_glow_tts,
+)
+
+MODEL_NAME = SUPPORTED_MODELS[0]
+PROMPTS = [
+    "Welcome back, your order is on its way.",
+    "The meeting has been moved to three o'clock on Thursday afternoon.",
+]
+MIN_SNR_DB = 30.0
+
+
+def snr_db(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """SNR of candidate against reference over their common length."""
+    n = min(len(reference), len(candidate))
+    noise = reference[:n] - candidate[:n]
+    return 10 * np.log10(np.sum(reference[:n] ** 2) / max(np.sum(noise ** 2), 1e-20))
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return ModelRegistry(progress_bar=False, inference_profile=InferenceProfile())
+
+
+@pytest.fixture(scope="module")
+def onnx_model(registry, tmp_path_factory):
+    tts = registry.get(MODEL_NAME)
+    export_dir = export_glow_tts(tts, tmp_path_factory.mktemp("onnx"))
+    return OnnxGlowTTS(export_dir, tts)
+
+
+def torch_sentence(tts, sentence: str) -> np.ndarray:
+    """One sentence on PyTorch without sampling noise or the trailing silence."""
+    glow = tts.synthesizer.tts_model
+    noise_scale = glow.inference_noise_scale
+    glow.inference_noise_scale = 0.0
+    try:
+        wav = np.asarray(tts.tts(text=sentence), dtype=np.float32)
+    finally:
+        glow.inference_noise_scale = noise_scale
+    return wav[:-SENTENCE_SILENCE_SAMPLES]
+
+
+def test_export_writes_graphs(onnx_model):
+    names = {path.name for path in onnx_model.export_dir.iterdir()}
+    assert {"acoustic.onnx", "vocoder.onnx", "meta.json"} <= names
+    assert onnx_model.meta["model"] == "GlowTTS"
+
+
+@pytest.mark.parametrize("prompt", PROMPTS)
+def test_parity_with_pytorch(registry, onnx_model, prompt):
+    reference = torch_sentence(registry.get(MODEL_NAME), prompt)
+    candidate = onnx_model.synthesize_sentence(prompt, noise_scale=0.0)
+    # Duration rounding may move a single frame
+    hop = registry.get(MODEL_NAME).synthesizer.tts_model.ap.hop_length
+    assert abs(len(reference) - len(candidate)) <= hop
+    assert snr_db(reference, candidate) >= MIN_SNR_DB
+
+
+def test_export_uses_float_model_under_quantizing_profile(tmp_path):
+    registry = ModelRegistry(progress_bar=False, inference_profile=InferenceProfile.named("int8"))
+    model = OnnxGlowTTS.load(MODEL_NAME, registry, root=tmp_path)
+    # The exported graph is float; only the separate acoustic.int8.onnx is quantized
+    graph = onnx.load(str(model.export_dir / ACOUSTIC_FILE)).graph
+    quantized_ops = {"DynamicQuantizeLinear", "MatMulInteger", "DynamicQuantizeLSTM", "QuantizeLinear"}
+    assert not quantized_ops & {node.op_type for node in graph.node}
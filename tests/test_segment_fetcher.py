@@ -0,0 +1,129 @@
+"""
+Run SegmentFetcher against the stand-in translate endpoint.
+
+SegmentFetcher sends the requests built by gTTS's private
+``_prepare_requests`` and parses the responses the way ``gTTS.stream``
+does, so these tests pin that contract for the gTTS version in
+requirements.txt: segments come back in order, transient failures are
+retried, and persistent ones surface as gTTSError.
+"""
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+gtts = pytest.importorskip("gtts")
+
+from gtts.tts import gTTSError  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from bench_gtts_fetch import SENTENCE, StandInHandler  # noqa: E402
+from utils.segment_fetcher import SegmentFetcher  # noqa: E402
+
+TEXT = SENTENCE * 12
+
+
+class FlakyHandler(StandInHandler):
+    """Stand-in that answers the first ``fail_first`` requests with 503."""
+
+    def do_POST(self):
+        with self.server.stats_lock:
+            fail = self.server.fail_first > 0
+            self.server.fail_first -= fail
+        if not fail:
+            super().do_POST()
+            return
+        # Read the body so the keep-alive connection stays usable
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.stats_lock:
+            self.server.requests += 1
+        self._reply(503, b"")
+
+
+class SilentHandler(StandInHandler):
+    """Stand-in that answers with a result line but no audio stream."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(200, b')]}\'\n\n[["wrb.fr","jQ1olc","[]",null,null,null,"generic"]]')
+
+
+def serve(handler, latency=0.0, jitter=0.0, fail_rate=0.0, fail_first=0):
+    """Start a stand-in server with ``handler`` on a free port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.latency, server.jitter, server.fail_rate = latency, jitter, fail_rate
+    server.fail_first = fail_first
+    server.stats_lock = threading.Lock()
+    server.connections = server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def tts():
+    return gtts.gTTS(text=TEXT, lang="en")
+
+
+def make_fetcher(server, **kwargs):
+    kwargs.setdefault("backoff_factor", 0.0)
+    return SegmentFetcher(base_url=f"http://127.0.0.1:{server.server_address[1]}", timeout=5.0, **kwargs)
+
+
+def expected_audio(tts):
+    # The stand-in's "audio" for a segment is the segment text
+    return "".join(tts._tokenize(tts.text)).encode()
+
+
+def test_segments_are_joined_in_order(tts):
+    server = serve(StandInHandler, latency=0.02, jitter=0.02)
+    fetcher = make_fetcher(server, max_workers=4)
+    try:
+        assert len(tts._tokenize(tts.text)) > 4
+        assert fetcher.fetch(tts) == expected_audio(tts)
+        # Reused pooled connections rather than one per segment
+        assert server.connections <= fetcher.max_workers
+    finally:
+        fetcher.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_transient_failures_are_retried(tts):
+    server = serve(FlakyHandler, fail_first=3)
+    fetcher = make_fetcher(server, max_workers=2, retries=3)
+    try:
+        assert fetcher.fetch(tts) == expected_audio(tts)
+        assert server.requests == len(tts._tokenize(tts.text)) + 3
+    finally:
+        fetcher.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_persistent_failure_raises(tts):
+    server = serve(StandInHandler, fail_rate=1.0)
+    fetcher = make_fetcher(server, max_workers=2, retries=1)
+    try:
+        with pytest.raises(gTTSError):
+            fetcher.fetch(tts)
+    finally:
+        fetcher.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_response_without_audio_raises(tts):
+    server = serve(SilentHandler)
+    fetcher = make_fetcher(server, max_workers=2)
+    try:
+        with pytest.raises(gTTSError):
+            fetcher.fetch(tts)
+    finally:
+        fetcher.close()
+        server.shutdown()
+        server.server_close()
@@ -1,15 +1,65 @@
 """
 Utilities package for TTS application.
+
+Names are imported on first access (PEP 562), so ``import utils`` or
+``from utils.audio_probe import ...`` does not pull in every engine and
+its dependencies.
 """
-from utils.tts_basic import BasicTTS
-from utils.tts_advanced import AdvancedTTS
-from utils.voice_clone import VoiceClone
-from utils.audio_utils import AudioUtils
-
-__all__ = [
-    "BasicTTS",
-    "AdvancedTTS",
-    "VoiceClone",
-    "AudioUtils",
-]
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "BasicTTS": "utils.tts_basic",
+    "AdvancedTTS": "utils.tts_advanced",
+    "VoiceClone": "utils.voice_clone",
+    "AudioUtils": "utils.audio_utils",
+    "AudioProbe": "utils.audio_probe",
+    "AudioInfo": "utils.audio_probe",
+    "AudioStats": "utils.audio_probe",
+    "AudioEncoder": "utils.audio_encoder",
+    "EncodeProfile": "utils.audio_encoder",
+    "EffectsChain": "utils.effects_chain",
+    "ModelRegistry": "utils.model_registry",
+    "OutputStore": "utils.output_store",
+    "SpeakerEmbeddingCache": "utils.embedding_cache",
+    "VoiceLibrary": "utils.voice_library",
+    "SynthesisCache": "utils.synthesis_cache",
+    "JobQueue": "utils.job_queue",
+    "AudioChunk": "utils.streaming",
+    "StreamingWavWriter": "utils.streaming",
+    "split_sentences": "utils.streaming",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from utils.tts_basic import BasicTTS
+    from utils.tts_advanced import AdvancedTTS
+    from utils.voice_clone import VoiceClone
+    from utils.audio_utils import AudioUtils
+    from utils.audio_probe import AudioInfo, AudioProbe, AudioStats
+    from utils.audio_encoder import AudioEncoder, EncodeProfile
+    from utils.effects_chain import EffectsChain
+    from utils.model_registry import ModelRegistry
+    from utils.output_store import OutputStore
+    from utils.embedding_cache import SpeakerEmbeddingCache
+    from utils.voice_library import VoiceLibrary
+    from utils.synthesis_cache import SynthesisCache
+    from utils.job_queue import JobQueue
+    from utils.streaming import AudioChunk, StreamingWavWriter, split_sentences
+
+
+def __getattr__(name: str):
+    """Import an exported name from its submodule on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
 
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,199 @@
+"""
+Out-of-core block processing for audio files larger than memory.
+
+Every operation streams the input through soundfile.blocks into a reused
+buffer, so memory use is bounded by the configured ceiling regardless of
+file length.
+"""
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from utils import audio_effects
+from utils.audio_probe import AudioProbe
+
+logger = logging.getLogger(__name__)
+
+# libsndfile formats handled in block mode, by file extension
+BLOCK_FORMATS = {'wav': 'WAV', 'flac': 'FLAC', 'ogg': 'OGG', 'mp3': 'MP3'}
+
+
+class BlockAudioProcessor:
+    """Constant-memory normalize, volume, trim and convert on audio files."""
+
+    # Working bytes per sample: read buffer plus float32 and int16 temporaries per block
+    BYTES_PER_SAMPLE = 16
+    MIN_BLOCK_FRAMES = 4096
+
+    def __init__(self, max_memory: int = 64 * 1024 * 1024):
+        """
+        Initialize the processor.
+
+        Args:
+            max_memory: Ceiling for the working buffers in bytes
+        """
+        self.max_memory = max_memory
+
+    def block_frames(self, channels: int, align: int = 1) -> int:
+        """
+        Frames per block that keep the working set under max_memory.
+
+        Args:
+            channels: Channel count of the file
+            align: Round down to a multiple of this (e.g. an analysis frame length)
+
+        Returns:
+            Block size in frames
+        """
+        frames = max(self.MIN_BLOCK_FRAMES, self.max_memory // (self.BYTES_PER_SAMPLE * max(channels, 1)))
+        return max(align, frames - frames % align)
+
+    def normalize(
+        self,
+        input_path: str,
+        output_path: str,
+        target_peak: float = 0.9,
+        target_rms_db: Optional[float] = None
+    ) -> float:
+        """
+        Two-pass normalization: measure the whole file, then apply one gain.
+
+        Args:
+            input_path: Path to input audio file
+            output_path: Path to output audio file
+            target_peak: Peak amplitude after normalization (0.9 is about -1dBFS)
+            target_rms_db: Normalize loudness to this RMS level in dBFS instead
+                (the gain is limited so the peak does not exceed 1.0)
+
+        Returns:
+            Gain applied, in dB
+        """
+        # AudioProbe.stats keeps about twice our per-sample working set (float block, magnitudes, mask)
+        info = sf.info(input_path)
+        stats = AudioProbe.shared().stats(input_path, block_frames=self.block_frames(info.channels) // 2)
+
+        if target_rms_db is not None and stats.rms > 0:
+            gain = 10 ** (target_rms_db / 20) / stats.rms
+            if stats.peak * gain > 1.0:
+                gain = 1.0 / stats.peak
+        elif stats.peak > 0:
+            gain = target_peak / stats.peak
+        else:
+            gain = 1.0
+
+        gain_db = float(20 * np.log10(gain))
+        self.change_volume(input_path, output_path, gain_db)
+        logger.info(f"Normalized {input_path} in blocks: peak {stats.peak:.3f}, gain {gain_db:+.2f}dB")
+        return gain_db
+
+    def change_volume(self, input_path: str, output_path: str, volume_db: float) -> None:
+        """
+        Apply a gain block by block, clipping to full scale.
+
+        Args:
+            input_path: Path to input audio file
+            output_path: Path to output audio file
+            volume_db: Gain in dB
+        """
+        with sf.SoundFile(input_path) as source, self._open_output(source, output_path) as sink:
+            blocksize = self.block_frames(source.channels)
+            pcm16 = source.subtype == "PCM_16"
+            buffer = np.empty((blocksize, source.channels), dtype=np.int16 if pcm16 else np.float32)
+            for block in source.blocks(out=buffer):
+                audio = audio_effects.pcm16_to_float(block) if pcm16 else block
+                audio_effects.apply_gain(audio, volume_db)
+                self._write(sink, audio)
+
+    def trim_silence(
+        self,
+        input_path: str,
+        output_path: str,
+        silence_thresh: float = 0.01,
+        min_silence_len: int = 500,
+        frame_ms: int = 10
+    ) -> Tuple[int, int]:
+        """
+        Trim leading and trailing silence in two passes.
+
+        The first pass finds the first and last loud analysis frame; the
+        second copies the frames between them without changing sample values.
+
+        Args:
+            input_path: Path to input audio file
+            output_path: Path to output audio file
+            silence_thresh: Silence threshold as a linear amplitude (0-1)
+            min_silence_len: Minimum silence length in ms worth trimming
+            frame_ms: Analysis frame length
+
+        Returns:
+            (start, stop) frame range that was kept
+        """
+        with sf.SoundFile(input_path) as source:
+            frame_length = max(1, int(source.samplerate * frame_ms / 1000))
+            blocksize = self.block_frames(source.channels, align=frame_length)
+            dtype = np.int16 if source.subtype == "PCM_16" else np.float32
+            buffer = np.empty((blocksize, source.channels), dtype=dtype)
+
+            first_loud, last_loud = None, None
+            position = 0
+            for block in source.blocks(out=buffer):
+                loud = np.flatnonzero(audio_effects.frame_rms(block, frame_length, frame_length) > silence_thresh)
+                if loud.size:
+                    if first_loud is None:
+                        first_loud = position + int(loud[0]) * frame_length
+                    last_loud = position + (int(loud[-1]) + 1) * frame_length
+                position += len(block)
+
+            total = source.frames
+            min_silence = int(source.samplerate * min_silence_len / 1000)
+            if first_loud is None:
+                start = stop = 0
+            else:
+                start = 0 if first_loud < min_silence else first_loud
+                stop = total if total - last_loud < min_silence else last_loud
+
+            source.seek(start)
+            with self._open_output(source, output_path) as sink:
+                remaining = stop - start
+                while remaining > 0:
+                    block = source.read(min(blocksize, remaining), dtype=buffer.dtype.name, out=buffer)
+                    if len(block) == 0:
+                        break
+                    self._write(sink, block)
+                    remaining -= len(block)
+
+        logger.info(f"Trimmed {input_path} in blocks to frames {start}-{stop}")
+        return start, stop
+
+    def convert(self, input_path: str, output_path: str, format: Optional[str] = None) -> None:
+        """
+        Re-encode a file block by block.
+
+        Args:
+            input_path: Path to input audio file
+            output_path: Path to output audio file
+            format: Output format (if not inferred from output_path)
+        """
+        with sf.SoundFile(input_path) as source, self._open_output(source, output_path, format) as sink:
+            blocksize = self.block_frames(source.channels)
+            dtype = np.int16 if source.subtype == "PCM_16" else np.float32
+            buffer = np.empty((blocksize, source.channels), dtype=dtype)
+            for block in source.blocks(out=buffer):
+                sink.write(block)
+
+    @staticmethod
+    def _open_output(source: sf.SoundFile, output_path: str, format: Optional[str] = None) -> sf.SoundFile:
+        """Open the output with the source's rate, channels and (if allowed) sample subtype."""
+        format = BLOCK_FORMATS[(format or Path(output_path).suffix[1:]).lower()]
+        subtype = source.subtype if sf.check_format(format, source.subtype) else None
+        return sf.SoundFile(output_path, "w", source.samplerate, source.channels, subtype=subtype, format=format)
+
+    @staticmethod
+    def _write(sink: sf.SoundFile, audio: np.ndarray) -> None:
+        """Write a block, converting float32 to int16 in NumPy for 16-bit outputs."""
+        if audio.dtype == np.float32 and sink.subtype == "PCM_16":
+            audio = audio_effects.float_to_pcm16(audio)
+        sink.write(audio)
@@ -0,0 +1,204 @@
+"""
+Vectorized NumPy kernels for common audio effects on float32 arrays.
+
+Arrays are (samples,) for mono or (samples, channels). Operations that
+only select part of the signal return views; gain changes work in place.
+Trimming and concatenation also accept int16 PCM, so files that are only
+cut or joined never need a float round trip.
+"""
+import logging
+from typing import List, Tuple
+
+import numpy as np
+
+from utils.resampler import resample
+
+logger = logging.getLogger(__name__)
+
+
+def pcm16_to_float(pcm: np.ndarray) -> np.ndarray:
+    """
+    Convert int16 PCM to float32 in [-1, 1).
+
+    Args:
+        pcm: int16 array
+
+    Returns:
+        New float32 array
+    """
+    return np.multiply(pcm, np.float32(1 / 32768), dtype=np.float32)
+
+
+def float_to_pcm16(audio: np.ndarray) -> np.ndarray:
+    """
+    Convert float audio to int16 PCM with rounding and clipping.
+
+    Args:
+        audio: Float array in [-1, 1]
+
+    Returns:
+        New int16 array
+    """
+    scaled = np.multiply(audio, np.float32(32767), dtype=np.float32)
+    np.clip(scaled, -32768, 32767, out=scaled)
+    return np.rint(scaled, out=scaled).astype(np.int16)
+
+
+def frame_rms(audio: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """
+    Root-mean-square level of each analysis frame, across all channels.
+
+    Frames are strided views over the signal, so no framed copy is made.
+
+    Args:
+        audio: Float or int16 array of shape (samples,) or (samples, channels)
+        frame_length: Samples per frame
+        hop_length: Samples between frame starts
+
+    Returns:
+        Float32 array with one RMS value (full scale = 1.0) per complete frame
+    """
+    if len(audio) < frame_length:
+        return np.zeros(0, dtype=np.float32)
+    windows = np.lib.stride_tricks.sliding_window_view(audio, frame_length, axis=0)[::hop_length]
+    # (frames, frame_length) or (frames, channels, frame_length)
+    subscripts = "ij,ij->i" if audio.ndim == 1 else "icj,icj->i"
+    energy = np.einsum(subscripts, windows, windows, dtype=np.float32, casting="unsafe")
+    rms = np.sqrt(energy / np.float32(windows[0].size))
+    if audio.dtype == np.int16:
+        rms *= np.float32(1 / 32768)
+    return rms
+
+
+def trim_silence(
+    audio: np.ndarray,
+    sample_rate: int,
+    threshold: float = 0.01,
+    min_silence_ms: int = 500,
+    frame_ms: int = 10
+) -> np.ndarray:
+    """
+    Remove leading and trailing silence.
+
+    A frame is silent when its RMS is at or below ``threshold``. Silence
+    at either end is only removed when it lasts at least ``min_silence_ms``.
+
+    Args:
+        audio: Float or int16 array of shape (samples,) or (samples, channels)
+        sample_rate: Sample rate of the audio
+        threshold: Silence level as a linear amplitude (0-1)
+        min_silence_ms: Shortest run of silence worth trimming
+        frame_ms: Analysis frame length
+
+    Returns:
+        View of ``audio`` without the silent ends
+    """
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    rms = frame_rms(audio, frame_length, frame_length)
+    loud = np.flatnonzero(rms > threshold)
+    if loud.size == 0:
+        return audio[:0]
+
+    min_silence = int(sample_rate * min_silence_ms / 1000)
+    start = int(loud[0]) * frame_length
+    end = min(len(audio), (int(loud[-1]) + 1) * frame_length)
+    if start < min_silence:
+        start = 0
+    if len(audio) - end < min_silence:
+        end = len(audio)
+    return audio[start:end]
+
+
+def apply_gain(audio: np.ndarray, gain_db: float) -> np.ndarray:
+    """
+    Change the level of float32 audio in place, clipping to [-1, 1].
+
+    Args:
+        audio: Writable float32 array
+        gain_db: Gain in dB
+
+    Returns:
+        The same array
+    """
+    np.multiply(audio, np.float32(10 ** (gain_db / 20)), out=audio)
+    np.clip(audio, -1.0, 1.0, out=audio)
+    return audio
+
+
+def peak_normalize(audio: np.ndarray, target_peak: float = 0.9) -> np.ndarray:
+    """
+    Scale float32 audio in place so its peak is ``target_peak``.
+
+    Args:
+        audio: Writable float32 array
+        target_peak: Peak amplitude after scaling (0.9 is about -1dBFS)
+
+    Returns:
+        The same array
+    """
+    peak = float(np.max(np.abs(audio))) if audio.size else 0.0
+    if peak > 0:
+        np.multiply(audio, np.float32(target_peak / peak), out=audio)
+    return audio
+
+
+def match_format(audio: np.ndarray, sample_rate: int, target_rate: int, target_channels: int) -> np.ndarray:
+    """
+    Resample and up-mix a 2-D clip to a common rate and channel count.
+
+    Args:
+        audio: Float array of shape (samples, channels)
+        sample_rate: Sample rate of the clip
+        target_rate: Sample rate to convert to
+        target_channels: Channel count to convert to (mono clips are duplicated)
+
+    Returns:
+        Float32 array of shape (samples, target_channels)
+    """
+    channels = audio.shape[1]
+    if channels != target_channels:
+        if channels != 1:
+            raise ValueError(f"Cannot map {channels} channels to {target_channels}")
+        audio = np.repeat(audio, target_channels, axis=1)
+    return resample(audio, sample_rate, target_rate)
+
+
+def concatenate(clips: List[Tuple[np.ndarray, int]]) -> Tuple[np.ndarray, int]:
+    """
+    Join clips end to end at the highest sample rate and channel count among them.
+
+    int16 clips that share one sample rate are joined without conversion;
+    anything else is converted to float32 first.
+
+    Args:
+        clips: (float or int16 array of shape (samples, channels), sample rate) pairs
+
+    Returns:
+        Tuple of (joined array, sample rate)
+    """
+    if not clips:
+        raise ValueError("Nothing to concatenate")
+    target_rate = max(rate for _, rate in clips)
+    target_channels = max(audio.shape[1] for audio, _ in clips)
+    native = all(audio.dtype == np.int16 and rate == target_rate for audio, rate in clips)
+    if native:
+        matched = [
+            audio if audio.shape[1] == target_channels else np.repeat(audio, target_channels, axis=1)
+            for audio, _ in clips
+        ]
+    else:
+        matched = [
+            match_format(
+                pcm16_to_float(audio) if audio.dtype == np.int16 else audio, rate, target_rate, target_channels
+            )
+            for audio, rate in clips
+        ]
+
+    # Single allocation for the result
+    total = sum(len(audio) for audio in matched)
+    joined = np.empty((total, target_channels), dtype=np.int16 if native else np.float32)
+    position = 0
+    for audio in matched:
+        joined[position:position + len(audio)] = audio
+        position += len(audio)
+    return joined, target_rate
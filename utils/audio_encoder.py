@@ -0,0 +1,270 @@
+"""
+In-process audio encoding through libsndfile codecs, with memoized derivatives.
+
+MP3 (LAME), Ogg/Opus and FLAC are encoded inside the process, so there is
+no ffmpeg subprocess per conversion. Derivatives of a source artifact
+(e.g. the MP3 of a synthesized WAV) are only produced when they are asked
+for, and each is encoded once per source content and profile.
+"""
+import inspect
+import io
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+from utils.audio_effects import pcm16_to_float
+from utils.audio_probe import AudioProbe
+from utils.resampler import resample
+
+logger = logging.getLogger(__name__)
+
+EncoderSource = Union[str, bytes, bytearray, memoryview]
+
+# Opus only runs at these rates; other inputs are resampled up to the next one
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+# sf.write takes compression_level and bitrate_mode from soundfile 0.13 (libsndfile 1.1)
+RATE_CONTROL_SUPPORTED = "bitrate_mode" in inspect.signature(sf.write).parameters
+
+
+@dataclass(frozen=True)
+class EncodeProfile:
+    """Target codec and rate control."""
+
+    format: str
+    bitrate_kbps: Optional[int] = None
+    compression_level: Optional[float] = None
+
+    @property
+    def extension(self) -> str:
+        """File extension for this profile."""
+        return self.format
+
+    @property
+    def mime(self) -> str:
+        """MIME type for this profile."""
+        return {"mp3": "audio/mpeg", "opus": "audio/ogg", "flac": "audio/flac", "wav": "audio/wav"}[self.format]
+
+
+# Common profiles: 192k CBR MP3, 64k Opus (transparent for speech), FLAC, 16-bit WAV
+PROFILES: Dict[str, EncodeProfile] = {
+    "mp3": EncodeProfile("mp3", bitrate_kbps=192),
+    "opus": EncodeProfile("opus", bitrate_kbps=64),
+    "flac": EncodeProfile("flac"),
+    "wav": EncodeProfile("wav"),
+}
+
+
+def mp3_compression_level(bitrate_kbps: int, sample_rate: int) -> float:
+    """
+    libsndfile compression level that makes LAME encode ``bitrate_kbps`` CBR.
+
+    libsndfile maps the level linearly onto the bitrate range of the MPEG
+    version implied by the sample rate (LAME then picks the nearest legal
+    bitrate).
+    """
+    if sample_rate >= 32000:
+        high, low = 320, 32    # MPEG-1
+    elif sample_rate >= 16000:
+        high, low = 160, 8     # MPEG-2
+    else:
+        high, low = 64, 8      # MPEG-2.5
+    return float(np.clip((high - bitrate_kbps) / (high - low), 0.0, 1.0))
+
+
+def opus_compression_level(bitrate_kbps: int) -> float:
+    """libsndfile compression level for an Opus target bitrate (256k at 0.0 down to 6k at 1.0)."""
+    return float(np.clip((256 - bitrate_kbps) / (256 - 6), 0.0, 1.0))
+
+
+def parse_bitrate(bitrate: Union[str, int]) -> int:
+    """Parse an ffmpeg-style bitrate ("192k", "64000", 128) into kbps."""
+    if isinstance(bitrate, int):
+        return bitrate if bitrate < 1000 else bitrate // 1000
+    text = bitrate.strip().lower()
+    if text.endswith("k"):
+        return int(float(text[:-1]))
+    return int(text) // 1000
+
+
+class AudioEncoder:
+    """Encode waveforms and memoize per-source derivatives."""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the encoder.
+
+        Args:
+            max_bytes: Total size of memoized derivatives kept (least recently used are evicted)
+        """
+        self.max_bytes = max_bytes
+        self._derivatives: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[tuple, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls) -> "AudioEncoder":
+        """Process-wide encoder shared by the app and engines."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def encode(
+        audio: np.ndarray,
+        sample_rate: int,
+        profile: EncodeProfile,
+        output: Optional[Union[str, BinaryIO]] = None
+    ) -> Optional[bytes]:
+        """
+        Encode a waveform in process.
+
+        Args:
+            audio: Float32 or int16 array of shape (samples,) or (samples, channels)
+            sample_rate: Sample rate of ``audio``
+            profile: Target codec and rate control
+            output: File path or writable buffer (None returns the encoded bytes)
+
+        Returns:
+            Encoded bytes when ``output`` is None, otherwise None
+        """
+        options = {}
+        if profile.format == "mp3":
+            format, subtype = "MP3", "MPEG_LAYER_III"
+            if profile.bitrate_kbps is not None:
+                options["compression_level"] = mp3_compression_level(profile.bitrate_kbps, sample_rate)
+                options["bitrate_mode"] = "CONSTANT"
+        elif profile.format == "opus":
+            format, subtype = "OGG", "OPUS"
+            target_rate = next((rate for rate in OPUS_SAMPLE_RATES if rate >= sample_rate), 48000)
+            if target_rate != sample_rate:
+                if audio.dtype == np.int16:
+                    audio = pcm16_to_float(audio)
+                audio = resample(audio, sample_rate, target_rate)
+                sample_rate = target_rate
+            if profile.bitrate_kbps is not None:
+                options["compression_level"] = opus_compression_level(profile.bitrate_kbps)
+        elif profile.format == "flac":
+            format, subtype = "FLAC", "PCM_16"
+        elif profile.format == "wav":
+            format, subtype = "WAV", "PCM_16"
+        else:
+            raise ValueError(f"Unsupported encoder format: {profile.format}")
+        if profile.compression_level is not None:
+            options["compression_level"] = profile.compression_level
+        if options and not RATE_CONTROL_SUPPORTED:
+            # Older soundfile rejects the arguments; encode at the codec's default rate
+            logger.debug(f"soundfile {sf.__version__} has no rate control; ignoring {profile}")
+            options = {}
+
+        buffer = io.BytesIO() if output is None else None
+        sf.write(buffer if buffer is not None else output, audio, sample_rate,
+                 format=format, subtype=subtype, **options)
+        return buffer.getvalue() if buffer is not None else None
+
+    @staticmethod
+    def transcode(source: EncoderSource, profile: EncodeProfile) -> bytes:
+        """
+        Decode a file or encoded buffer and re-encode it in process.
+
+        Args:
+            source: File path or encoded audio in memory
+            profile: Target codec and rate control
+
+        Returns:
+            Encoded bytes
+        """
+        if not isinstance(source, str):
+            source = io.BytesIO(bytes(source))
+        with sf.SoundFile(source) as f:
+            dtype = "int16" if f.subtype == "PCM_16" and profile.format in ("wav", "flac") else "float32"
+            audio = f.read(dtype=dtype, always_2d=True)
+            sample_rate = f.samplerate
+        return AudioEncoder.encode(audio, sample_rate, profile)
+
+    def derivative(self, source: EncoderSource, profile: EncodeProfile) -> bytes:
+        """
+        Encoded derivative of a source artifact, produced on first request.
+
+        Keyed by the source's content identity (path, size and mtime, or a hash
+        of in-memory bytes) and the profile. Concurrent requests for the same
+        derivative wait for one encode instead of repeating it.
+
+        Args:
+            source: File path or encoded audio in memory
+            profile: Target codec and rate control
+
+        Returns:
+            Encoded bytes
+        """
+        key = AudioProbe.cache_key(source) + (profile,)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                cached = self._lookup(key)
+                if cached is not None:
+                    return cached
+                with self._lock:
+                    self.misses += 1
+                data = self.transcode(source, profile)
+                self._store(key, data)
+        finally:
+            # Also on a failed encode, so the key does not keep a lock forever
+            with self._lock:
+                self._inflight.pop(key, None)
+        logger.info(f"Encoded {profile.format} derivative ({len(data) / 1024:.0f}KB)")
+        return data
+
+    def _lookup(self, key: tuple) -> Optional[bytes]:
+        """Memoized derivative for ``key``, marked most recently used."""
+        with self._lock:
+            data = self._derivatives.get(key)
+            if data is not None:
+                self._derivatives.move_to_end(key)
+                self.hits += 1
+            return data
+
+    def _store(self, key: tuple, data: bytes) -> None:
+        """Memoize a derivative, evicting the least recently used over max_bytes."""
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._derivatives[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._derivatives.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        """Drop all memoized derivatives."""
+        with self._lock:
+            self._derivatives.clear()
+            self._size = 0
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Memoization statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._derivatives),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
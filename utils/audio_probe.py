@@ -0,0 +1,528 @@
+"""
+Header-only audio probing with a metadata cache.
+
+Duration, sample rate and channel count are read from the container
+headers of WAV/RF64, FLAC, Ogg (Vorbis, Opus, FLAC) and MP3 files without
+decoding any audio. MP3 length comes from the Xing/Info or VBRI header,
+or is estimated from the bitrate for CBR files without one.
+"""
+import hashlib
+import io
+import logging
+import os
+import struct
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Hashable, Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+# A file path or encoded audio held in memory
+AudioSource = Union[str, Path, bytes, bytearray, memoryview]
+
+# Bytes scanned for the first MP3 frame after any ID3v2 tag
+_MP3_SCAN_BYTES = 64 * 1024
+# An Ogg page is at most 65307 bytes, so the last page starts within this tail
+_OGG_TAIL_BYTES = 65536
+
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),   # MPEG-2.5
+}
+_MP3_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+
+@dataclass(frozen=True)
+class AudioInfo:
+    """Container-level description of an audio file."""
+    format: str
+    codec: str
+    sample_rate: int
+    channels: int
+    frames: int
+    file_size: int
+    exact: bool = True
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds (an estimate when ``exact`` is False)."""
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+
+
+@dataclass(frozen=True)
+class AudioStats:
+    """Level statistics of a decoded file."""
+    peak: float
+    rms: float
+    clipping_ratio: float
+    frames: int
+
+    @property
+    def peak_db(self) -> float:
+        """Peak level in dBFS."""
+        return 20 * np.log10(self.peak) if self.peak > 0 else float("-inf")
+
+    @property
+    def rms_db(self) -> float:
+        """RMS level in dBFS."""
+        return 20 * np.log10(self.rms) if self.rms > 0 else float("-inf")
+
+
+class AudioProbe:
+    """Reads audio metadata from headers and caches it per file version or content."""
+
+    _shared: Optional["AudioProbe"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize an empty probe cache.
+
+        Args:
+            max_entries: Probe results kept before the least recently used is dropped
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls) -> "AudioProbe":
+        """Get the probe shared by every session in this process."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def cache_key(source: AudioSource) -> Tuple:
+        """
+        Identity of a source: (path, size, mtime) for files, content hash for buffers.
+
+        Args:
+            source: File path or encoded audio in memory
+
+        Returns:
+            Hashable key that changes whenever the audio may have changed
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return ("bytes", hashlib.sha256(source).hexdigest())
+        path = Path(source).resolve()
+        stat = path.stat()
+        return ("file", str(path), stat.st_size, stat.st_mtime_ns)
+
+    def probe(self, source: AudioSource) -> AudioInfo:
+        """
+        Get format, rate, channels and length from the container headers.
+
+        Formats the header parsers do not cover fall back to libsndfile's
+        own header reader (sf.info).
+
+        Args:
+            source: File path or encoded audio in memory
+
+        Returns:
+            AudioInfo for the source
+
+        Raises:
+            ValueError: If the source is not a readable audio file
+        """
+        key = ("info",) + self.cache_key(source)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        with _open(source) as f:
+            size = _source_size(source, f)
+            try:
+                info = _parse(f, size)
+            except ValueError as e:
+                logger.debug(f"Header parsing failed ({str(e)}), falling back to sf.info")
+                f.seek(0)
+                try:
+                    sf_info = sf.info(f)
+                except Exception as sf_error:
+                    raise ValueError(f"Unrecognized audio file: {str(sf_error)}") from e
+                info = AudioInfo(
+                    format=sf_info.format,
+                    codec=sf_info.subtype.lower(),
+                    sample_rate=sf_info.samplerate,
+                    channels=sf_info.channels,
+                    frames=sf_info.frames,
+                    file_size=size,
+                )
+        return self._store(key, info)
+
+    def stats(
+        self,
+        source: AudioSource,
+        block_frames: int = 65536,
+        clip_threshold: float = 0.999
+    ) -> AudioStats:
+        """
+        Compute peak, RMS and clipping ratio in one blockwise decoding pass.
+
+        Only one block of ``block_frames`` frames is held in memory at a time.
+
+        Args:
+            source: File path or encoded audio in memory
+            block_frames: Frames decoded per block
+            clip_threshold: Absolute sample value counted as clipped
+
+        Returns:
+            AudioStats over all channels
+        """
+        key = ("stats", clip_threshold) + self.cache_key(source)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        peak = 0.0
+        sum_squares = 0.0
+        clipped = 0
+        samples = 0
+        with _open(source) as f:
+            for block in sf.blocks(f, blocksize=block_frames, dtype="float32", always_2d=True):
+                magnitude = np.abs(block.ravel())
+                if magnitude.size == 0:
+                    continue
+                peak = max(peak, float(magnitude.max()))
+                sum_squares += float(np.dot(magnitude, magnitude))
+                clipped += int(np.count_nonzero(magnitude >= clip_threshold))
+                samples += magnitude.size
+
+        channels = self.probe(source).channels
+        stats = AudioStats(
+            peak=peak,
+            rms=float(np.sqrt(sum_squares / samples)) if samples else 0.0,
+            clipping_ratio=clipped / samples if samples else 0.0,
+            frames=samples // max(channels, 1),
+        )
+        return self._store(key, stats)
+
+    def _lookup(self, key: Hashable):
+        """Get a cached result and record a hit or miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _store(self, key: Hashable, value):
+        """Cache a result, dropping the least recently used above max_entries."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached result and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_stats(self) -> dict:
+        """Get hit/miss counters and cache size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+def _open(source: AudioSource) -> BinaryIO:
+    """Open a path for reading, or wrap a buffer in a file object."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return open(source, "rb")
+
+
+def _source_size(source: AudioSource, f: BinaryIO) -> int:
+    """Total size of the source in bytes."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).nbytes
+    return os.fstat(f.fileno()).st_size
+
+
+def _parse(f: BinaryIO, size: int) -> AudioInfo:
+    """Dispatch on the container magic bytes."""
+    offset = _id3v2_size(f)
+    f.seek(offset)
+    magic = f.read(4)
+    if magic in (b"RIFF", b"RF64") and offset == 0:
+        return _probe_wav(f, size)
+    if magic == b"fLaC":
+        return _probe_flac(f, size, offset)
+    if magic == b"OggS" and offset == 0:
+        return _probe_ogg(f, size)
+    # Bare MPEG audio starts with a frame sync; anything else needs an ID3 tag to be taken for MP3
+    if offset > 0 or _mp3_frame_header(magic) is not None:
+        return _probe_mp3(f, size, offset)
+    raise ValueError("Unrecognized container")
+
+
+def _id3v2_size(f: BinaryIO) -> int:
+    """Length of a leading ID3v2 tag (0 if there is none)."""
+    f.seek(0)
+    header = f.read(10)
+    if len(header) < 10 or header[:3] != b"ID3":
+        return 0
+    # Syncsafe integer: 7 bits per byte
+    length = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + length + footer
+
+
+def _probe_wav(f: BinaryIO, size: int) -> AudioInfo:
+    """Walk RIFF/RF64 chunk headers for 'fmt ' and the data length."""
+    f.seek(0)
+    header = f.read(12)
+    if len(header) < 12 or header[8:12] != b"WAVE":
+        raise ValueError("Not a WAVE file")
+    is_rf64 = header[:4] == b"RF64"
+
+    fmt = None
+    ds64_data_size = None
+    data_size = None
+    position = 12
+    while position + 8 <= size:
+        f.seek(position)
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            break
+        chunk_id, chunk_size = chunk_header[:4], struct.unpack("<I", chunk_header[4:])[0]
+        if chunk_id == b"ds64":
+            ds64_data_size = struct.unpack("<Q", f.read(16)[8:16])[0]
+        elif chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", f.read(16))
+        elif chunk_id == b"data":
+            if is_rf64 and chunk_size == 0xFFFFFFFF and ds64_data_size is not None:
+                data_size = ds64_data_size
+            elif chunk_size in (0, 0xFFFFFFFF) or position + 8 + chunk_size > size:
+                # Streamed or truncated file: the data runs to the end
+                data_size = size - position - 8
+            else:
+                data_size = chunk_size
+            if fmt is not None:
+                break
+            chunk_size = data_size
+        position += 8 + chunk_size + (chunk_size & 1)
+
+    if fmt is None or data_size is None:
+        raise ValueError("WAVE file without fmt or data chunk")
+    format_tag, channels, sample_rate, _, block_align, bits = fmt
+    if not channels or not block_align:
+        raise ValueError("Invalid WAVE fmt chunk")
+    codec = {1: f"pcm_{bits}", 3: "float", 6: "alaw", 7: "ulaw", 0xFFFE: f"extensible_{bits}"}.get(
+        format_tag, f"0x{format_tag:04x}"
+    )
+    return AudioInfo(
+        format="RF64" if is_rf64 else "WAV",
+        codec=codec,
+        sample_rate=sample_rate,
+        channels=channels,
+        frames=data_size // block_align,
+        file_size=size,
+    )
+
+
+def _parse_streaminfo(streaminfo: bytes) -> Tuple[int, int, int]:
+    """Sample rate, channels and total samples from a FLAC STREAMINFO block."""
+    if len(streaminfo) < 18:
+        raise ValueError("Truncated FLAC STREAMINFO")
+    # 20 bits rate, 3 bits channels-1, 5 bits bits-per-sample-1, 36 bits total samples
+    packed = int.from_bytes(streaminfo[10:18], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    total_samples = packed & 0xFFFFFFFFF
+    if not sample_rate or not total_samples:
+        raise ValueError("FLAC STREAMINFO without rate or length")
+    return sample_rate, channels, total_samples
+
+
+def _probe_flac(f: BinaryIO, size: int, offset: int) -> AudioInfo:
+    """Read the STREAMINFO metadata block that follows the fLaC marker."""
+    f.seek(offset + 4)
+    block_header = f.read(4)
+    if len(block_header) < 4 or block_header[0] & 0x7F != 0:
+        raise ValueError("FLAC file does not start with STREAMINFO")
+    sample_rate, channels, total_samples = _parse_streaminfo(f.read(34))
+    return AudioInfo(
+        format="FLAC",
+        codec="flac",
+        sample_rate=sample_rate,
+        channels=channels,
+        frames=total_samples,
+        file_size=size,
+    )
+
+
+def _probe_ogg(f: BinaryIO, size: int) -> AudioInfo:
+    """Read the identification header and the granule position of the last page."""
+    f.seek(0)
+    page = f.read(27)
+    if len(page) < 27:
+        raise ValueError("Truncated Ogg page")
+    serial = struct.unpack("<I", page[14:18])[0]
+    segments = f.read(page[26])
+    packet = f.read(min(sum(segments), 64))
+
+    pre_skip = 0
+    if packet.startswith(b"\x01vorbis"):
+        codec = "vorbis"
+        channels = packet[11]
+        sample_rate = struct.unpack("<I", packet[12:16])[0]
+    elif packet.startswith(b"OpusHead"):
+        # Opus always decodes at 48kHz; pre-skip samples are dropped by the decoder
+        codec = "opus"
+        channels = packet[9]
+        pre_skip = struct.unpack("<H", packet[10:12])[0]
+        sample_rate = 48000
+    elif packet.startswith(b"\x7fFLAC"):
+        codec = "flac"
+        sample_rate, channels, _ = _parse_streaminfo(packet[17:])
+    else:
+        raise ValueError("Unsupported Ogg codec")
+
+    f.seek(max(0, size - _OGG_TAIL_BYTES))
+    tail = f.read()
+    granule = -1
+    end = len(tail)
+    while granule < 0:
+        index = tail.rfind(b"OggS", 0, end)
+        if index < 0 or index + 18 > len(tail):
+            raise ValueError("No final Ogg page found")
+        if struct.unpack("<I", tail[index + 14:index + 18])[0] == serial:
+            granule = struct.unpack("<q", tail[index + 6:index + 14])[0]
+        end = index
+
+    return AudioInfo(
+        format="OGG",
+        codec=codec,
+        sample_rate=sample_rate,
+        channels=channels,
+        frames=max(granule - pre_skip, 0),
+        file_size=size,
+    )
+
+
+def _mp3_frame_header(header: bytes) -> Optional[dict]:
+    """Decode a 4-byte MPEG audio frame header (None if it is not one)."""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x3
+    layer_bits = (header[1] >> 1) & 0x3
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x3
+    if version == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    layer = 4 - layer_bits
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    padding = (header[2] >> 1) & 0x1
+    if layer == 1:
+        samples_per_frame = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples_per_frame = 1152 if (layer == 2 or mpeg1) else 576
+        frame_length = samples_per_frame // 8 * bitrate // sample_rate + padding
+    return {
+        "mpeg1": mpeg1,
+        "layer": layer,
+        "sample_rate": sample_rate,
+        "bitrate": bitrate,
+        "channels": 1 if header[3] >> 6 == 3 else 2,
+        "samples_per_frame": samples_per_frame,
+        "frame_length": frame_length,
+    }
+
+
+def _probe_mp3(f: BinaryIO, size: int, offset: int) -> AudioInfo:
+    """Find the first frame and read its Xing/Info or VBRI header."""
+    f.seek(offset)
+    buffer = f.read(_MP3_SCAN_BYTES)
+
+    # First sync whose successor frame also parses (guards against false syncs)
+    frame, start = None, buffer.find(b"\xff")
+    while start >= 0:
+        candidate = _mp3_frame_header(buffer[start:start + 4])
+        if candidate is not None:
+            following = start + candidate["frame_length"]
+            if following + 4 <= len(buffer):
+                successor = _mp3_frame_header(buffer[following:following + 4])
+            else:
+                # The successor lies past the scanned bytes; read it from the source
+                f.seek(offset + following)
+                successor = _mp3_frame_header(f.read(4))
+            if successor is not None and successor["sample_rate"] == candidate["sample_rate"]:
+                frame = candidate
+                break
+        start = buffer.find(b"\xff", start + 1)
+    if frame is None:
+        raise ValueError("No MPEG audio frame found")
+
+    # The Xing/Info tag sits after the side information of the first frame
+    if frame["layer"] == 3:
+        stereo = frame["channels"] == 2
+        side_info = (32 if stereo else 17) if frame["mpeg1"] else (17 if stereo else 9)
+    else:
+        side_info = 0
+    xing = start + 4 + side_info
+    vbri = start + 4 + 32
+
+    frame_count = None
+    gapless_trim = 0
+    if buffer[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", buffer[xing + 4:xing + 8])[0]
+        if flags & 0x1:
+            frame_count = struct.unpack(">I", buffer[xing + 8:xing + 12])[0]
+        # Optional fields (frames, bytes, TOC, quality) precede the LAME tag
+        lame = xing + 8 + sum(length for bit, length in ((0x1, 4), (0x2, 4), (0x4, 100), (0x8, 4)) if flags & bit)
+        if buffer[lame:lame + 4] == b"LAME" and len(buffer) >= lame + 24:
+            # 12 bits encoder delay, 12 bits end padding
+            delay_padding = int.from_bytes(buffer[lame + 21:lame + 24], "big")
+            gapless_trim = (delay_padding >> 12) + (delay_padding & 0xFFF)
+    elif buffer[vbri:vbri + 4] == b"VBRI":
+        frame_count = struct.unpack(">I", buffer[vbri + 14:vbri + 18])[0]
+
+    if frame_count is not None:
+        frames = max(frame_count * frame["samples_per_frame"] - gapless_trim, 0)
+        exact = True
+    else:
+        # Constant bitrate: estimate from the audio payload size
+        audio_bytes = size - offset - start
+        f.seek(max(0, size - 128))
+        if f.read(3) == b"TAG":
+            audio_bytes -= 128
+        frames = int(audio_bytes * 8 / frame["bitrate"] * frame["sample_rate"])
+        exact = False
+
+    return AudioInfo(
+        format="MP3",
+        codec=f"mpeg{'1' if frame['mpeg1'] else '2'}_layer{frame['layer']}",
+        sample_rate=frame["sample_rate"],
+        channels=frame["channels"],
+        frames=frames,
+        file_size=size,
+        exact=exact,
+    )
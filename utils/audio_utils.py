@@ -4,10 +4,14 @@ Audio utility functions for format conversion and processing.
 import logging
 import io
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 import numpy as np
 import soundfile as sf
-from pydub import AudioSegment
+from utils import audio_effects
+from utils.audio_blocks import BlockAudioProcessor
+from utils.audio_encoder import AudioEncoder, EncodeProfile, parse_bitrate
+from utils.effects_chain import EffectsChain
+from utils.audio_probe import AudioProbe
 
 logger = logging.getLogger(__name__)
 
@@ -17,11 +21,27 @@ class AudioUtils:
     
     SUPPORTED_FORMATS = ['mp3', 'wav', 'ogg', 'flac', 'm4a']
     
+    # Formats processed in NumPy through libsndfile; others go through pydub/ffmpeg
+    NUMPY_FORMATS = {'wav': 'WAV', 'flac': 'FLAC', 'ogg': 'OGG', 'mp3': 'MP3'}
+    
+    # Frames converted to int16 per write when encoding 16-bit PCM
+    PCM_BLOCK_FRAMES = 1 << 18
+    
+    # ffmpeg muxer names for extensions that are not muxers themselves
+    FFMPEG_FORMATS = {'m4a': 'ipod'}
+    
+    # Files whose decoded float32 size exceeds this are processed out of core
+    STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+    
+    # Memory ceiling for the working buffers in streaming mode
+    STREAMING_MAX_MEMORY = 64 * 1024 * 1024
+    
     @staticmethod
     def convert_format(
         input_path: str,
         output_path: str,
-        format: Optional[str] = None
+        format: Optional[str] = None,
+        streaming: Optional[bool] = None
     ) -> bool:
         """
         Convert audio file from one format to another.
@@ -30,6 +50,8 @@ class AudioUtils:
             input_path: Path to input audio file
             output_path: Path to output audio file
             format: Output format (if not inferred from output_path)
+            streaming: Process block by block in constant memory
+                (default: only files above STREAMING_THRESHOLD_BYTES)
             
         Returns:
             True if conversion successful, False otherwise
@@ -39,11 +61,36 @@ class AudioUtils:
             if format is None:
                 format = Path(output_path).suffix[1:].lower()
             
+            if not AudioUtils._numpy_capable(input_path, format):
+                return AudioUtils._convert_format_pydub(input_path, output_path, format)
+            
+            if AudioUtils._use_streaming(input_path, streaming):
+                AudioUtils._block_processor().convert(input_path, output_path, format)
+            else:
+                audio, sr, subtype = AudioUtils._read(input_path, keep_pcm16=True)
+                AudioUtils._write(output_path, audio, sr, subtype, format)
+            
+            logger.info(f"Converted {input_path} to {output_path}")
+            return True
+            
+        except sf.SoundFileError as e:
+            logger.info(f"libsndfile cannot convert {input_path} ({str(e)}), using pydub")
+            return AudioUtils._convert_format_pydub(input_path, output_path, format)
+        except Exception as e:
+            logger.error(f"Error converting audio: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _convert_format_pydub(input_path: str, output_path: str, format: str) -> bool:
+        """pydub/ffmpeg fallback for convert_format."""
+        try:
+            from pydub import AudioSegment
+            
             # Load audio
             audio = AudioSegment.from_file(input_path)
             
             # Export in new format
-            audio.export(output_path, format=format)
+            audio.export(output_path, format=AudioUtils.FFMPEG_FORMATS.get(format, format))
             
             logger.info(f"Converted {input_path} to {output_path}")
             return True
@@ -59,8 +106,27 @@ class AudioUtils:
     
     @staticmethod
     def wav_to_mp3(input_path: str, output_path: str, bitrate: str = "192k") -> bool:
-        """Convert WAV to MP3 format."""
+        """Convert WAV to MP3 format (CBR, encoded in process with LAME)."""
+        try:
+            data = AudioEncoder.transcode(input_path, EncodeProfile("mp3", parse_bitrate(bitrate)))
+            with open(output_path, "wb") as f:
+                f.write(data)
+            logger.info(f"Converted {input_path} to {output_path}")
+            return True
+        except (sf.SoundFileError, TypeError, ValueError) as e:
+            # No MP3 support in this libsndfile/soundfile build
+            logger.info(f"libsndfile cannot encode {input_path} ({str(e)}), using pydub")
+            return AudioUtils._wav_to_mp3_pydub(input_path, output_path, bitrate)
+        except Exception as e:
+            logger.error(f"Error converting to MP3: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _wav_to_mp3_pydub(input_path: str, output_path: str, bitrate: str) -> bool:
+        """pydub/ffmpeg fallback for wav_to_mp3."""
         try:
+            from pydub import AudioSegment
+            
             audio = AudioSegment.from_wav(input_path)
             audio.export(output_path, format="mp3", bitrate=bitrate)
             logger.info(f"Converted {input_path} to {output_path}")
@@ -70,37 +136,80 @@ class AudioUtils:
             return False
     
     @staticmethod
-    def get_audio_info(audio_path: str) -> dict:
+    def encode(audio: np.ndarray, sample_rate: int, format: str = "wav") -> bytes:
+        """
+        Encode a waveform in memory.
+        
+        Args:
+            audio: Float waveform of shape (samples,) or (samples, channels)
+            sample_rate: Sample rate of the waveform
+            format: Container format understood by libsndfile (wav, flac, ogg, mp3)
+            
+        Returns:
+            Encoded audio bytes
+        """
+        buffer = io.BytesIO()
+        sf.write(buffer, audio, sample_rate, format=format.upper())
+        return buffer.getvalue()
+    
+    @staticmethod
+    def transcode(data: bytes, format: str) -> Optional[bytes]:
+        """
+        Convert encoded audio to another format without touching the disk.
+        
+        Args:
+            data: Encoded input audio
+            format: Output format (wav, flac, ogg, mp3)
+            
+        Returns:
+            Encoded audio bytes, or None if conversion failed
+        """
+        try:
+            audio, sr = sf.read(io.BytesIO(data), dtype="float32")
+            return AudioUtils.encode(audio, sr, format)
+        except Exception as e:
+            logger.error(f"Error transcoding audio: {str(e)}")
+            return None
+    
+    @staticmethod
+    def get_audio_info(audio_path: Union[str, bytes], include_stats: bool = False) -> dict:
         """
         Get information about an audio file.
         
+        Only container headers are read (no decoding), and results are
+        cached per file version or content, so repeated calls are cheap.
+        
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file, or encoded audio in memory
+            include_stats: Also report peak, RMS and clipping ratio (one streaming decode pass)
             
         Returns:
             Dictionary with audio information
         """
         try:
-            audio, sr = sf.read(audio_path)
-            
-            # Get duration
-            duration = len(audio) / sr
-            
-            # Get channels
-            channels = 1 if len(audio.shape) == 1 else audio.shape[1]
-            
-            # Get file size
-            file_size = Path(audio_path).stat().st_size
+            probe = AudioProbe.shared()
+            info = probe.probe(audio_path)
             
-            return {
+            result = {
                 "success": True,
-                "sample_rate": sr,
-                "channels": channels,
-                "duration": round(duration, 2),
-                "file_size": file_size,
-                "file_size_mb": round(file_size / (1024 * 1024), 2)
+                "format": info.format,
+                "sample_rate": info.sample_rate,
+                "channels": info.channels,
+                "duration": round(info.duration, 2),
+                "file_size": info.file_size,
+                "file_size_mb": round(info.file_size / (1024 * 1024), 2)
             }
             
+            if include_stats:
+                stats = probe.stats(audio_path)
+                result.update({
+                    "peak": round(stats.peak, 4),
+                    "rms": round(stats.rms, 4),
+                    "clipping_ratio": round(stats.clipping_ratio, 6)
+                })
+            
+            return result
+            
         except Exception as e:
             logger.error(f"Error getting audio info: {str(e)}")
             return {
@@ -109,27 +218,34 @@ class AudioUtils:
             }
     
     @staticmethod
-    def normalize_audio(audio_path: str, output_path: str) -> bool:
+    def normalize_audio(audio_path: str, output_path: str, streaming: Optional[bool] = None) -> bool:
         """
         Normalize audio file.
         
+        In streaming mode the file is read twice: once to measure the peak,
+        once to apply the gain.
+        
         Args:
             audio_path: Path to input audio file
             output_path: Path to output normalized audio
+            streaming: Process block by block in constant memory
+                (default: only files above STREAMING_THRESHOLD_BYTES)
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            audio, sr = sf.read(audio_path)
+            if AudioUtils._use_streaming(audio_path, streaming):
+                AudioUtils._block_processor().normalize(audio_path, output_path, target_peak=0.9)
+                logger.info(f"Normalized audio saved to: {output_path}")
+                return True
+            
+            audio, sr, subtype = AudioUtils._read(audio_path)
             
             # Normalize to -1dBFS
-            peak = np.abs(audio).max()
-            if peak > 0:
-                target_peak = 0.9  # -1dBFS
-                audio = audio * (target_peak / peak)
+            audio_effects.peak_normalize(audio, target_peak=0.9)
             
-            sf.write(output_path, audio, sr)
+            AudioUtils._write(output_path, audio, sr, subtype)
             logger.info(f"Normalized audio saved to: {output_path}")
             return True
             
@@ -142,28 +258,65 @@ class AudioUtils:
         audio_path: str,
         output_path: str,
         silence_thresh: float = 0.01,
-        min_silence_len: int = 500
+        min_silence_len: int = 500,
+        streaming: Optional[bool] = None
     ) -> bool:
         """
-        Trim silence from audio file.
+        Trim silence from the start and end of an audio file.
         
         Args:
             audio_path: Path to input audio file
             output_path: Path to output trimmed audio
             silence_thresh: Silence threshold (0-1)
             min_silence_len: Minimum silence length in ms
+            streaming: Process block by block in constant memory
+                (default: only files above STREAMING_THRESHOLD_BYTES)
             
         Returns:
             True if successful, False otherwise
         """
+        if not AudioUtils._numpy_capable(audio_path, output_path):
+            return AudioUtils._trim_silence_pydub(audio_path, output_path, silence_thresh, min_silence_len)
+        try:
+            if AudioUtils._use_streaming(audio_path, streaming):
+                AudioUtils._block_processor().trim_silence(audio_path, output_path, silence_thresh, min_silence_len)
+            else:
+                audio, sr, subtype = AudioUtils._read(audio_path, keep_pcm16=True)
+                trimmed = audio_effects.trim_silence(audio, sr, silence_thresh, min_silence_len)
+                AudioUtils._write(output_path, trimmed, sr, subtype)
+            logger.info(f"Trimmed audio saved to: {output_path}")
+            return True
+            
+        except sf.SoundFileError as e:
+            logger.info(f"libsndfile cannot process {audio_path} ({str(e)}), using pydub")
+            return AudioUtils._trim_silence_pydub(audio_path, output_path, silence_thresh, min_silence_len)
+        except Exception as e:
+            logger.error(f"Error trimming silence: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _trim_silence_pydub(
+        audio_path: str,
+        output_path: str,
+        silence_thresh: float = 0.01,
+        min_silence_len: int = 500
+    ) -> bool:
+        """pydub/ffmpeg fallback for trim_silence."""
         try:
+            from pydub import AudioSegment
+            from pydub.silence import detect_leading_silence
+            
             audio = AudioSegment.from_file(audio_path)
             
-            # Trim silence from start and end
-            trimmed = audio.strip_silence(
-                silence_thresh=silence_thresh,
-                min_silence_len=min_silence_len
-            )
+            # pydub thresholds are in dBFS
+            thresh_db = 20 * np.log10(max(silence_thresh, 1e-10))
+            start = detect_leading_silence(audio, silence_threshold=thresh_db)
+            end = len(audio) - detect_leading_silence(audio.reverse(), silence_threshold=thresh_db)
+            if start < min_silence_len:
+                start = 0
+            if len(audio) - end < min_silence_len:
+                end = len(audio)
+            trimmed = audio[start:end]
             
             trimmed.export(output_path, format=Path(output_path).suffix[1:])
             logger.info(f"Trimmed audio saved to: {output_path}")
@@ -178,6 +331,9 @@ class AudioUtils:
         """
         Merge multiple audio files into one.
         
+        Clips with different sample rates or channel counts are converted
+        to the highest rate and channel count among them.
+        
         Args:
             audio_files: List of audio file paths
             output_path: Path to output merged audio
@@ -185,7 +341,34 @@ class AudioUtils:
         Returns:
             True if successful, False otherwise
         """
+        if not AudioUtils._numpy_capable(*audio_files, output_path):
+            return AudioUtils._merge_audio_pydub(audio_files, output_path)
+        try:
+            clips = []
+            subtype = None
+            for audio_file in audio_files:
+                audio, sr, file_subtype = AudioUtils._read(audio_file, keep_pcm16=True)
+                clips.append((audio, sr))
+                subtype = subtype or file_subtype
+            
+            merged, sr = audio_effects.concatenate(clips)
+            AudioUtils._write(output_path, merged, sr, subtype)
+            logger.info(f"Merged audio saved to: {output_path}")
+            return True
+            
+        except sf.SoundFileError as e:
+            logger.info(f"libsndfile cannot merge these files ({str(e)}), using pydub")
+            return AudioUtils._merge_audio_pydub(audio_files, output_path)
+        except Exception as e:
+            logger.error(f"Error merging audio: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _merge_audio_pydub(audio_files: list, output_path: str) -> bool:
+        """pydub/ffmpeg fallback for merge_audio."""
         try:
+            from pydub import AudioSegment
+            
             combined = AudioSegment.empty()
             
             for audio_file in audio_files:
@@ -201,7 +384,12 @@ class AudioUtils:
             return False
     
     @staticmethod
-    def change_volume(audio_path: str, output_path: str, volume_db: float) -> bool:
+    def change_volume(
+        audio_path: str,
+        output_path: str,
+        volume_db: float,
+        streaming: Optional[bool] = None
+    ) -> bool:
         """
         Change audio volume.
         
@@ -209,11 +397,37 @@ class AudioUtils:
             audio_path: Path to input audio file
             output_path: Path to output audio
             volume_db: Volume change in dB
+            streaming: Process block by block in constant memory
+                (default: only files above STREAMING_THRESHOLD_BYTES)
             
         Returns:
             True if successful, False otherwise
         """
+        if not AudioUtils._numpy_capable(audio_path, output_path):
+            return AudioUtils._change_volume_pydub(audio_path, output_path, volume_db)
+        try:
+            if AudioUtils._use_streaming(audio_path, streaming):
+                AudioUtils._block_processor().change_volume(audio_path, output_path, volume_db)
+            else:
+                audio, sr, subtype = AudioUtils._read(audio_path)
+                audio_effects.apply_gain(audio, volume_db)
+                AudioUtils._write(output_path, audio, sr, subtype)
+            logger.info(f"Volume adjusted audio saved to: {output_path}")
+            return True
+            
+        except sf.SoundFileError as e:
+            logger.info(f"libsndfile cannot process {audio_path} ({str(e)}), using pydub")
+            return AudioUtils._change_volume_pydub(audio_path, output_path, volume_db)
+        except Exception as e:
+            logger.error(f"Error changing volume: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _change_volume_pydub(audio_path: str, output_path: str, volume_db: float) -> bool:
+        """pydub/ffmpeg fallback for change_volume."""
         try:
+            from pydub import AudioSegment
+            
             audio = AudioSegment.from_file(audio_path)
             adjusted = audio + volume_db
             adjusted.export(output_path, format=Path(output_path).suffix[1:])
@@ -223,4 +437,100 @@ class AudioUtils:
         except Exception as e:
             logger.error(f"Error changing volume: {str(e)}")
             return False
-
+    
+    @staticmethod
+    def apply_effects(audio_path: str, output_path: str, chain: EffectsChain) -> bool:
+        """
+        Run an EffectsChain over a file: one decode, one fused pass, one encode.
+        
+        Args:
+            audio_path: Path to input audio file
+            output_path: Path to output audio (encoded as the chain's format)
+            chain: Declared post-processing chain
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            if AudioUtils._numpy_capable(audio_path):
+                audio, sr, _ = AudioUtils._read(audio_path, keep_pcm16=True)
+            else:
+                # Decode through pydub/ffmpeg into the same int16 layout
+                from pydub import AudioSegment
+                segment = AudioSegment.from_file(audio_path).set_sample_width(2)
+                audio = np.array(segment.get_array_of_samples(), dtype=np.int16).reshape(-1, segment.channels)
+                sr = segment.frame_rate
+            
+            chain.render(audio, sr, output_path)
+            logger.info(f"Applied {chain!r} to {audio_path}, saved to: {output_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error applying effects: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _numpy_capable(*paths: str) -> bool:
+        """Whether every path (or bare format name) is a format libsndfile handles here."""
+        return all(
+            (Path(path).suffix[1:] or str(path)).lower() in AudioUtils.NUMPY_FORMATS
+            for path in paths
+        )
+    
+    @staticmethod
+    def _use_streaming(audio_path: str, streaming: Optional[bool]) -> bool:
+        """Resolve the streaming flag, defaulting to streaming when the decoded audio would be large."""
+        if streaming is not None:
+            return streaming
+        try:
+            info = AudioProbe.shared().probe(audio_path)
+        except ValueError:
+            # Unreadable headers: let the in-memory path raise (and fall back) as usual
+            return False
+        return info.frames * info.channels * 4 > AudioUtils.STREAMING_THRESHOLD_BYTES
+    
+    @staticmethod
+    def _block_processor() -> BlockAudioProcessor:
+        """Block processor bounded by the configured memory ceiling."""
+        return BlockAudioProcessor(max_memory=AudioUtils.STREAMING_MAX_MEMORY)
+    
+    @staticmethod
+    def _read(audio_path: str, keep_pcm16: bool = False) -> Tuple[np.ndarray, int, str]:
+        """
+        Decode to a writable (samples, channels) array plus rate and sample subtype.
+        
+        16-bit PCM is read as int16 (and scaled in NumPy, which beats
+        libsndfile's own float conversion). With ``keep_pcm16`` it is
+        returned as int16 for operations that do not change sample values.
+        """
+        with sf.SoundFile(audio_path) as f:
+            if f.subtype == "PCM_16":
+                audio = f.read(dtype="int16", always_2d=True)
+                if not keep_pcm16:
+                    audio = audio_effects.pcm16_to_float(audio)
+            else:
+                audio = f.read(dtype="float32", always_2d=True)
+            return audio, f.samplerate, f.subtype
+    
+    @staticmethod
+    def _write(
+        output_path: str,
+        audio: np.ndarray,
+        sample_rate: int,
+        subtype: Optional[str] = None,
+        format: Optional[str] = None
+    ) -> None:
+        """Encode with libsndfile, keeping the input sample subtype when the output format allows it."""
+        format = AudioUtils.NUMPY_FORMATS[(format or Path(output_path).suffix[1:]).lower()]
+        if subtype is not None and not sf.check_format(format, subtype):
+            subtype = None
+        audio = audio.reshape(len(audio), -1)
+        with sf.SoundFile(
+            output_path, "w", sample_rate, audio.shape[1], subtype=subtype, format=format
+        ) as f:
+            if audio.dtype != np.float32 or f.subtype != "PCM_16":
+                f.write(audio)
+                return
+            # Convert to int16 in NumPy, a block at a time to bound the temporaries
+            for start in range(0, len(audio), AudioUtils.PCM_BLOCK_FRAMES):
+                f.write(audio_effects.float_to_pcm16(audio[start:start + AudioUtils.PCM_BLOCK_FRAMES]))
@@ -0,0 +1,271 @@
+"""
+Parallel conversion of whole directory trees with AudioUtils.convert_format.
+
+A JSON manifest next to the outputs records what was converted from which
+source state, so interrupted or repeated runs only redo what changed.
+"""
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.audio_utils import AudioUtils
+from utils.cpu import available_cpus
+from utils.embedding_cache import SpeakerEmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".conversion_manifest.json"
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class BatchReport:
+    """Outcome and throughput of one batch run."""
+
+    converted: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    elapsed: float = 0.0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def files_per_second(self) -> float:
+        """Converted files per wall-clock second."""
+        return self.converted / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Source bytes converted per wall-clock second."""
+        return self.bytes_in / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _convert_file(source: str, output: str, format: str, with_hash: bool) -> Tuple[bool, int, Optional[str], Optional[str]]:
+    """
+    Worker: convert one file into a temporary name and move it into place.
+
+    Returns:
+        Tuple of (success, output size, source SHA-256 or None, error message or None)
+    """
+    partial = f"{output}.part"
+    try:
+        digest = SpeakerEmbeddingCache.hash_file(source) if with_hash else None
+        if not AudioUtils.convert_format(source, partial, format):
+            return False, 0, digest, "conversion failed"
+        # A killed run never leaves a complete-looking output behind
+        os.replace(partial, output)
+        return True, os.path.getsize(output), digest, None
+    except Exception as e:
+        return False, 0, None, str(e)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+class BatchConverter:
+    """Convert directory trees between AudioUtils.SUPPORTED_FORMATS on a process pool."""
+
+    # Save the manifest after this many completed files (and at most this many seconds apart)
+    SAVE_EVERY_FILES = 50
+    SAVE_EVERY_SECONDS = 5.0
+
+    def __init__(
+        self,
+        source_dir: str,
+        output_dir: str,
+        format: str,
+        workers: Optional[int] = None,
+        check: str = "mtime",
+        manifest_path: Optional[str] = None
+    ):
+        """
+        Initialize the converter.
+
+        Args:
+            source_dir: Directory tree to convert
+            output_dir: Directory that mirrors source_dir with converted files
+            format: Target format (one of AudioUtils.SUPPORTED_FORMATS)
+            workers: Worker processes (defaults to the available CPUs)
+            check: "mtime" trusts size and mtime; "hash" also compares content
+                hashes when the mtime changed but the size did not
+            manifest_path: Manifest file (defaults to <output_dir>/.conversion_manifest.json)
+        """
+        format = format.lower().lstrip(".")
+        if format not in AudioUtils.SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+        if check not in ("mtime", "hash"):
+            raise ValueError(f"Unknown check mode: {check}")
+
+        self.source_dir = Path(source_dir).resolve()
+        self.output_dir = Path(output_dir).resolve()
+        self.format = format
+        self.workers = workers or available_cpus()
+        self.check = check
+        self.manifest_path = Path(manifest_path) if manifest_path else self.output_dir / MANIFEST_NAME
+        self.entries: Dict[str, dict] = self._load_manifest()
+
+    def collect(self) -> List[Path]:
+        """
+        Find convertible source files, largest first so the pool stays busy at the end.
+
+        Returns:
+            Source paths under source_dir
+        """
+        sources = []
+        for path in self.source_dir.rglob("*"):
+            if not path.is_file() or path.suffix[1:].lower() not in AudioUtils.SUPPORTED_FORMATS:
+                continue
+            if self.output_dir != self.source_dir and self.output_dir in path.parents:
+                continue
+            sources.append(path)
+        return sorted(sources, key=lambda p: p.stat().st_size, reverse=True)
+
+    def output_path(self, source: Path) -> Path:
+        """Output path mirroring ``source`` under output_dir with the target extension."""
+        return (self.output_dir / source.relative_to(self.source_dir)).with_suffix(f".{self.format}")
+
+    def is_up_to_date(self, source: Path) -> bool:
+        """
+        Whether the output for ``source`` is current.
+
+        With a manifest entry, the output must exist with its recorded size and
+        the source must have its recorded size and mtime (or, in hash mode, its
+        recorded content hash). Without one, an output newer than the source
+        counts as current.
+
+        Args:
+            source: Source file
+
+        Returns:
+            True if the file can be skipped
+        """
+        output = self.output_path(source)
+        if not output.exists():
+            return False
+        stat = source.stat()
+        entry = self.entries.get(self._key(source))
+        if entry is None:
+            return output.stat().st_mtime_ns >= stat.st_mtime_ns
+        if entry.get("status") != "done" or output.stat().st_size != entry.get("output_size"):
+            return False
+        if entry.get("source_size") != stat.st_size:
+            return False
+        if entry.get("source_mtime_ns") == stat.st_mtime_ns:
+            return True
+        if self.check == "hash" and entry.get("source_sha256"):
+            if SpeakerEmbeddingCache.hash_file(str(source)) == entry["source_sha256"]:
+                # Touched but unchanged: remember the new mtime so the next run skips the hash
+                entry["source_mtime_ns"] = stat.st_mtime_ns
+                return True
+        return False
+
+    def run(self) -> BatchReport:
+        """
+        Convert everything that is not up to date.
+
+        Returns:
+            BatchReport with counts and throughput
+        """
+        report = BatchReport()
+        start = time.perf_counter()
+
+        pending = []
+        for source in self.collect():
+            if self.output_path(source) == source:
+                continue
+            if self.is_up_to_date(source):
+                report.skipped += 1
+            else:
+                pending.append(source)
+
+        try:
+            if pending:
+                workers = min(self.workers, len(pending))
+                logger.info(f"Converting {len(pending)} files to {self.format} with {workers} workers "
+                            f"({report.skipped} up to date)")
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                self._convert_all(pending, workers, report)
+            else:
+                logger.info(f"All {report.skipped} files are up to date")
+        finally:
+            # Also persists mtimes refreshed by hash checks
+            self._save_manifest()
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _convert_all(self, pending: List[Path], workers: int, report: BatchReport) -> None:
+        """Run the pool and record each result in the manifest as it completes."""
+        last_save = time.monotonic()
+        unsaved = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+            for source in pending:
+                output = self.output_path(source)
+                output.parent.mkdir(parents=True, exist_ok=True)
+                future = pool.submit(_convert_file, str(source), str(output), self.format, self.check == "hash")
+                futures[future] = (source, source.stat())
+
+            for future in as_completed(futures):
+                source, stat = futures[future]
+                success, output_size, digest, error = future.result()
+                key = self._key(source)
+                self.entries[key] = {
+                    "output": str(self.output_path(source).relative_to(self.output_dir)),
+                    "status": "done" if success else "failed",
+                    "source_size": stat.st_size,
+                    "source_mtime_ns": stat.st_mtime_ns,
+                    "source_sha256": digest,
+                    "output_size": output_size,
+                    "error": error,
+                }
+                if success:
+                    report.converted += 1
+                    report.bytes_in += stat.st_size
+                    report.bytes_out += output_size
+                else:
+                    report.failed += 1
+                    report.errors[key] = error or "unknown error"
+                    logger.error(f"Failed to convert {source}: {error}")
+
+                unsaved += 1
+                if unsaved >= self.SAVE_EVERY_FILES or time.monotonic() - last_save >= self.SAVE_EVERY_SECONDS:
+                    self._save_manifest()
+                    last_save = time.monotonic()
+                    unsaved = 0
+
+    def _key(self, source: Path) -> str:
+        """Manifest key: source path relative to source_dir."""
+        return source.relative_to(self.source_dir).as_posix()
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        """Read the manifest, ignoring it if it belongs to another target format."""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            data = json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable manifest {self.manifest_path}: {str(e)}")
+            return {}
+        if data.get("version") != MANIFEST_VERSION or data.get("format") != self.format:
+            return {}
+        return data.get("files", {})
+
+    def _save_manifest(self) -> None:
+        """Write the manifest atomically."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "format": self.format,
+            "source_dir": str(self.source_dir),
+            "files": self.entries,
+        }
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(data, indent=1, sort_keys=True))
+        os.replace(tmp_path, self.manifest_path)
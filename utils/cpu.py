@@ -0,0 +1,11 @@
+"""
+CPU budget of the current process, shared by the parallel workers and the inference profile.
+"""
+import os
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects affinity masks and cgroup pinning)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
@@ -0,0 +1,212 @@
+"""
+Declarative post-processing chain executed as one fused pass.
+
+A chain is declared once (``EffectsChain().trim().gain(-3).normalize().encode("flac")``)
+and nothing runs until it is applied to a buffer. Applying it finds the trim
+boundaries and the peak, folds gain, normalization and the int16 scaling into
+per-block multipliers, and encodes block by block, so no intermediate files
+or full-size intermediate arrays are produced.
+"""
+import io
+import logging
+from typing import BinaryIO, Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+from utils import audio_effects
+from utils.audio_blocks import BLOCK_FORMATS
+from utils.resampler import resample
+
+logger = logging.getLogger(__name__)
+
+
+class EffectsChain:
+    """
+    Trim → resample → gain → normalize → encode, declared lazily.
+
+    Steps always run in that order, whatever order they were declared in,
+    and each step may be declared at most once (declaring it again replaces it).
+    Trimming first means only the kept audio is resampled.
+    """
+
+    # Frames scaled and encoded per iteration (small enough to stay in cache)
+    BLOCK_FRAMES = 1 << 16
+
+    def __init__(self):
+        """Initialize an empty chain (encodes 16-bit WAV unchanged)."""
+        self.target_rate: Optional[int] = None
+        self.trim_threshold: Optional[float] = None
+        self.trim_min_silence_ms = 500
+        self.gain_db: Optional[float] = None
+        self.target_peak: Optional[float] = None
+        self.format = "wav"
+        self.subtype: Optional[str] = None
+
+    def resample(self, sample_rate: int) -> "EffectsChain":
+        """Convert to ``sample_rate`` with the polyphase resampler."""
+        self.target_rate = sample_rate
+        return self
+
+    def trim(self, threshold: float = 0.01, min_silence_ms: int = 500) -> "EffectsChain":
+        """Remove leading and trailing silence (see audio_effects.trim_silence)."""
+        self.trim_threshold = threshold
+        self.trim_min_silence_ms = min_silence_ms
+        return self
+
+    def gain(self, gain_db: float) -> "EffectsChain":
+        """Change the level by ``gain_db``, clipping to full scale."""
+        self.gain_db = gain_db
+        return self
+
+    def normalize(self, target_peak: float = 0.9) -> "EffectsChain":
+        """Scale so the peak is ``target_peak`` (0.9 is about -1dBFS)."""
+        self.target_peak = target_peak
+        return self
+
+    def encode(self, format: str = "wav", subtype: Optional[str] = None) -> "EffectsChain":
+        """
+        Set the output encoding.
+
+        Args:
+            format: wav, flac, ogg or mp3
+            subtype: libsndfile subtype (defaults to the format's default, 16-bit PCM for wav/flac)
+        """
+        format = format.lower().lstrip(".")
+        if format not in BLOCK_FORMATS:
+            raise ValueError(f"Unsupported chain output format: {format}")
+        self.format = format
+        self.subtype = subtype
+        return self
+
+    @property
+    def key(self) -> str:
+        """Stable description of the chain, for cache keys."""
+        return "|".join([
+            f"rate={self.target_rate}",
+            f"trim={self.trim_threshold},{self.trim_min_silence_ms}",
+            f"gain={self.gain_db}",
+            f"peak={self.target_peak}",
+            f"{self.format}/{self.subtype}",
+        ])
+
+    def __repr__(self) -> str:
+        return f"EffectsChain({self.key})"
+
+    def process(self, audio: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, int]:
+        """
+        Apply every step except encoding.
+
+        Args:
+            audio: Float32 or int16 array of shape (samples,) or (samples, channels)
+            sample_rate: Sample rate of ``audio``
+
+        Returns:
+            Tuple of (new float32 array with the input's channel layout, sample rate)
+        """
+        mono = audio.ndim == 1
+        view, sample_rate, pre, clip, post = self._plan(audio, sample_rate)
+        out = np.empty(view.shape, dtype=np.float32)
+        for start in range(0, len(view), self.BLOCK_FRAMES):
+            stop = start + self.BLOCK_FRAMES
+            self._scale(view[start:stop], pre, clip, post, out[start:stop])
+        return (out[:, 0] if mono else out), sample_rate
+
+    def render(
+        self,
+        audio: np.ndarray,
+        sample_rate: int,
+        output: Optional[Union[str, BinaryIO]] = None
+    ) -> Optional[bytes]:
+        """
+        Apply the chain and encode the result.
+
+        Args:
+            audio: Float32 or int16 array of shape (samples,) or (samples, channels)
+            sample_rate: Sample rate of ``audio``
+            output: File path or writable buffer (None returns the encoded bytes)
+
+        Returns:
+            Encoded bytes when ``output`` is None, otherwise None
+        """
+        buffer = io.BytesIO() if output is None else None
+        view, sample_rate, pre, clip, post = self._plan(audio, sample_rate)
+
+        with sf.SoundFile(
+            buffer if buffer is not None else output, "w", sample_rate, view.shape[1],
+            subtype=self.subtype, format=BLOCK_FORMATS[self.format]
+        ) as f:
+            pcm16 = f.subtype == "PCM_16"
+            if pcm16:
+                # Fold the float -> int16 scaling into the last multiplier
+                if clip:
+                    post *= 32767
+                else:
+                    pre *= 32767
+            scratch = np.empty((min(self.BLOCK_FRAMES, len(view)), view.shape[1]), dtype=np.float32)
+            pcm = np.empty(scratch.shape, dtype=np.int16) if pcm16 else None
+            for start in range(0, len(view), self.BLOCK_FRAMES):
+                block = view[start:start + self.BLOCK_FRAMES]
+                scaled = self._scale(block, pre, clip, post, scratch[:len(block)])
+                if pcm16:
+                    np.clip(scaled, -32768, 32767, out=scaled)
+                    np.rint(scaled, out=scaled)
+                    np.copyto(pcm[:len(block)], scaled, casting="unsafe")
+                    f.write(pcm[:len(block)])
+                else:
+                    f.write(scaled)
+
+        return buffer.getvalue() if buffer is not None else None
+
+    def _plan(self, audio: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, int, float, bool, float]:
+        """
+        Resolve trim boundaries, resampling and the fused multipliers.
+
+        Trim boundaries are found at the input rate, so only the kept audio is
+        resampled. Output is ``clip(x * pre) * post`` when clipping is needed,
+        ``x * pre`` otherwise.
+
+        Returns:
+            Tuple of (2-D view or resampled array, sample rate, pre, clip, post)
+        """
+        if audio.ndim == 1:
+            audio = audio.reshape(-1, 1)
+        if self.trim_threshold is not None:
+            audio = audio_effects.trim_silence(
+                audio, sample_rate, self.trim_threshold, self.trim_min_silence_ms
+            )
+
+        pre = 1 / 32768 if audio.dtype == np.int16 else 1.0
+        if self.target_rate is not None and self.target_rate != sample_rate:
+            if audio.dtype == np.int16:
+                audio = audio_effects.pcm16_to_float(audio)
+            audio = resample(audio, sample_rate, self.target_rate)
+            sample_rate = self.target_rate
+            pre = 1.0
+
+        gain = 10 ** (self.gain_db / 20) if self.gain_db is not None else 1.0
+        pre *= gain
+        # apply_gain clips; without a gain step nothing above full scale is produced here
+        clip = self.gain_db is not None
+        post = 1.0
+        if self.target_peak is not None and audio.size:
+            peak = max(float(audio.max()), -float(audio.min())) * pre
+            if peak > 0:
+                if peak <= 1.0 or not clip:
+                    # Nothing clips, so gain and normalization collapse into one factor
+                    clip = False
+                    pre *= self.target_peak / peak
+                else:
+                    # The gain step clips to full scale first, so the clipped peak is 1.0
+                    post = self.target_peak
+        return audio, sample_rate, pre, clip, post
+
+    @staticmethod
+    def _scale(block: np.ndarray, pre: float, clip: bool, post: float, out: np.ndarray) -> np.ndarray:
+        """Fused ``clip(block * pre) * post`` into ``out``."""
+        np.multiply(block, np.float32(pre), out=out, dtype=np.float32, casting="unsafe")
+        if clip:
+            np.clip(out, -1.0, 1.0, out=out)
+            if post != 1.0:
+                np.multiply(out, np.float32(post), out=out)
+        return out
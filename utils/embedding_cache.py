@@ -0,0 +1,139 @@
+"""
+Content-addressed in-memory cache of speaker embeddings.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SpeakerEmbeddingCache:
+    """Thread-safe LRU cache mapping reference audio hashes to speaker embeddings."""
+
+    _shared: Optional["SpeakerEmbeddingCache"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of embeddings kept before the least recently used is evicted
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls) -> "SpeakerEmbeddingCache":
+        """Get the cache shared by every session in this process."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def hash_file(audio_path: str, chunk_size: int = 1 << 20) -> str:
+        """
+        Hash the content of an audio file.
+
+        Args:
+            audio_path: Path to audio file
+            chunk_size: Bytes read per iteration
+
+        Returns:
+            Hex SHA-256 digest of the file content
+        """
+        digest = hashlib.sha256()
+        with open(audio_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_bytes(data: Union[bytes, memoryview]) -> str:
+        """
+        Hash in-memory audio the same way as hash_file.
+
+        Args:
+            data: Encoded audio bytes
+
+        Returns:
+            Hex SHA-256 digest of the content
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up an embedding and record a hit or miss.
+
+        Args:
+            key: Content hash of the reference audio
+
+        Returns:
+            Cached embedding or None
+        """
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, key: str, embedding) -> np.ndarray:
+        """
+        Store an embedding, evicting the least recently used entry if full.
+
+        Args:
+            key: Content hash of the reference audio
+            embedding: Speaker embedding
+
+        Returns:
+            The stored (read-only float32) embedding
+        """
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.setflags(write=False)
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                logger.debug(f"Evicted speaker embedding: {evicted[:12]}")
+        return embedding
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and occupancy."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
@@ -0,0 +1,172 @@
+"""
+CPU inference settings applied to Coqui models when the registry loads them.
+
+A profile sets torch's thread budget, runs synthesis under
+``torch.inference_mode()`` (no autograd bookkeeping or version counters),
+and can quantize the Linear/LSTM layers of the acoustic model to dynamic
+int8. torch is only imported once a profile is applied to a model.
+"""
+import functools
+import logging
+import os
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+from utils.cpu import available_cpus
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class InferenceProfile:
+    """Thread budget, autograd mode and precision for CPU inference."""
+
+    ALL_CPUS = 0
+
+    name: str = "default"
+    # Intra-op threads (None keeps torch's default, one per physical core; ALL_CPUS uses every usable CPU)
+    threads: Optional[int] = None
+    # Inter-op threads; torch only accepts this before its first parallel work
+    interop_threads: Optional[int] = None
+    # torch.inference_mode() instead of torch.no_grad() around synthesis
+    inference_mode: bool = True
+    # Dynamic int8 quantization of the acoustic model's Linear and LSTM layers
+    quantize: bool = False
+
+    def with_threads(self, threads: Optional[int]) -> "InferenceProfile":
+        """Copy of this profile with another intra-op thread budget."""
+        return replace(self, threads=threads)
+
+    @classmethod
+    def named(cls, name: str) -> "InferenceProfile":
+        """
+        Get a predefined profile.
+
+        Args:
+            name: One of PROFILES ("default", "cpu", "int8")
+
+        Returns:
+            The profile
+        """
+        profile = PROFILES.get(name)
+        if profile is None:
+            raise ValueError(f"Unknown inference profile: {name} (choose from {', '.join(PROFILES)})")
+        return profile
+
+    @classmethod
+    def from_env(cls) -> "InferenceProfile":
+        """
+        Profile selected by ``TTS_INFERENCE_PROFILE`` (default "default").
+
+        ``TTS_TORCH_THREADS`` overrides the profile's intra-op thread budget.
+        """
+        profile = cls.named(os.environ.get("TTS_INFERENCE_PROFILE", "default"))
+        threads = os.environ.get("TTS_TORCH_THREADS")
+        return profile.with_threads(int(threads)) if threads else profile
+
+    def context(self):
+        """Autograd context for synthesis: inference_mode, or no_grad when disabled."""
+        import torch
+        return torch.inference_mode() if self.inference_mode else torch.no_grad()
+
+    def resolved_threads(self) -> Optional[int]:
+        """Intra-op thread count with ALL_CPUS resolved (None keeps the runtime default)."""
+        if self.threads == self.ALL_CPUS:
+            return available_cpus()
+        return self.threads
+
+    def apply_threads(self) -> None:
+        """Set torch's process-wide thread budget."""
+        if self.threads is None and self.interop_threads is None:
+            return
+        import torch
+        threads = self.resolved_threads()
+        if threads is not None:
+            torch.set_num_threads(threads)
+        if self.interop_threads is not None:
+            try:
+                torch.set_num_interop_threads(self.interop_threads)
+            except RuntimeError:
+                # Already fixed by earlier parallel work in this process
+                logger.debug("Inter-op thread count already set; keeping it")
+
+    def apply(self, model):
+        """
+        Apply the profile to a freshly loaded Coqui ``TTS`` instance.
+
+        Backends that are not torch models (ONNX Runtime) configure themselves
+        through ``apply_inference_profile``; objects without a synthesizer
+        (e.g. test doubles) are returned unchanged.
+
+        Args:
+            model: Loaded TTS instance
+
+        Returns:
+            The same instance, tuned in place
+        """
+        configure = getattr(model, "apply_inference_profile", None)
+        if configure is not None:
+            configure(self)
+            return model
+        synthesizer = getattr(model, "synthesizer", None)
+        if synthesizer is None:
+            return model
+
+        self.apply_threads()
+        for module in (synthesizer.tts_model, getattr(synthesizer, "vocoder_model", None)):
+            if module is not None:
+                module.eval()
+
+        if self.quantize:
+            self._quantize(synthesizer)
+
+        # Calls through the Coqui API run under the profile's autograd context
+        for method_name in ("tts", "tts_to_file"):
+            method = getattr(model, method_name, None)
+            if method is not None:
+                setattr(model, method_name, self._wrap(method))
+        return model
+
+    def _wrap(self, method):
+        """Run ``method`` under context()."""
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with self.context():
+                return method(*args, **kwargs)
+        return wrapper
+
+    @staticmethod
+    def _quantize(synthesizer) -> None:
+        """
+        Quantize the acoustic model's Linear/LSTM layers to dynamic int8 in place.
+
+        Vocoders (HiFi-GAN, MelGAN) and the VITS decoder are convolutional,
+        which dynamic quantization does not cover, so they stay in float32.
+        Models that fail to quantize are left in float32.
+        """
+        import torch
+        from torch.ao.quantization import quantize_dynamic
+
+        engines = torch.backends.quantized.supported_engines
+        if torch.backends.quantized.engine == "none":
+            for engine in ("x86", "fbgemm", "qnnpack"):
+                if engine in engines:
+                    torch.backends.quantized.engine = engine
+                    break
+
+        model = synthesizer.tts_model
+        try:
+            quantize_dynamic(model, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8, inplace=True)
+            logger.info(f"Quantized {type(model).__name__} to dynamic int8 ({torch.backends.quantized.engine})")
+        except Exception as e:
+            logger.warning(f"Could not quantize {type(model).__name__}, keeping float32: {str(e)}")
+
+
+# default: library thread defaults, inference mode only
+# cpu:     one intra-op thread per usable CPU (respects affinity/cgroup pinning), one inter-op thread
+# int8:    cpu plus dynamic int8 quantization
+PROFILES: Dict[str, InferenceProfile] = {
+    "default": InferenceProfile(),
+    "cpu": InferenceProfile("cpu", threads=InferenceProfile.ALL_CPUS, interop_threads=1),
+    "int8": InferenceProfile("int8", threads=InferenceProfile.ALL_CPUS, interop_threads=1, quantize=True),
+}
@@ -0,0 +1,258 @@
+"""
+Per-model inference scheduler with dynamic micro-batching.
+
+Every session used to call into a shared Coqui model from its own thread.
+The model is not safe for concurrent use, and parallel forward passes
+compete for the same cores. The scheduler makes one worker thread the only
+user of a model. Callers submit work and get a ``Future``. The worker
+collects batchable jobs that arrive within ``max_wait`` seconds (up to
+``max_batch_size``) and runs them in one call, so concurrent requests share
+forward passes instead of contending for the CPU.
+
+Jobs are either plain callables taking the model (run one at a time), or
+items with a batch function ``run_batch(model, items) -> results``. Items
+that share the same batch function are batched together.
+
+VoiceClone (YourTTS) and AdvancedTTS submit batchable sentence jobs. Of the
+AdvancedTTS models only PyTorch Glow-TTS runs them as padded batches;
+Tacotron2 and the ONNX runtime have no batched path, so their jobs share the
+queue but are synthesized one at a time.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from utils.model_registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+BatchFn = Callable[[Any, List[Any]], List[Any]]
+
+
+@dataclass
+class _Job:
+    """A submitted item and the future its result goes to."""
+
+    item: Any
+    run_batch: Optional[BatchFn]
+    future: Future
+
+
+class InferenceScheduler:
+    """Owns one model: runs all work on it from a single worker thread, in micro-batches."""
+
+    DEFAULT_MAX_BATCH_SIZE = 16
+    DEFAULT_MAX_WAIT = 0.01
+
+    _schedulers: Dict[Tuple[int, str], "InferenceScheduler"] = {}
+    _schedulers_lock = threading.Lock()
+
+    def __init__(
+        self,
+        model_name: str,
+        registry: Optional[ModelRegistry] = None,
+        max_batch_size: Optional[int] = None,
+        max_wait: Optional[float] = None
+    ):
+        """
+        Initialize the scheduler and start its worker.
+
+        Args:
+            model_name: Registry name of the model this scheduler owns
+            registry: Registry the model is borrowed from for each batch
+                (defaults to the process-wide one)
+            max_batch_size: Most items per batch (defaults to ``TTS_MAX_BATCH_SIZE`` or 16)
+            max_wait: Seconds to wait for more items after the first one arrives
+                (defaults to ``TTS_MAX_BATCH_WAIT_MS`` or 10ms)
+        """
+        self.model_name = model_name
+        self.registry = registry or ModelRegistry.shared()
+        if max_batch_size is None:
+            max_batch_size = int(os.environ.get("TTS_MAX_BATCH_SIZE", self.DEFAULT_MAX_BATCH_SIZE))
+        if max_wait is None:
+            wait_ms = os.environ.get("TTS_MAX_BATCH_WAIT_MS")
+            max_wait = float(wait_ms) / 1000 if wait_ms else self.DEFAULT_MAX_WAIT
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+        self._pending: Deque[_Job] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self._worker = threading.Thread(
+            target=self._loop, name=f"infer-{model_name.split('/')[-1]}", daemon=True
+        )
+        self._worker.start()
+
+    @classmethod
+    def for_model(cls, model_name: str, registry: Optional[ModelRegistry] = None) -> "InferenceScheduler":
+        """
+        Get the scheduler of a model, creating it on first use.
+
+        There is one scheduler per model and registry, shared by every
+        engine instance and session in the process.
+
+        Args:
+            model_name: Registry name of the model
+            registry: Registry holding the model (defaults to the process-wide one)
+
+        Returns:
+            InferenceScheduler instance
+        """
+        registry = registry or ModelRegistry.shared()
+        key = (id(registry), model_name)
+        scheduler = cls._schedulers.get(key)
+        if scheduler is None:
+            with cls._schedulers_lock:
+                scheduler = cls._schedulers.get(key)
+                if scheduler is None:
+                    scheduler = cls._schedulers[key] = cls(model_name, registry)
+        return scheduler
+
+    @classmethod
+    def all_stats(cls) -> Dict[str, dict]:
+        """Stats of every scheduler in the process, by model name."""
+        with cls._schedulers_lock:
+            schedulers = list(cls._schedulers.values())
+        return {scheduler.model_name: scheduler.stats() for scheduler in schedulers}
+
+    def submit(self, item: Any, run_batch: Optional[BatchFn] = None) -> Future:
+        """
+        Queue work for the model.
+
+        Args:
+            item: Input for ``run_batch``, or without it a callable taking the model
+            run_batch: Batch function ``(model, items) -> results``, one result per item
+
+        Returns:
+            Future resolving to the item's result
+        """
+        return self.submit_many([item], run_batch)[0]
+
+    def submit_many(self, items: List[Any], run_batch: Optional[BatchFn] = None) -> List[Future]:
+        """
+        Queue several items at once, so they can share batches.
+
+        Args:
+            items: Inputs for ``run_batch`` (or callables taking the model)
+            run_batch: Batch function ``(model, items) -> results``
+
+        Returns:
+            One future per item, in input order
+        """
+        jobs = [_Job(item, run_batch, Future()) for item in items]
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Inference scheduler for {self.model_name} is closed")
+            self._pending.extend(jobs)
+            self._cond.notify()
+        return [job.future for job in jobs]
+
+    def run(self, item: Any, run_batch: Optional[BatchFn] = None, timeout: Optional[float] = None) -> Any:
+        """Submit an item and wait for its result (re-raising its exception)."""
+        return self.submit(item, run_batch).result(timeout)
+
+    def stats(self) -> dict:
+        """Batch counts and current queue depth."""
+        with self._cond:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "largest_batch": self.largest_batch,
+                "queued": len(self._pending),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait * 1000, 1),
+            }
+
+    def close(self) -> None:
+        """Stop accepting work; the worker exits once the queue is drained."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _loop(self) -> None:
+        """Worker: take the next batch and run it, until closed and drained."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._execute(batch)
+
+    def _next_batch(self) -> Optional[List[_Job]]:
+        """
+        Wait for work and collect a batch.
+
+        Callables run alone and right away. A batchable job waits up to
+        max_wait for more jobs with the same batch function; other jobs keep
+        their place in the queue.
+        """
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            first = self._pending.popleft()
+            batch = [first]
+            if first.run_batch is None:
+                return batch
+
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                match = next((job for job in self._pending if job.run_batch == first.run_batch), None)
+                if match is not None:
+                    self._pending.remove(match)
+                    batch.append(match)
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    break
+                self._cond.wait(remaining)
+            return batch
+
+    def _execute(self, batch: List[_Job]) -> None:
+        """Run a batch and resolve its futures; a failed batch is retried item by item."""
+        jobs = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        if not jobs:
+            return
+        try:
+            results = self._run(jobs)
+        except Exception as e:
+            if len(jobs) > 1:
+                # Isolate the failing item instead of failing every caller in the batch
+                logger.warning(f"Batch of {len(jobs)} on {self.model_name} failed ({str(e)}); retrying one by one")
+                for job in jobs:
+                    self._resolve_single(job)
+            else:
+                jobs[0].future.set_exception(e)
+            return
+        for job, result in zip(jobs, results):
+            job.future.set_result(result)
+
+    def _resolve_single(self, job: _Job) -> None:
+        """Run one already-started job on its own."""
+        try:
+            job.future.set_result(self._run([job])[0])
+        except Exception as e:
+            job.future.set_exception(e)
+
+    def _run(self, jobs: List[_Job]) -> List[Any]:
+        """Run jobs on the borrowed model under the registry's inference profile."""
+        with self._cond:
+            self.batches += 1
+            self.items += len(jobs)
+            self.largest_batch = max(self.largest_batch, len(jobs))
+        with self.registry.borrow(self.model_name) as model:
+            with self.registry.inference_profile.context():
+                if jobs[0].run_batch is None:
+                    return [jobs[0].item(model)]
+                results = jobs[0].run_batch(model, [job.item for job in jobs])
+        if len(results) != len(jobs):
+            raise RuntimeError(f"Batch function returned {len(results)} results for {len(jobs)} items")
+        return results
@@ -0,0 +1,310 @@
+"""
+Background synthesis job queue with persistent status in SQLite.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from models.schemas import AdvancedTTSRequest, TTSResponse, VoiceCloneRequest
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    output_path TEXT,
+    message TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+
+class JobQueue:
+    """Runs synthesis jobs on worker threads and records their state in SQLite."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    # Finished in-memory results kept for download (oldest dropped first)
+    MAX_IN_MEMORY_RESULTS = 16
+
+    _shared: Optional["JobQueue"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path: str = "jobs/jobs.sqlite3", workers: int = 2, poll_interval: float = 1.0):
+        """
+        Initialize the queue and start its workers.
+
+        Jobs left ``running`` by a previous process are re-queued, so work
+        submitted before a restart is picked up again.
+
+        Args:
+            db_path: SQLite file holding job state
+            workers: Number of worker threads
+            poll_interval: Seconds between checks for jobs submitted by other processes
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._local = threading.local()
+        # Uploaded references and unpersisted results live only in this process
+        self._memory_lock = threading.Lock()
+        self._buffers: Dict[str, bytes] = {}
+        self._results: "OrderedDict[str, bytes]" = OrderedDict()
+
+        with self._connect() as conn:
+            # Persistent in the database file, so set once rather than per connection
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            requeued = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?",
+                (self.QUEUED, self.RUNNING)
+            ).rowcount
+        if requeued:
+            logger.info(f"Re-queued {requeued} interrupted jobs")
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"tts-job-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @classmethod
+    def shared(cls) -> "JobQueue":
+        """Get the queue shared by every session in this process."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection to the job database, committed on success (rolled back on error) and closed."""
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def submit(
+        self,
+        request: Union[VoiceCloneRequest, AdvancedTTSRequest],
+        reference_audio_path: Optional[str] = None,
+        voice_id: Optional[str] = None,
+        reference_audio: Optional[Union[bytes, memoryview]] = None,
+        persist: bool = True
+    ) -> str:
+        """
+        Queue a synthesis job.
+
+        In-memory reference audio and unpersisted results are kept in this
+        process only; such a job cannot be resumed after a restart.
+
+        Args:
+            request: VoiceCloneRequest or AdvancedTTSRequest
+            reference_audio_path: Reference audio for voice cloning (must outlive the job)
+            voice_id: Enrolled voice for voice cloning
+            reference_audio: Encoded reference audio for voice cloning, kept in memory
+            persist: Write the voice cloning result to disk; otherwise fetch it with result_audio()
+
+        Returns:
+            Job ID to poll with get()
+        """
+        if isinstance(request, VoiceCloneRequest):
+            kind = "voice_clone"
+            if reference_audio_path is None and voice_id is None and reference_audio is None:
+                raise ValueError("Voice cloning jobs need reference_audio_path, reference_audio or voice_id")
+        elif isinstance(request, AdvancedTTSRequest):
+            kind = "advanced_tts"
+        else:
+            raise TypeError(f"Unsupported request type: {type(request).__name__}")
+
+        payload = json.dumps({
+            "request": request.model_dump(),
+            "reference_audio_path": reference_audio_path,
+            "voice_id": voice_id,
+            "in_memory_reference": reference_audio is not None,
+            "persist": persist,
+        })
+        job_id = uuid.uuid4().hex
+        if reference_audio is not None:
+            with self._memory_lock:
+                self._buffers[job_id] = bytes(reference_audio)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, payload, self.QUEUED, time.time())
+            )
+        logger.info(f"Queued {kind} job {job_id}")
+
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Get the state of a job.
+
+        Args:
+            job_id: ID returned by submit()
+
+        Returns:
+            Dictionary with status, timings and output path, or None if unknown
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def result_audio(self, job_id: str) -> Optional[bytes]:
+        """
+        Get the in-memory audio of a finished unpersisted job.
+
+        Args:
+            job_id: ID returned by submit()
+
+        Returns:
+            Encoded audio, or None if the job wrote a file or the result was dropped
+        """
+        with self._memory_lock:
+            return self._results.get(job_id)
+
+    def recent(self, limit: int = 10) -> List[dict]:
+        """Get the most recently submitted jobs."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Get the number of jobs in each state."""
+        depth = {self.QUEUED: 0, self.RUNNING: 0, self.DONE: 0, self.FAILED: 0}
+        with self._connect() as conn:
+            for status, count in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+                depth[status] = count
+        return depth
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the workers after their current job."""
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """Atomically move the oldest queued job to running."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (self.QUEUED,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
+                    (self.RUNNING, time.time(), row["id"])
+                )
+        return row
+
+    def _finish(self, job_id: str, result: TTSResponse) -> None:
+        """Record the outcome of a job."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, output_path = ?, message = ?, error = ? WHERE id = ?",
+                (
+                    self.DONE if result.success else self.FAILED,
+                    time.time(),
+                    result.file_path,
+                    result.message,
+                    result.error,
+                    job_id,
+                )
+            )
+
+    def _work(self) -> None:
+        """Worker loop: claim, run and record jobs until stopped."""
+        while not self._stopping.is_set():
+            try:
+                row = self._claim()
+            except Exception as e:
+                logger.error(f"Error claiming job: {str(e)}")
+                row = None
+
+            if row is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+
+            logger.info(f"Running {row['kind']} job {row['id']}")
+            try:
+                result = self._run(row["id"], row["kind"], json.loads(row["payload"]))
+            except Exception as e:
+                logger.error(f"Job {row['id']} failed: {str(e)}")
+                result = TTSResponse(success=False, message="Job failed", error=str(e))
+            if result.audio_data is not None:
+                self._keep_result(row["id"], result.audio_data)
+            self._finish(row["id"], result)
+
+    def _keep_result(self, job_id: str, audio_data: bytes) -> None:
+        """Hold an unpersisted result for download, dropping the oldest beyond the limit."""
+        with self._memory_lock:
+            self._results[job_id] = audio_data
+            while len(self._results) > self.MAX_IN_MEMORY_RESULTS:
+                self._results.popitem(last=False)
+
+    def _run(self, job_id: str, kind: str, payload: dict) -> TTSResponse:
+        """Execute one job on this worker's engine instances."""
+        if kind == "voice_clone":
+            reference_audio = None
+            if payload.get("in_memory_reference"):
+                with self._memory_lock:
+                    reference_audio = self._buffers.pop(job_id, None)
+                if reference_audio is None:
+                    raise ValueError("The uploaded reference audio was lost in a restart; please upload it again")
+            if not hasattr(self._local, "voice_clone"):
+                from utils.voice_clone import VoiceClone
+                self._local.voice_clone = VoiceClone()
+            return self._local.voice_clone.clone_voice(
+                VoiceCloneRequest(**payload["request"]),
+                reference_audio_path=payload.get("reference_audio_path"),
+                voice_id=payload.get("voice_id"),
+                reference_audio=reference_audio,
+                persist=payload.get("persist", True)
+            )
+        if kind == "advanced_tts":
+            if not hasattr(self._local, "advanced_tts"):
+                from utils.tts_advanced import AdvancedTTS
+                self._local.advanced_tts = AdvancedTTS()
+            return self._local.advanced_tts.convert(AdvancedTTSRequest(**payload["request"]))
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    @classmethod
+    def _to_dict(cls, row: sqlite3.Row) -> dict:
+        """Convert a job row to a status dictionary."""
+        job = dict(row)
+        job.pop("payload", None)
+        now = time.time()
+        started, finished = job["started_at"], job["finished_at"]
+        job["wait_seconds"] = round((started or now) - job["created_at"], 2)
+        job["run_seconds"] = round((finished or now) - started, 2) if started else None
+        return job
@@ -0,0 +1,385 @@
+"""
+Process-wide registry of loaded Coqui TTS models.
+
+Several models stay resident at once. With a memory budget, loading a model
+evicts the least recently used ones until the resident set fits; with an
+idle TTL, models nobody has used for that long are unloaded in the
+background. Models in use (see ``borrow``) are never evicted.
+"""
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+from utils.inference_profile import InferenceProfile
+
+logger = logging.getLogger(__name__)
+
+
+def process_rss_bytes() -> int:
+    """Current resident set size of this process (0 where it cannot be read)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+@dataclass
+class _Resident:
+    """A loaded model and its residency bookkeeping."""
+
+    model: object
+    bytes: int
+    last_used: float
+    pins: int = 0
+
+
+@dataclass
+class _LoadHistory:
+    """Load count and latency of one model over the process lifetime."""
+
+    loads: int = 0
+    total_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+
+class ModelRegistry:
+    """Thread-safe registry that loads each TTS model once and keeps it within a memory budget."""
+
+    _shared: Optional["ModelRegistry"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        loader: Optional[Callable[[str], object]] = None,
+        progress_bar: bool = True,
+        inference_profile: Optional[InferenceProfile] = None,
+        max_bytes: Optional[int] = None,
+        idle_ttl: Optional[float] = None
+    ):
+        """
+        Initialize an empty registry.
+
+        Args:
+            loader: Callable that builds a model from its name (defaults to ``TTS(model_name=...)``)
+            progress_bar: Whether the default loader shows the download progress bar
+            inference_profile: Thread, autograd and precision settings applied to every
+                loaded model (defaults to InferenceProfile.from_env())
+            max_bytes: Memory budget for resident models (None or 0 for no limit)
+            idle_ttl: Seconds after which an unused model is unloaded (None or 0 to keep models)
+        """
+        self._loader = loader or self._load_tts
+        self._progress_bar = progress_bar
+        self.inference_profile = inference_profile or InferenceProfile.from_env()
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self._models: "OrderedDict[str, _Resident]" = OrderedDict()
+        self._history: Dict[str, _LoadHistory] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self._reaper: Optional[threading.Thread] = None
+        if idle_ttl:
+            self._reaper = threading.Thread(target=self._reap_loop, name="model-reaper", daemon=True)
+            self._reaper.start()
+
+    @classmethod
+    def shared(cls) -> "ModelRegistry":
+        """
+        Get the registry shared by every session in this process.
+
+        The budget and idle TTL come from ``TTS_MODEL_BUDGET_MB`` and
+        ``TTS_MODEL_IDLE_TTL`` (seconds).
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    budget_mb = os.environ.get("TTS_MODEL_BUDGET_MB")
+                    idle_ttl = os.environ.get("TTS_MODEL_IDLE_TTL")
+                    cls._shared = cls(
+                        max_bytes=int(float(budget_mb) * 1024 * 1024) if budget_mb else None,
+                        idle_ttl=float(idle_ttl) if idle_ttl else None,
+                    )
+        return cls._shared
+
+    def get(self, model_name: str):
+        """
+        Get a loaded model, loading it on first use.
+
+        Concurrent callers asking for the same model wait on a per-model lock,
+        so the model is only loaded once; other models can load in parallel.
+        Loading a model may evict least recently used models to stay within
+        the budget.
+
+        Args:
+            model_name: Coqui model name (e.g. 'tts_models/en/ljspeech/glow-tts')
+
+        Returns:
+            Loaded TTS instance
+        """
+        model = self._touch(model_name)
+        if model is not None:
+            return model
+
+        with self._model_lock(model_name):
+            model = self._touch(model_name)
+            if model is not None:
+                return model
+
+            logger.info(f"Loading model into registry: {model_name}")
+            start = time.perf_counter()
+            rss_before = process_rss_bytes()
+            model = self.inference_profile.apply(self._loader(model_name))
+            load_seconds = time.perf_counter() - start
+            size = self._model_bytes(model) or max(process_rss_bytes() - rss_before, 0)
+
+            with self._lock:
+                self._models[model_name] = _Resident(model, size, time.monotonic())
+                history = self._history.setdefault(model_name, _LoadHistory())
+                history.loads += 1
+                history.total_seconds += load_seconds
+                history.last_seconds = load_seconds
+            logger.info(
+                f"Model loaded: {model_name} in {load_seconds:.1f}s, {size / 2 ** 20:.0f}MB "
+                f"(inference profile: {self.inference_profile.name})"
+            )
+        self._enforce_budget(keep=model_name)
+        return model
+
+    @contextmanager
+    def borrow(self, model_name: str) -> Iterator[object]:
+        """
+        Use a model without it being evicted meanwhile.
+
+        Engines should borrow a model for the duration of a synthesis
+        instead of holding on to it, so idle models can be unloaded.
+
+        Args:
+            model_name: Coqui model name
+
+        Yields:
+            Loaded TTS instance
+        """
+        while True:
+            model = self.get(model_name)
+            with self._lock:
+                entry = self._models.get(model_name)
+                if entry is not None and entry.model is model:
+                    entry.pins += 1
+                    break
+            # Evicted between get() and pinning: load again rather than run a copy the registry dropped
+            logger.info(f"Model {model_name} was evicted before it could be borrowed; reloading")
+        try:
+            yield model
+        finally:
+            with self._lock:
+                entry.pins -= 1
+                entry.last_used = time.monotonic()
+
+    def load_unprofiled(self, model_name: str):
+        """
+        Build a separate copy of a model without the inference profile.
+
+        The copy is not cached or counted against the budget. Use it where the
+        profile must not apply, e.g. tracing the float model for ONNX export
+        while the registry quantizes.
+
+        Args:
+            model_name: Coqui model name
+
+        Returns:
+            Freshly loaded TTS instance
+        """
+        return self._loader(model_name)
+
+    def is_loaded(self, model_name: str) -> bool:
+        """Check whether a model is already resident."""
+        return model_name in self._models
+
+    def loaded_models(self) -> List[str]:
+        """Get names of all resident models, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    def unload(self, model_name: str) -> bool:
+        """
+        Drop a model from the registry, even if it is borrowed.
+
+        Args:
+            model_name: Model to unload
+
+        Returns:
+            True if the model was resident, False otherwise
+        """
+        with self._model_lock(model_name):
+            with self._lock:
+                entry = self._models.pop(model_name, None)
+        if entry is not None:
+            logger.info(f"Model unloaded: {model_name}")
+        return entry is not None
+
+    def clear(self) -> None:
+        """Unload every model."""
+        for model_name in self.loaded_models():
+            self.unload(model_name)
+
+    def evict_idle(self, idle_ttl: Optional[float] = None) -> List[str]:
+        """
+        Unload models that have not been used for ``idle_ttl`` seconds.
+
+        Args:
+            idle_ttl: Idle time in seconds (defaults to the registry's idle_ttl)
+
+        Returns:
+            Names of the unloaded models
+        """
+        idle_ttl = idle_ttl if idle_ttl is not None else self.idle_ttl
+        if not idle_ttl:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                name for name, entry in self._models.items()
+                if not entry.pins and now - entry.last_used > idle_ttl
+            ]
+        return [name for name in idle if self._evict(name, f"idle for more than {idle_ttl:.0f}s")]
+
+    def stats(self) -> dict:
+        """
+        Residency report.
+
+        Returns:
+            Dict with the resident set (LRU first) and its size, the budget,
+            process RSS, eviction count, and per-model load counts and latencies
+        """
+        now = time.monotonic()
+        with self._lock:
+            resident = {
+                name: {
+                    "bytes": entry.bytes,
+                    "pins": entry.pins,
+                    "idle_seconds": round(now - entry.last_used, 1),
+                }
+                for name, entry in self._models.items()
+            }
+            loads = {
+                name: {
+                    "loads": history.loads,
+                    "last_load_seconds": round(history.last_seconds, 3),
+                    "mean_load_seconds": round(history.total_seconds / history.loads, 3),
+                }
+                for name, history in self._history.items()
+            }
+            evictions = self.evictions
+        return {
+            "resident": resident,
+            "bytes": sum(entry["bytes"] for entry in resident.values()),
+            "max_bytes": self.max_bytes,
+            "idle_ttl": self.idle_ttl,
+            "rss_bytes": process_rss_bytes(),
+            "evictions": evictions,
+            "models": loads,
+        }
+
+    def _touch(self, model_name: str):
+        """Resident model marked most recently used, or None."""
+        with self._lock:
+            entry = self._models.get(model_name)
+            if entry is None:
+                return None
+            entry.last_used = time.monotonic()
+            self._models.move_to_end(model_name)
+            return entry.model
+
+    def _enforce_budget(self, keep: Optional[str] = None) -> None:
+        """Evict least recently used, unborrowed models until the resident set fits max_bytes."""
+        if not self.max_bytes:
+            return
+        with self._lock:
+            total = sum(entry.bytes for entry in self._models.values())
+            victims = []
+            for name, entry in self._models.items():
+                if total <= self.max_bytes:
+                    break
+                if name == keep or entry.pins:
+                    continue
+                victims.append(name)
+                total -= entry.bytes
+        for name in victims:
+            self._evict(name, f"over the {self.max_bytes / 2 ** 20:.0f}MB budget")
+        if total > self.max_bytes:
+            logger.warning(f"Resident models use {total / 2 ** 20:.0f}MB, over the budget; the rest are in use")
+
+    def _evict(self, model_name: str, reason: str) -> bool:
+        """Unload a model unless it was borrowed again in the meantime."""
+        with self._lock:
+            entry = self._models.get(model_name)
+            if entry is None or entry.pins:
+                return False
+            del self._models[model_name]
+            self.evictions += 1
+        # Coqui models hold reference cycles; free their tensors now rather than at the next GC pass
+        del entry
+        gc.collect()
+        logger.info(f"Model evicted: {model_name} ({reason})")
+        return True
+
+    def _reap_loop(self) -> None:
+        """Unload idle models, checking a few times per idle_ttl."""
+        interval = min(max(self.idle_ttl / 4, 1.0), 60.0)
+        while True:
+            time.sleep(interval)
+            try:
+                self.evict_idle()
+            except Exception as e:
+                logger.error(f"Error evicting idle models: {str(e)}")
+
+    @staticmethod
+    def _model_bytes(model) -> int:
+        """
+        Estimated memory of a loaded model: its reported size, else its torch tensors.
+
+        Returns 0 when neither is available (the caller falls back to the
+        RSS growth measured across the load).
+        """
+        measure = getattr(model, "memory_bytes", None)
+        if measure is not None:
+            return measure()
+        synthesizer = getattr(model, "synthesizer", None)
+        if synthesizer is None:
+            return 0
+        total = 0
+        for module in (getattr(synthesizer, "tts_model", None), getattr(synthesizer, "vocoder_model", None)):
+            if module is None:
+                continue
+            for tensor in list(module.parameters()) + list(module.buffers()):
+                total += tensor.numel() * tensor.element_size()
+        return total
+
+    def _model_lock(self, model_name: str) -> threading.Lock:
+        """Get (or create) the lock guarding a single model."""
+        with self._lock:
+            lock = self._locks.get(model_name)
+            if lock is None:
+                lock = self._locks[model_name] = threading.Lock()
+            return lock
+
+    def _load_tts(self, model_name: str):
+        """
+        Default loader building a Coqui ``TTS`` instance.
+
+        Names starting with ``onnx:`` load the ONNX Runtime backend of the
+        model after the prefix (exporting it on first use).
+        """
+        from utils.onnx_backend import ONNX_PREFIX
+        if model_name.startswith(ONNX_PREFIX):
+            from utils.onnx_backend import OnnxGlowTTS
+            return OnnxGlowTTS.load(model_name[len(ONNX_PREFIX):], self)
+        from TTS.api import TTS
+        return TTS(model_name=model_name, progress_bar=self._progress_bar)
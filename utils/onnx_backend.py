@@ -0,0 +1,299 @@
+"""
+ONNX Runtime backend for Glow-TTS and its vocoder.
+
+``export_glow_tts`` traces a loaded Coqui Glow-TTS model and its vocoder to
+two ONNX graphs (acoustic model: token ids -> mel frames, vocoder: mel ->
+waveform). ``OnnxGlowTTS`` runs them with onnxruntime on CPU. It keeps only
+the Coqui tokenizer, audio processors and sentence splitter from the
+PyTorch model, so text and mel pre/post-processing are identical to
+``TTS.tts``.
+
+The registry serves the backend under ``"onnx:" + model_name`` and exports
+the graphs on first use. ``onnx`` and ``onnxruntime`` are only needed when
+the backend is used.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+ONNX_PREFIX = "onnx:"
+SUPPORTED_MODELS = ("tts_models/en/ljspeech/glow-tts",)
+DEFAULT_OPSET = 17
+
+ACOUSTIC_FILE = "acoustic.onnx"
+ACOUSTIC_INT8_FILE = "acoustic.int8.onnx"
+VOCODER_FILE = "vocoder.onnx"
+META_FILE = "meta.json"
+
+# Coqui's Synthesizer appends this much silence after every sentence
+SENTENCE_SILENCE_SAMPLES = 10000
+
+
+def onnx_root() -> Path:
+    """Directory holding exported models (``TTS_ONNX_DIR``, else ./onnx_models)."""
+    return Path(os.environ.get("TTS_ONNX_DIR", "onnx_models"))
+
+
+def export_dir_for(model_name: str, root: Optional[Path] = None) -> Path:
+    """Export directory of one Coqui model."""
+    return (root or onnx_root()) / model_name.replace("/", "--")
+
+
+def export_glow_tts(tts, export_dir: Path, opset: int = DEFAULT_OPSET) -> Path:
+    """
+    Export a loaded Glow-TTS model and its vocoder to ONNX.
+
+    The noise and length scales become graph inputs, so they can be changed
+    at run time (noise 0 makes the output deterministic, e.g. for parity checks).
+
+    Args:
+        tts: Loaded Coqui ``TTS`` instance of a Glow-TTS model
+        export_dir: Directory for acoustic.onnx, vocoder.onnx and meta.json
+        opset: ONNX opset version
+
+    Returns:
+        export_dir
+    """
+    import torch
+
+    synthesizer = tts.synthesizer
+    model = synthesizer.tts_model
+    vocoder = synthesizer.vocoder_model
+    if type(model).__name__ != "GlowTTS":
+        raise ValueError(f"ONNX export supports Glow-TTS only, not {type(model).__name__}")
+    if vocoder is None:
+        raise ValueError("ONNX export needs a model with a separate vocoder")
+    vocoder_rate = synthesizer.vocoder_config.audio["sample_rate"]
+    if vocoder_rate != model.ap.sample_rate:
+        raise ValueError("ONNX export does not support vocoders at a different sample rate than the acoustic model")
+
+    class Acoustic(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, x, x_lengths, noise_scale, length_scale):
+            self.model.inference_noise_scale = noise_scale
+            self.model.length_scale = length_scale
+            aux_input = {"x_lengths": x_lengths, "speaker_ids": None, "d_vectors": None}
+            return self.model.inference(x, aux_input=aux_input)["model_outputs"]
+
+    class Vocoder(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.vocoder = vocoder
+
+        def forward(self, mel):
+            return self.vocoder.inference(mel)
+
+    export_dir.mkdir(parents=True, exist_ok=True)
+    noise_scale, length_scale = model.inference_noise_scale, model.length_scale
+    ids = torch.as_tensor([model.tokenizer.text_to_ids("This sentence traces the export graph.")], dtype=torch.long)
+    try:
+        model.eval()
+        vocoder.eval()
+        with torch.no_grad():
+            torch.onnx.export(
+                Acoustic(),
+                (ids, torch.tensor([ids.shape[1]]), torch.tensor(0.0), torch.tensor(1.0)),
+                str(export_dir / ACOUSTIC_FILE),
+                input_names=["x", "x_lengths", "noise_scale", "length_scale"],
+                output_names=["mel"],
+                dynamic_axes={"x": {0: "batch", 1: "tokens"}, "x_lengths": {0: "batch"}, "mel": {0: "batch", 1: "frames"}},
+                opset_version=opset,
+            )
+            mel = torch.randn(1, model.ap.num_mels, 50)
+            torch.onnx.export(
+                Vocoder(),
+                (mel,),
+                str(export_dir / VOCODER_FILE),
+                input_names=["mel"],
+                output_names=["wav"],
+                dynamic_axes={"mel": {0: "batch", 2: "frames"}, "wav": {0: "batch", 2: "samples"}},
+                opset_version=opset,
+            )
+    finally:
+        model.inference_noise_scale, model.length_scale = noise_scale, length_scale
+
+    meta = {
+        "model": type(model).__name__,
+        "vocoder": type(vocoder).__name__,
+        "sample_rate": synthesizer.output_sample_rate,
+        "noise_scale": float(noise_scale),
+        "length_scale": float(length_scale),
+        "opset": opset,
+        "torch": torch.__version__,
+    }
+    (export_dir / META_FILE).write_text(json.dumps(meta, indent=1))
+    logger.info(f"Exported {meta['model']} + {meta['vocoder']} to {export_dir}")
+    return export_dir
+
+
+class _SynthesizerInfo:
+    """The parts of Coqui's Synthesizer the engines read from a model."""
+
+    def __init__(self, output_sample_rate: int, segmenter):
+        self.output_sample_rate = output_sample_rate
+        self._segmenter = segmenter
+
+    def split_into_sentences(self, text: str) -> List[str]:
+        return self._segmenter.segment(text)
+
+
+class OnnxGlowTTS:
+    """Glow-TTS and vocoder on onnxruntime, with the ``tts``/``tts_to_file`` API of Coqui's TTS."""
+
+    def __init__(self, export_dir: Path, tts):
+        """
+        Initialize the backend.
+
+        Sessions are created when an inference profile is applied (the
+        registry does this on load) or on first synthesis.
+
+        Args:
+            export_dir: Directory written by export_glow_tts
+            tts: Loaded Coqui ``TTS`` instance of the same model (only its
+                tokenizer, audio processors and sentence splitter are kept)
+        """
+        self.export_dir = Path(export_dir)
+        self.meta = json.loads((self.export_dir / META_FILE).read_text())
+        synthesizer = tts.synthesizer
+        self.tokenizer = synthesizer.tts_model.tokenizer
+        self.tts_ap = synthesizer.tts_model.ap
+        self.vocoder_ap = synthesizer.vocoder_ap
+        self.trim_silence = bool(synthesizer.tts_config.audio.get("do_trim_silence", False))
+        self.synthesizer = _SynthesizerInfo(synthesizer.output_sample_rate, synthesizer.seg)
+        self.noise_scale = self.meta["noise_scale"]
+        self.length_scale = self.meta["length_scale"]
+        self._acoustic = None
+        self._vocoder = None
+        self._graph_bytes = 0
+
+    @classmethod
+    def load(cls, model_name: str, registry, root: Optional[Path] = None) -> "OnnxGlowTTS":
+        """
+        Load the backend for ``model_name``, exporting it first if needed.
+
+        Args:
+            model_name: Coqui model name (one of SUPPORTED_MODELS)
+            registry: Registry providing the PyTorch model for export and preprocessing
+            root: Export root (defaults to onnx_root())
+
+        Returns:
+            OnnxGlowTTS instance
+        """
+        if model_name not in SUPPORTED_MODELS:
+            raise ValueError(f"No ONNX backend for {model_name}")
+        export_dir = export_dir_for(model_name, root)
+        tts = registry.get(model_name)
+        if not (export_dir / META_FILE).exists():
+            # Trace the float model; under a quantizing profile the registry's copy is int8
+            source = registry.load_unprofiled(model_name) if registry.inference_profile.quantize else tts
+            export_glow_tts(source, export_dir)
+        return cls(export_dir, tts)
+
+    def apply_inference_profile(self, profile) -> None:
+        """
+        Create the onnxruntime sessions for an InferenceProfile.
+
+        The profile's thread budget sets the session thread pools; with
+        ``quantize`` the acoustic graph is quantized to dynamic int8 (once).
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        threads = profile.resolved_threads()
+        if threads is not None:
+            options.intra_op_num_threads = threads
+        if profile.interop_threads is not None:
+            options.inter_op_num_threads = profile.interop_threads
+
+        acoustic_path = self.export_dir / ACOUSTIC_FILE
+        if profile.quantize:
+            acoustic_path = self._quantized_acoustic()
+        providers = ["CPUExecutionProvider"]
+        self._acoustic = ort.InferenceSession(str(acoustic_path), sess_options=options, providers=providers)
+        self._vocoder = ort.InferenceSession(str(self.export_dir / VOCODER_FILE), sess_options=options, providers=providers)
+        self._graph_bytes = acoustic_path.stat().st_size + (self.export_dir / VOCODER_FILE).stat().st_size
+        logger.info(f"ONNX sessions ready for {self.export_dir.name} (profile: {profile.name})")
+
+    def memory_bytes(self) -> int:
+        """Approximate resident size: the weights of the loaded graphs."""
+        return self._graph_bytes
+
+    def _quantized_acoustic(self) -> Path:
+        """Dynamic int8 copy of the acoustic graph, created on first use."""
+        path = self.export_dir / ACOUSTIC_INT8_FILE
+        if not path.exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            partial = path.with_suffix(".part")
+            quantize_dynamic(str(self.export_dir / ACOUSTIC_FILE), str(partial), weight_type=QuantType.QInt8)
+            os.replace(partial, path)
+        return path
+
+    def _sessions(self):
+        """Acoustic and vocoder sessions, created with the default profile if none was applied."""
+        if self._acoustic is None:
+            from utils.inference_profile import InferenceProfile
+            self.apply_inference_profile(InferenceProfile())
+        return self._acoustic, self._vocoder
+
+    def synthesize_sentence(self, sentence: str, noise_scale: Optional[float] = None) -> np.ndarray:
+        """
+        Synthesize one sentence (without the trailing sentence silence).
+
+        Args:
+            sentence: Text of a single sentence
+            noise_scale: Sampling noise (defaults to the model's; 0 is deterministic)
+
+        Returns:
+            Float32 waveform
+        """
+        acoustic, vocoder = self._sessions()
+        ids = np.asarray([self.tokenizer.text_to_ids(sentence)], dtype=np.int64)
+        mel = acoustic.run(["mel"], {
+            "x": ids,
+            "x_lengths": np.asarray([ids.shape[1]], dtype=np.int64),
+            "noise_scale": np.asarray(self.noise_scale if noise_scale is None else noise_scale, dtype=np.float32),
+            "length_scale": np.asarray(self.length_scale, dtype=np.float32),
+        })[0][0]
+
+        # Same mel hand-off as Coqui's Synthesizer: denormalize for the TTS config, renormalize for the vocoder
+        mel = self.tts_ap.denormalize(mel.T).T
+        vocoder_input = self.vocoder_ap.normalize(mel.T)[np.newaxis].astype(np.float32)
+        wav = vocoder.run(["wav"], {"mel": vocoder_input})[0].squeeze()
+        if self.trim_silence:
+            wav = wav[:self.tts_ap.find_endpoint(wav)]
+        return wav.astype(np.float32, copy=False)
+
+    def tts(self, text: str, noise_scale: Optional[float] = None, **kwargs) -> np.ndarray:
+        """
+        Synthesize text sentence by sentence, like ``TTS.tts``.
+
+        Args:
+            text: Text to speak
+            noise_scale: Sampling noise (defaults to the model's)
+            **kwargs: Accepted for API compatibility (speaker/language do not apply to Glow-TTS)
+
+        Returns:
+            Float32 waveform at synthesizer.output_sample_rate
+        """
+        pieces = []
+        silence = np.zeros(SENTENCE_SILENCE_SAMPLES, dtype=np.float32)
+        for sentence in self.synthesizer.split_into_sentences(text):
+            pieces.append(self.synthesize_sentence(sentence, noise_scale))
+            pieces.append(silence)
+        return np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+
+    def tts_to_file(self, text: str, file_path: str, **kwargs) -> str:
+        """Synthesize text into a WAV file, like ``TTS.tts_to_file``."""
+        sf.write(file_path, self.tts(text, **kwargs), self.synthesizer.output_sample_rate)
+        return file_path
@@ -0,0 +1,286 @@
+"""
+Collision-free, sharded storage for generated audio with a disk quota.
+"""
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class OutputStore:
+    """
+    Unique output paths under a two-level shard tree, garbage-collected by size and age.
+
+    Paths handed out by allocate()/reserve() are in flight until committed
+    or discarded, and collection never touches them. Files modified within
+    GRACE_SECONDS are never collected either, which covers artifacts that are
+    written progressively (live streaming) or were just returned to a caller.
+    """
+
+    DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+    DEFAULT_MAX_AGE = 7 * 24 * 3600
+    TEMP_MAX_AGE = 3600
+    GRACE_SECONDS = 600
+    GC_INTERVAL = 300
+
+    _stores: Dict[Path, "OutputStore"] = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(
+        self,
+        root: str = "outputs",
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+        temp_dir: Optional[str] = "temp",
+        temp_max_age: float = TEMP_MAX_AGE,
+        gc_interval: float = GC_INTERVAL
+    ):
+        """
+        Initialize the store and start background collection.
+
+        Args:
+            root: Directory holding outputs
+            max_bytes: Disk quota for root; oldest outputs are collected above it (0 disables)
+            max_age: Outputs older than this many seconds are collected (0 disables)
+            temp_dir: Scratch directory whose stale files are also collected (None to skip)
+            temp_max_age: Age in seconds after which scratch files are collected
+            gc_interval: Seconds between background passes (0 disables the thread)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.temp_dir = Path(temp_dir) if temp_dir else None
+        self.temp_max_age = temp_max_age
+        self.gc_interval = gc_interval
+        self._inflight: Set[Path] = set()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self.collected_files = 0
+        self.collected_bytes = 0
+        self._thread: Optional[threading.Thread] = None
+        if gc_interval > 0:
+            self._thread = threading.Thread(target=self._gc_loop, name="output-gc", daemon=True)
+            self._thread.start()
+
+    @classmethod
+    def for_directory(cls, root: str, **options) -> "OutputStore":
+        """
+        Get the store for ``root``, creating it on first use.
+
+        Engines writing to the same directory share one store and one
+        collector thread. ``options`` only apply when the store is created;
+        the quota and age limits default to ``TTS_OUTPUT_MAX_MB`` and
+        ``TTS_OUTPUT_MAX_AGE_HOURS`` when set.
+
+        Args:
+            root: Directory holding outputs
+            **options: Constructor arguments
+
+        Returns:
+            OutputStore for the directory
+        """
+        key = Path(root).resolve()
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls._stores[key] = cls(root, **{**cls._env_limits(), **options})
+            return store
+
+    @classmethod
+    def shared(cls) -> "OutputStore":
+        """Get the store for the default output directory (``TTS_OUTPUT_DIR``, else "outputs")."""
+        return cls.for_directory(os.environ.get("TTS_OUTPUT_DIR", "outputs"))
+
+    @staticmethod
+    def _env_limits() -> dict:
+        """Quota and age limits configured through the environment."""
+        limits = {}
+        max_mb = os.environ.get("TTS_OUTPUT_MAX_MB")
+        max_age_hours = os.environ.get("TTS_OUTPUT_MAX_AGE_HOURS")
+        if max_mb:
+            limits["max_bytes"] = int(float(max_mb) * 1024 * 1024)
+        if max_age_hours:
+            limits["max_age"] = float(max_age_hours) * 3600
+        return limits
+
+    @staticmethod
+    def new_id() -> str:
+        """Unique, time-ordered artifact ID: second timestamp plus 48 random bits."""
+        return f"{datetime.now():%Y%m%d_%H%M%S}_{secrets.token_hex(6)}"
+
+    def allocate(self, prefix: str, suffix: str) -> Path:
+        """
+        Reserve a new unique path and mark it in flight.
+
+        Args:
+            prefix: File name prefix (e.g. "cloned_voice")
+            suffix: File extension including the dot
+
+        Returns:
+            Path that no other caller will receive
+        """
+        artifact_id = self.new_id()
+        token = artifact_id[-12:]
+        shard = self.root / token[:2] / token[2:4]
+        shard.mkdir(parents=True, exist_ok=True)
+        path = shard / f"{prefix}_{artifact_id}{suffix}"
+        with self._lock:
+            self._inflight.add(path)
+        return path
+
+    def commit(self, path) -> None:
+        """
+        Mark an allocated path as finished and account for its size.
+
+        Safe to call more than once or for paths this store did not allocate.
+        """
+        path = Path(path)
+        with self._lock:
+            if path not in self._inflight:
+                return
+            self._inflight.discard(path)
+            try:
+                self._bytes += path.stat().st_size
+            except OSError:
+                return
+            over_quota = self.max_bytes > 0 and self._bytes > self.max_bytes
+        if over_quota:
+            self._wake.set()
+
+    def discard(self, path) -> None:
+        """Release an allocated path and delete whatever was written to it."""
+        path = Path(path)
+        with self._lock:
+            self._inflight.discard(path)
+        path.unlink(missing_ok=True)
+
+    @contextmanager
+    def reserve(self, prefix: str, suffix: str) -> Iterator[Path]:
+        """
+        Allocate a path for the duration of a write.
+
+        The path is committed when the block succeeds and discarded (with any
+        partial file) when it raises.
+
+        Args:
+            prefix: File name prefix
+            suffix: File extension including the dot
+
+        Yields:
+            Unique output path
+        """
+        path = self.allocate(prefix, suffix)
+        try:
+            yield path
+        except BaseException:
+            self.discard(path)
+            raise
+        self.commit(path)
+
+    def collect(self) -> dict:
+        """
+        Run one collection pass.
+
+        Outputs older than max_age go first, then the oldest outputs until the
+        root is within max_bytes; stale scratch files are removed too. In-flight
+        paths and files modified within GRACE_SECONDS are never removed.
+
+        Returns:
+            Dict with removed file count, freed bytes and remaining usage
+        """
+        now = time.time()
+        with self._lock:
+            inflight = set(self._inflight)
+
+        removed, freed = 0, 0
+        files = self._scan(self.root)
+        total = sum(size for _, size, _ in files)
+        for mtime, size, path in sorted(files):
+            expired = self.max_age > 0 and now - mtime > self.max_age
+            over_quota = self.max_bytes > 0 and total > self.max_bytes
+            if not (expired or over_quota):
+                break
+            if path in inflight or now - mtime < self.GRACE_SECONDS:
+                continue
+            if self._remove(path):
+                removed += 1
+                freed += size
+                total -= size
+
+        if self.temp_dir is not None and self.temp_dir.is_dir():
+            for mtime, size, path in self._scan(self.temp_dir):
+                if path not in inflight and now - mtime > self.temp_max_age and self._remove(path):
+                    removed += 1
+                    freed += size
+
+        with self._lock:
+            self._bytes = total
+            self.collected_files += removed
+            self.collected_bytes += freed
+        if removed:
+            logger.info(f"Output GC removed {removed} files ({freed / (1024 * 1024):.1f}MB)")
+        return {"removed": removed, "freed_bytes": freed, "bytes": total, "files": len(files) - removed}
+
+    @staticmethod
+    def _scan(directory: Path) -> List[Tuple[float, int, Path]]:
+        """(mtime, size, path) of every regular file under ``directory``, skipping dotfiles."""
+        entries = []
+        for dirpath, _, filenames in os.walk(directory):
+            for name in filenames:
+                if name.startswith("."):
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        """Delete a file, tolerating concurrent removal."""
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Could not remove {path}: {str(e)}")
+            return False
+
+    def _gc_loop(self) -> None:
+        """Collect every gc_interval seconds, or sooner when a commit exceeds the quota."""
+        while not self._stopped.is_set():
+            try:
+                self.collect()
+            except Exception as e:
+                logger.error(f"Error in output GC: {str(e)}")
+            self._wake.wait(self.gc_interval)
+            self._wake.clear()
+
+    def stop(self) -> None:
+        """Stop the background collector."""
+        self._stopped.set()
+        self._wake.set()
+
+    def stats(self) -> dict:
+        """Get usage and collection counters."""
+        with self._lock:
+            return {
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "in_flight": len(self._inflight),
+                "collected_files": self.collected_files,
+                "collected_bytes": self.collected_bytes,
+            }
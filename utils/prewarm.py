@@ -0,0 +1,257 @@
+"""
+Background model prewarming: load every Coqui model and run one short synthesis.
+
+The first inference after a load is much slower than later ones (allocator
+growth, kernel selection, lazy buffers), so a model only counts as warm once
+it has synthesized something. Prewarming runs on a daemon thread and records
+a per-model state that the app sidebar and the server's /ready endpoint show.
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from utils.inference_scheduler import InferenceScheduler
+from utils.model_registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+COLD = "cold"
+LOADING = "loading"
+WARMING = "warming"
+WARM = "warm"
+# Weights are resident but the warmup synthesis failed or was skipped
+LOADED = "loaded"
+FAILED = "failed"
+
+# States in which a request will not wait for a model load
+READY_STATES = (WARM, LOADED)
+
+
+@dataclass
+class ModelState:
+    """Prewarm progress of one model."""
+
+    state: str = COLD
+    load_seconds: Optional[float] = None
+    warmup_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class ModelPrewarmer:
+    """Loads and warms registry models in the background."""
+
+    DEFAULT_WARMUP_TEXT = "Warming up the speech model."
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, registry: Optional[ModelRegistry] = None, warmup_text: str = DEFAULT_WARMUP_TEXT):
+        """
+        Initialize the prewarmer.
+
+        Args:
+            registry: Registry the models are loaded into (defaults to the shared one)
+            warmup_text: Text synthesized once per model (empty skips the warmup synthesis)
+        """
+        self.registry = registry or ModelRegistry.shared()
+        self.warmup_text = warmup_text
+        self._states: Dict[str, ModelState] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def shared(cls) -> "ModelPrewarmer":
+        """Prewarmer for the shared registry."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def default_models() -> List[str]:
+        """Every model the engines serve: AdvancedTTS.AVAILABLE_MODELS plus the cloning model."""
+        from utils.tts_advanced import AdvancedTTS
+        from utils.voice_clone import VoiceClone
+        names = list(AdvancedTTS.AVAILABLE_MODELS)
+        if VoiceClone.MODEL_NAME not in names:
+            names.append(VoiceClone.MODEL_NAME)
+        return names
+
+    @staticmethod
+    def configured_models() -> List[str]:
+        """
+        Models the app prewarms according to the environment.
+
+        Prewarming is opt-in (``TTS_PREWARM=1``), so the app's cold start
+        stays free of torch and the Coqui models. ``TTS_PREWARM_MODELS`` is a
+        comma-separated subset of models (all served models by default).
+        """
+        if os.environ.get("TTS_PREWARM", "0").strip().lower() not in ("1", "true", "yes", "on"):
+            return []
+        names = os.environ.get("TTS_PREWARM_MODELS", "")
+        if names.strip():
+            return [name.strip() for name in names.split(",") if name.strip()]
+        return ModelPrewarmer.default_models()
+
+    def start(self, model_names: Optional[List[str]] = None) -> Optional[threading.Thread]:
+        """
+        Prewarm models on a background thread.
+
+        Each model is prewarmed at most once per process: models already
+        attempted are skipped, including ones the registry has since evicted
+        on purpose (idle TTL or memory budget), which reload on demand. So it
+        is safe to call on every app rerun.
+
+        Args:
+            model_names: Models to warm (defaults to configured_models())
+
+        Returns:
+            The prewarm thread, or None if there was nothing to do
+        """
+        if model_names is None:
+            model_names = self.configured_models()
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self._thread
+            # Failed and evicted models are not retried; warm() rewarms one explicitly
+            pending = [
+                name for name in model_names
+                if name not in self._states and not self.registry.is_loaded(name)
+            ]
+            if not pending:
+                return None
+            for name in pending:
+                self._states.setdefault(name, ModelState())
+            self._thread = threading.Thread(target=self.warm_all, args=(pending,), name="model-prewarm", daemon=True)
+            self._thread.start()
+        logger.info(f"Prewarming {len(pending)} models in the background")
+        return self._thread
+
+    def warm_all(self, model_names: List[str]) -> None:
+        """Load and warm models one after another (blocking)."""
+        start = time.perf_counter()
+        for model_name in model_names:
+            self.warm(model_name)
+        logger.info(f"Prewarm finished in {time.perf_counter() - start:.1f}s")
+
+    def warm(self, model_name: str) -> bool:
+        """
+        Load one model and run a short warmup synthesis.
+
+        Args:
+            model_name: Coqui model name
+
+        Returns:
+            True if the model is resident afterwards
+        """
+        self._update(model_name, state=LOADING, error=None)
+        try:
+            start = time.perf_counter()
+            model = self.registry.get(model_name)
+            self._update(model_name, state=WARMING, load_seconds=time.perf_counter() - start)
+        except Exception as e:
+            logger.error(f"Could not prewarm {model_name}: {str(e)}")
+            self._update(model_name, state=FAILED, error=str(e))
+            return False
+
+        if not self.warmup_text:
+            self._update(model_name, state=LOADED)
+            return True
+        try:
+            start = time.perf_counter()
+            # Through the scheduler, so warming never overlaps a user request on the same model
+            kwargs = self._warmup_kwargs(model)
+            InferenceScheduler.for_model(model_name, self.registry).run(
+                lambda tts: tts.tts(text=self.warmup_text, **kwargs)
+            )
+            warmup_seconds = time.perf_counter() - start
+            self._update(model_name, state=WARM, warmup_seconds=warmup_seconds)
+            logger.info(f"Model warm: {model_name} (warmup synthesis {warmup_seconds:.2f}s)")
+        except Exception as e:
+            # The model is usable; only its first request stays slow
+            logger.warning(f"Warmup synthesis failed for {model_name}: {str(e)}")
+            self._update(model_name, state=LOADED, error=str(e))
+        return True
+
+    @staticmethod
+    def _warmup_kwargs(model) -> dict:
+        """Speaker and language arguments multi-speaker/multilingual models require."""
+        kwargs = {}
+        if getattr(model, "is_multi_speaker", False) and getattr(model, "speakers", None):
+            kwargs["speaker"] = model.speakers[0]
+        if getattr(model, "is_multi_lingual", False) and getattr(model, "languages", None):
+            kwargs["language"] = "en" if "en" in model.languages else model.languages[0]
+        return kwargs
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the running prewarm pass.
+
+        Returns:
+            True if no pass is running anymore
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    @property
+    def running(self) -> bool:
+        """Whether a prewarm pass is in progress."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def state(self, model_name: str) -> str:
+        """
+        Current state of a model.
+
+        Models never prewarmed are "loaded" if a request already loaded them,
+        "cold" otherwise.
+        """
+        with self._lock:
+            return self._state(model_name).state
+
+    def states(self, model_names: Optional[List[str]] = None) -> Dict[str, str]:
+        """States of ``model_names`` (defaults to every served model)."""
+        if model_names is None:
+            model_names = self.default_models()
+        return {name: self.state(name) for name in model_names}
+
+    def status(self, model_names: Optional[List[str]] = None) -> dict:
+        """
+        Readiness report.
+
+        Returns:
+            Dict with "ready" (every model warm or loaded), "running" and per-model details
+        """
+        if model_names is None:
+            model_names = self.default_models()
+        with self._lock:
+            details = {name: vars(self._state(name)).copy() for name in model_names}
+        return {
+            "ready": all(detail["state"] in READY_STATES for detail in details.values()),
+            "running": self.running,
+            "models": details,
+        }
+
+    def _state(self, model_name: str) -> ModelState:
+        """State record for a model (caller holds the lock)."""
+        state = self._states.get(model_name)
+        loaded = self.registry.is_loaded(model_name)
+        if state is None:
+            return ModelState(state=LOADED if loaded else COLD)
+        if state.state in READY_STATES and not loaded:
+            # Unloaded from the registry since it was warmed
+            return ModelState(state=COLD)
+        return state
+
+    def _update(self, model_name: str, **fields) -> None:
+        """Update a model's state record."""
+        with self._lock:
+            state = self._states.setdefault(model_name, ModelState())
+            for name, value in fields.items():
+                setattr(state, name, value)
@@ -0,0 +1,106 @@
+"""
+Rational-ratio polyphase resampling on float32 arrays.
+"""
+import logging
+from functools import lru_cache
+from math import gcd
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Zero crossings of the windowed sinc on each side of the centre tap
+FILTER_HALF_WIDTH = 16
+# Passband edge as a fraction of the lower Nyquist frequency
+FILTER_ROLLOFF = 0.945
+# Kaiser window shape (~80dB stopband)
+KAISER_BETA = 8.6
+# Output samples computed per matrix product (bounds the working set)
+BLOCK_SIZE = 16384
+
+
+@lru_cache(maxsize=32)
+def polyphase_filters(orig_sr: int, target_sr: int) -> Tuple[int, int, np.ndarray]:
+    """
+    Design (and cache) the polyphase filter bank for a sample-rate pair.
+
+    Args:
+        orig_sr: Input sample rate
+        target_sr: Output sample rate
+
+    Returns:
+        Tuple of (up factor, down factor, read-only float32 bank of shape (up, taps_per_phase))
+    """
+    divisor = gcd(orig_sr, target_sr)
+    up, down = target_sr // divisor, orig_sr // divisor
+
+    # Low-pass at the lower of the two Nyquist rates, expressed at the upsampled rate
+    cutoff = FILTER_ROLLOFF * 0.5 / max(up, down)
+    half_length = FILTER_HALF_WIDTH * max(up, down)
+    t = np.arange(-half_length, half_length + 1, dtype=np.float64)
+    taps = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(len(t), KAISER_BETA) * up
+
+    # Split into phases: phase p holds taps p, p + up, p + 2*up, ...
+    taps_per_phase = -(-len(taps) // up)
+    padded = np.zeros(taps_per_phase * up)
+    padded[:len(taps)] = taps
+    bank = padded.reshape(taps_per_phase, up).T.astype(np.float32)
+    bank.setflags(write=False)
+
+    logger.debug(f"Designed polyphase filter {orig_sr}->{target_sr}: {up}/{down}, {taps_per_phase} taps/phase")
+    return up, down, bank
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """
+    Resample audio by a rational ratio with a cached polyphase filter.
+
+    Each output phase is computed as one matrix-vector product over a strided
+    window view of the input, so no upsampled intermediate is materialized.
+
+    Args:
+        audio: Float array of shape (samples,) or (samples, channels)
+        orig_sr: Input sample rate
+        target_sr: Output sample rate
+
+    Returns:
+        Float32 array at ``target_sr`` with the same channel layout
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    if orig_sr == target_sr:
+        return audio
+    if audio.ndim == 2:
+        return np.stack([resample(audio[:, c], orig_sr, target_sr) for c in range(audio.shape[1])], axis=1)
+
+    up, down, bank = polyphase_filters(orig_sr, target_sr)
+    taps_per_phase = bank.shape[1]
+    centre = FILTER_HALF_WIDTH * max(up, down)
+
+    n_in = len(audio)
+    n_out = -(-n_in * up // down)
+    if n_out == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    # Pad so every window stays inside the buffer
+    pad = taps_per_phase + centre // up + 1
+    padded = np.zeros(n_in + 2 * pad, dtype=np.float32)
+    padded[pad:pad + n_in] = audio
+    windows = np.lib.stride_tricks.sliding_window_view(padded, taps_per_phase)
+    reversed_bank = np.ascontiguousarray(bank[:, ::-1])
+
+    out = np.empty(n_out, dtype=np.float32)
+    for first in range(min(up, n_out)):
+        # Output n reads taps phase (n*down + centre) % up around input (n*down + centre) // up
+        position = first * down + centre
+        phase, base = position % up, position // up
+        count = len(range(first, n_out, up))
+        # Window starting at padded index s covers input samples s-pad .. s-pad+taps-1,
+        # ending at input sample ``base`` for the first output of this phase
+        start = base - taps_per_phase + 1 + pad
+        phase_out = out[first::up]
+        for block in range(0, count, BLOCK_SIZE):
+            rows = min(BLOCK_SIZE, count - block)
+            offset = start + block * down
+            phase_out[block:block + rows] = windows[offset:offset + rows * down:down] @ reversed_bank[phase]
+    return out
@@ -0,0 +1,169 @@
+"""
+Concurrent gTTS segment fetching over pooled keep-alive connections.
+
+gTTS splits text into ~100-character segments and requests them one after
+another, each over a new connection, so a long text pays dozens of serial
+round trips and TLS handshakes. SegmentFetcher sends the same prepared
+requests (``gTTS._prepare_requests``) from a bounded thread pool over one
+pooled ``requests.Session``, retries failed segments with backoff and joins
+the audio in segment order, byte for byte what ``gTTS.write_to_fp`` writes.
+
+Relying on the private request builder and the response format ties this
+module to the gTTS version pinned in requirements.txt;
+tests/test_segment_fetcher.py checks the contract against the stand-in
+server and should be run before changing the pin.
+
+``TTS_GTTS_BASE_URL`` sends the requests to another host instead of Google
+Translate, e.g. the stand-in server in benchmarks/bench_gtts_fetch.py.
+"""
+import base64
+import logging
+import os
+import re
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from gtts import gTTS
+from gtts.tts import gTTSError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Audio payload in a batchexecute response line (same pattern as gTTS.stream)
+AUDIO_PATTERN = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+# Rate limiting and transient upstream errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class SegmentFetcher:
+    """Fetch the segments of a gTTS request in parallel and reassemble them in order."""
+
+    DEFAULT_WORKERS = 8
+    DEFAULT_RETRIES = 3
+    DEFAULT_BACKOFF = 0.3
+    DEFAULT_TIMEOUT = 10.0
+
+    _shared: Optional["SegmentFetcher"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        retries: int = DEFAULT_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+        base_url: Optional[str] = None
+    ):
+        """
+        Initialize the connection pool and worker threads.
+
+        Args:
+            max_workers: Segments in flight at once, across all callers (also the pool size)
+            retries: Retries per segment on connection errors and RETRY_STATUSES
+            backoff_factor: Exponential backoff base in seconds between retries
+            timeout: Connect/read timeout per attempt in seconds
+            base_url: Scheme and host to send requests to instead of Google Translate
+        """
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.base_url = base_url.rstrip("/") if base_url else None
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            # The TTS endpoint is a POST but has no side effects, so it is safe to repeat
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # gTTS passes the system proxies with every request
+        self.session.proxies.update(urllib.request.getproxies())
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gtts-fetch")
+
+    @classmethod
+    def shared(cls) -> "SegmentFetcher":
+        """
+        Get the fetcher shared by every session in this process.
+
+        Parallelism and target come from ``TTS_GTTS_WORKERS`` and
+        ``TTS_GTTS_BASE_URL``.
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls(
+                        max_workers=int(os.environ.get("TTS_GTTS_WORKERS", cls.DEFAULT_WORKERS)),
+                        base_url=os.environ.get("TTS_GTTS_BASE_URL") or None,
+                    )
+        return cls._shared
+
+    def fetch(self, tts: gTTS) -> bytes:
+        """
+        Fetch all segments of a gTTS request.
+
+        Args:
+            tts: Configured gTTS instance (text, language, speed)
+
+        Returns:
+            MP3 audio of the whole text, segments in order
+
+        Raises:
+            gTTSError: When a segment fails after its retries
+        """
+        requests_ = tts._prepare_requests()
+        if len(requests_) == 1:
+            return self._fetch_segment(tts, requests_[0])
+
+        futures = [self._executor.submit(self._fetch_segment, tts, request) for request in requests_]
+        try:
+            return b"".join(future.result() for future in futures)
+        except BaseException:
+            # Do not spend the pool on a request that already failed
+            for future in futures:
+                future.cancel()
+            raise
+
+    def close(self) -> None:
+        """Stop the workers and close pooled connections."""
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    def _fetch_segment(self, tts: gTTS, request: requests.PreparedRequest) -> bytes:
+        """Send one prepared segment request and decode its audio."""
+        if self.base_url is not None:
+            request.url = self._rebase(request.url)
+        try:
+            response = self.session.send(request, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            raise gTTSError(tts=tts, response=response)
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"gTTS segment request failed: {str(e)}")
+            raise gTTSError(tts=tts)
+
+        audio = []
+        for line in response.text.splitlines():
+            if "jQ1olc" not in line:
+                continue
+            match = AUDIO_PATTERN.search(line)
+            if match is None:
+                # Successful response without an audio stream
+                raise gTTSError(tts=tts, response=response)
+            audio.append(base64.b64decode(match.group(1).encode("ascii")))
+        return b"".join(audio)
+
+    def _rebase(self, url: str) -> str:
+        """Move a Google Translate URL onto base_url, keeping path and query."""
+        base = urlsplit(self.base_url)
+        parts = urlsplit(url)
+        return urlunsplit((base.scheme, base.netloc, base.path + parts.path, parts.query, parts.fragment))
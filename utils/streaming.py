@@ -0,0 +1,175 @@
+"""
+Sentence-chunked streaming synthesis helpers.
+"""
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterator, List, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r'[.!?]+["\'”’)\]]*(?=\s|$)|[。！？]+')
+_CLAUSE_END = re.compile(r'[,;:]+(?=\s)|[，；：]+')
+_ABBREVIATIONS = {'mr.', 'mrs.', 'ms.', 'dr.', 'prof.', 'sr.', 'jr.', 'st.', 'vs.', 'etc.', 'e.g.', 'i.e.'}
+
+
+@dataclass
+class AudioChunk:
+    """One synthesized sentence of a stream."""
+    index: int
+    text: str
+    samples: np.ndarray
+    sample_rate: int
+    elapsed: float
+
+    @property
+    def duration(self) -> float:
+        """Chunk duration in seconds."""
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+
+def split_sentences(text: str, max_chars: int = 250) -> List[str]:
+    """
+    Split text into sentences for incremental synthesis.
+
+    Sentences longer than ``max_chars`` are split further at clause
+    punctuation, then at whitespace, so no single chunk stalls the stream.
+
+    Args:
+        text: Text to split
+        max_chars: Soft upper bound on chunk length
+
+    Returns:
+        Non-empty sentences in order
+    """
+    sentences = []
+    for paragraph in text.splitlines():
+        pending = ""
+        for sentence in _split_after(_SENTENCE_END, paragraph):
+            sentence = f"{pending} {sentence.strip()}".strip()
+            pending = ""
+            if not sentence:
+                continue
+            if sentence.rsplit(" ", 1)[-1].lower() in _ABBREVIATIONS:
+                pending = sentence
+                continue
+            if len(sentence) <= max_chars:
+                sentences.append(sentence)
+            else:
+                sentences.extend(_split_long(sentence, max_chars))
+        if pending:
+            sentences.append(pending)
+    return sentences
+
+
+def _split_after(pattern: "re.Pattern", text: str) -> List[str]:
+    """Split text after every match of ``pattern``, keeping the punctuation."""
+    pieces = []
+    start = 0
+    for match in pattern.finditer(text):
+        pieces.append(text[start:match.end()])
+        start = match.end()
+    pieces.append(text[start:])
+    return pieces
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Split an over-long sentence at clause boundaries, then at words."""
+    pieces = []
+    current = ""
+    for part in _split_after(_CLAUSE_END, sentence):
+        part = part.strip()
+        for word in (part.split(" ") if len(part) > max_chars else [part]):
+            candidate = f"{current} {word}".strip()
+            if current and len(candidate) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+class StreamingWavWriter:
+    """Incrementally assemble a WAV file from streamed chunks."""
+
+    def __init__(self, output_path: Union[str, BinaryIO], subtype: str = "PCM_16"):
+        """
+        Initialize the writer; the file is opened on the first chunk.
+
+        Args:
+            output_path: Path of the WAV file to write, or a seekable buffer (e.g. io.BytesIO)
+            subtype: libsndfile sample subtype
+        """
+        self.output_path = output_path if hasattr(output_path, "write") else str(output_path)
+        self.subtype = subtype
+        self._file: Optional[sf.SoundFile] = None
+        self.frames_written = 0
+
+    def write(self, samples: np.ndarray, sample_rate: int) -> None:
+        """Append mono float samples to the file."""
+        if self._file is None:
+            self._file = sf.SoundFile(
+                self.output_path, mode="w", samplerate=sample_rate, channels=1, subtype=self.subtype, format="WAV"
+            )
+        elif sample_rate != self._file.samplerate:
+            raise ValueError(f"Sample rate changed mid-stream: {self._file.samplerate} -> {sample_rate}")
+        self._file.write(samples)
+        self.frames_written += len(samples)
+
+    def close(self) -> None:
+        """Finalize the WAV header."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "StreamingWavWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def stream_synthesis(
+    text: str,
+    synthesize: Callable[[str], np.ndarray],
+    sample_rate: int,
+    output_path: Optional[Union[str, BinaryIO]] = None,
+    pause_samples: int = 0
+) -> Iterator[AudioChunk]:
+    """
+    Synthesize text sentence by sentence, yielding each chunk as it is ready.
+
+    Args:
+        text: Text to synthesize
+        synthesize: Callable turning one sentence into a waveform
+        sample_rate: Sample rate of the waveforms returned by ``synthesize``
+        output_path: If given, chunks are also appended to this WAV file or buffer
+        pause_samples: Silence inserted before every chunk but the first
+
+    Yields:
+        AudioChunk with float32 PCM for each sentence
+    """
+    start = time.perf_counter()
+    writer = StreamingWavWriter(output_path) if output_path is not None else None
+    try:
+        for index, sentence in enumerate(split_sentences(text)):
+            samples = np.asarray(synthesize(sentence), dtype=np.float32).reshape(-1)
+            if index and pause_samples:
+                samples = np.concatenate([np.zeros(pause_samples, dtype=np.float32), samples])
+            if writer is not None:
+                writer.write(samples, sample_rate)
+            elapsed = time.perf_counter() - start
+            if index == 0:
+                logger.info(f"Time to first audio: {elapsed:.2f}s")
+            yield AudioChunk(
+                index=index, text=sentence, samples=samples, sample_rate=sample_rate, elapsed=elapsed
+            )
+    finally:
+        if writer is not None:
+            writer.close()
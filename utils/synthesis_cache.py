@@ -0,0 +1,235 @@
+"""
+Content-addressed on-disk cache of synthesized audio.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SynthesisCache:
+    """Disk-budgeted LRU cache of synthesis outputs keyed by normalized request."""
+
+    DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+    _shared: Optional["SynthesisCache"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, cache_dir: str = "cache/synthesis", max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache and index any artifacts already on disk.
+
+        Args:
+            cache_dir: Directory holding cached artifacts
+            max_bytes: Disk budget; least recently used artifacts are evicted above it (0 disables the cache)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._index: "OrderedDict[str, Tuple[Path, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._load_index()
+
+    @classmethod
+    def shared(cls) -> "SynthesisCache":
+        """
+        Get the cache shared by every session in this process.
+
+        The location and budget come from ``TTS_CACHE_DIR`` and ``TTS_CACHE_MAX_MB``.
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    max_mb = os.environ.get("TTS_CACHE_MAX_MB")
+                    cls._shared = cls(
+                        cache_dir=os.environ.get("TTS_CACHE_DIR", "cache/synthesis"),
+                        max_bytes=int(float(max_mb) * 1024 * 1024) if max_mb else cls.DEFAULT_MAX_BYTES,
+                    )
+        return cls._shared
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything."""
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(**fields) -> str:
+        """
+        Build a cache key from request fields.
+
+        Text is NFC-normalized and whitespace-collapsed so trivially different
+        spellings of the same request share an entry.
+
+        Args:
+            **fields: Request fields (engine, model, text, language, speaker, speed, ...)
+
+        Returns:
+            Hex SHA-256 digest of the normalized request
+        """
+        if isinstance(fields.get("text"), str):
+            fields["text"] = " ".join(unicodedata.normalize("NFC", fields["text"]).split())
+        payload = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_index(self) -> None:
+        """Index existing artifacts, oldest first."""
+        entries = []
+        for path in self.cache_dir.glob("*/*"):
+            if path.name.startswith(".") or not path.is_file():
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime, path.stem, path, stat.st_size))
+        for _, key, path, size in sorted(entries):
+            self._index[key] = (path, size)
+            self._total_bytes += size
+        if entries:
+            logger.info(f"Synthesis cache: {len(entries)} artifacts, {self._total_bytes / (1024 * 1024):.1f}MB")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached artifact and record a hit or miss.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Path to the cached artifact or None
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is not None and not entry[0].exists():
+                self._index.pop(key)
+                self._total_bytes -= entry[1]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+        # Persist recency across restarts
+        try:
+            os.utime(entry[0])
+        except OSError:
+            pass
+        return str(entry[0])
+
+    def put(self, key: str, source_path: str) -> Optional[str]:
+        """
+        Store a copy of an artifact under ``key``.
+
+        The artifact is hard-linked when possible (copied otherwise) into a
+        temporary file and atomically renamed into place.
+
+        Args:
+            key: Key from make_key
+            source_path: Artifact to store
+
+        Returns:
+            Path to the cached artifact, or None if the cache is disabled or the write failed
+        """
+        if not self.enabled:
+            return None
+        try:
+            target = self._path_for(key, Path(source_path).suffix)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".tmp_")
+            os.close(fd)
+            tmp_path = Path(tmp_name)
+            try:
+                tmp_path.unlink()
+                os.link(source_path, tmp_path)
+            except OSError:
+                shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, target)
+            return self._register(key, target)
+        except Exception as e:
+            logger.error(f"Error writing synthesis cache entry: {str(e)}")
+            return None
+
+    def put_bytes(self, key: str, data: bytes, suffix: str) -> Optional[str]:
+        """
+        Store in-memory audio under ``key`` with an atomic write.
+
+        Args:
+            key: Key from make_key
+            data: Encoded audio
+            suffix: File extension including the dot (e.g. '.wav')
+
+        Returns:
+            Path to the cached artifact, or None if the cache is disabled or the write failed
+        """
+        if not self.enabled:
+            return None
+        try:
+            target = self._path_for(key, suffix)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".tmp_")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, target)
+            return self._register(key, target)
+        except Exception as e:
+            logger.error(f"Error writing synthesis cache entry: {str(e)}")
+            return None
+
+    def _path_for(self, key: str, suffix: str) -> Path:
+        """Sharded location of an artifact."""
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+    def _register(self, key: str, path: Path) -> str:
+        """Add an artifact to the index and enforce the disk budget."""
+        size = path.stat().st_size
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+                if previous[0] != path:
+                    previous[0].unlink(missing_ok=True)
+            self._index[key] = (path, size)
+            self._total_bytes += size
+            self._evict()
+        return str(path)
+
+    def _evict(self) -> None:
+        """Drop least recently used artifacts until within budget (caller holds the lock)."""
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            key, (path, size) = self._index.popitem(last=False)
+            path.unlink(missing_ok=True)
+            self._total_bytes -= size
+            logger.debug(f"Evicted synthesis cache entry: {key[:12]}")
+
+    def clear(self) -> None:
+        """Delete every cached artifact and reset counters."""
+        with self._lock:
+            for path, _ in self._index.values():
+                path.unlink(missing_ok=True)
+            self._index.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and disk usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
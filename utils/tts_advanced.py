@@ -2,13 +2,36 @@
 Advanced TTS functionality using Coqui TTS.
 """
 import logging
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from TTS.api import TTS
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import soundfile as sf
 from models.schemas import AdvancedTTSRequest, TTSResponse
+from utils.effects_chain import EffectsChain
+from utils.inference_scheduler import InferenceScheduler
+from utils.model_registry import ModelRegistry
+from utils.onnx_backend import ONNX_PREFIX, SENTENCE_SILENCE_SAMPLES, SUPPORTED_MODELS as ONNX_MODELS
+from utils.output_store import OutputStore
+from utils.synthesis_cache import SynthesisCache
+from utils.streaming import AudioChunk, stream_synthesis
+
+if TYPE_CHECKING:
+    # Imports torch; the registry loads it on first model use
+    from TTS.api import TTS
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _TextJob:
+    """Text to speak at a given speed, as queued on the model's scheduler."""
+    
+    text: str
+    speed: float = 1.0
+
+
 class AdvancedTTS:
     """Coqui TTS text-to-speech converter."""
     
@@ -30,20 +53,67 @@ class AdvancedTTS:
         },
     }
     
-    def __init__(self, output_dir: str = "outputs"):
-        """Initialize AdvancedTTS with output directory."""
+    DEFAULT_MODEL = "tts_models/en/ljspeech/tacotron2-DDC"
+    MULTILINGUAL_MODEL = "tts_models/multilingual/multi-dataset/your_tts"
+    
+    # Models with a duration predictor whose length_scale sets the speaking rate
+    SPEED_MODELS = {
+        "tts_models/en/ljspeech/glow-tts",
+        "tts_models/multilingual/multi-dataset/your_tts",
+    }
+    
+    # Most sentences per padded Glow-TTS forward pass
+    BATCH_SIZE = 8
+    
+    def __init__(
+        self,
+        output_dir: str = "outputs",
+        registry: Optional[ModelRegistry] = None,
+        synthesis_cache: Optional[SynthesisCache] = None,
+        output_chain: Optional[EffectsChain] = None,
+        output_store: Optional[OutputStore] = None
+    ):
+        """
+        Initialize AdvancedTTS with output directory.
+        
+        Args:
+            output_dir: Directory for generated audio
+            registry: Model registry to borrow models from (defaults to the process-wide one)
+            synthesis_cache: Cache of previous outputs (defaults to the process-wide one)
+            output_chain: Post-processing applied to every output in one pass (Coqui's WAV if None)
+            output_store: Store that names and garbage-collects outputs (defaults to the one for output_dir)
+        """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self._tts = None
+        self.registry = registry or ModelRegistry.shared()
+        self.synthesis_cache = synthesis_cache or SynthesisCache.shared()
+        self.output_chain = output_chain
+        self.output_store = output_store or OutputStore.for_directory(output_dir)
     
     @property
-    def tts(self) -> TTS:
-        """Lazy loading of TTS model."""
-        if self._tts is None:
-            logger.info("Loading Coqui TTS model...")
-            self._tts = TTS(model_name="tts_models/en/ljspeech/tacotron2-DDC", progress_bar=True)
-            logger.info("Model loaded successfully")
-        return self._tts
+    def tts(self) -> "TTS":
+        """Default model from the shared registry (not held here, so the registry can unload it when idle)."""
+        return self.registry.get(self.DEFAULT_MODEL)
+    
+    def get_sample_rate(self, model_name: str) -> int:
+        """Output sample rate of ``model_name`` (loads the model if needed)."""
+        return self.registry.get(model_name).synthesizer.output_sample_rate
+    
+    @staticmethod
+    def supports_backend(model_name: str, backend: str) -> bool:
+        """Whether ``model_name`` can run on ``backend`` ("torch" or "onnx")."""
+        return backend == "torch" or (backend == "onnx" and model_name in ONNX_MODELS)
+    
+    @classmethod
+    def supports_speed(cls, model_name: str) -> bool:
+        """Whether ``model_name`` applies AdvancedTTSRequest.speed (other models ignore it)."""
+        return model_name in cls.SPEED_MODELS
+    
+    def _registry_name(self, model_name: str, backend: str = "torch") -> str:
+        """Registry name of ``model_name`` on ``backend`` (ONNX models are served as "onnx:<name>")."""
+        if not self.supports_backend(model_name, backend):
+            raise ValueError(f"{model_name} has no {backend} backend")
+        return ONNX_PREFIX + model_name if backend == "onnx" else model_name
     
     def convert(self, request: AdvancedTTSRequest) -> TTSResponse:
         """
@@ -58,19 +128,21 @@ class AdvancedTTS:
         try:
             logger.info(f"Converting text with advanced TTS: {len(request.text)} characters")
             
-            # Generate filename
-            output_file = self.output_dir / f"advanced_tts_{self._generate_timestamp()}.wav"
-            
-            # Load model if different from current
-            if self._tts is None or getattr(self._tts, 'model_name', None) != request.model_name:
-                logger.info(f"Loading model: {request.model_name}")
-                self._tts = TTS(model_name=request.model_name, progress_bar=True)
+            # Reuse an identical earlier synthesis
+            cache_key = self._cache_key(
+                request.model_name, request.text, speed=self._effective_speed(request),
+                effects=self._effects_key(), backend=request.backend
+            )
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return cached
             
-            # Generate speech
-            self.tts.tts_to_file(
-                text=request.text,
-                file_path=str(output_file)
+            # Run on the requested model and runtime (loaded once per process)
+            model_name = self._registry_name(request.model_name, request.backend)
+            output_file = self._synthesize_text_to_file(
+                model_name, "advanced_tts", request.text, self._effective_speed(request)
             )
+            self.synthesis_cache.put(cache_key, str(output_file))
             
             logger.info(f"Audio saved to: {output_file}")
             
@@ -80,6 +152,11 @@ class AdvancedTTS:
                 file_path=str(output_file)
             )
             
+        except ValueError as e:
+            # Model without the requested backend
+            return TTSResponse(
+                success=False, message="Failed to convert text to speech", error=str(e), error_type="invalid_request"
+            )
         except Exception as e:
             logger.error(f"Error in advanced TTS: {str(e)}")
             return TTSResponse(
@@ -88,6 +165,120 @@ class AdvancedTTS:
                 error=str(e)
             )
     
+    def convert_batch(self, requests: List[AdvancedTTSRequest]) -> List[TTSResponse]:
+        """
+        Convert many requests, borrowing each model once per group.
+        
+        Requests are grouped by model so model setup is paid once per group
+        rather than once per item.
+        
+        Args:
+            requests: AdvancedTTSRequests to convert
+            
+        Returns:
+            TTSResponse per request, in input order, with per-item timings
+        """
+        batch_start = time.perf_counter()
+        responses: List[Optional[TTSResponse]] = [None] * len(requests)
+        
+        groups: Dict[str, List[int]] = {}
+        cache_keys: Dict[int, str] = {}
+        for index, request in enumerate(requests):
+            cache_keys[index] = self._cache_key(
+                request.model_name, request.text, speed=self._effective_speed(request),
+                effects=self._effects_key(), backend=request.backend
+            )
+            cached = self._cached_response(cache_keys[index])
+            if cached is not None:
+                responses[index] = cached
+                continue
+            try:
+                model_key = self._registry_name(request.model_name, request.backend)
+            except ValueError as e:
+                responses[index] = TTSResponse(success=False, message="Failed to convert text to speech", error=str(e))
+                continue
+            groups.setdefault(model_key, []).append(index)
+        
+        for model_name, indices in groups.items():
+            try:
+                setup_start = time.perf_counter()
+                tts = self.registry.get(model_name)
+                sample_rate = tts.synthesizer.output_sample_rate
+                setup_time = (time.perf_counter() - setup_start) / len(indices)
+            except Exception as e:
+                logger.error(f"Error loading {model_name} for batch: {str(e)}")
+                for index in indices:
+                    responses[index] = TTSResponse(
+                        success=False, message="Failed to convert text to speech", error=str(e)
+                    )
+                continue
+            
+            # Keep the model resident for the whole group; its texts are queued together so they batch
+            scheduler = InferenceScheduler.for_model(model_name, self.registry)
+            with self.registry.borrow(model_name):
+                futures = scheduler.submit_many(
+                    [_TextJob(requests[index].text, self._effective_speed(requests[index])) for index in indices],
+                    self._synthesize_jobs
+                )
+                synth_start = time.perf_counter()
+                for index, future in zip(indices, futures):
+                    try:
+                        # Time spent waiting for this item, so the group's items add up to its wall time
+                        wav = future.result()
+                        synth_time = time.perf_counter() - synth_start
+                        
+                        write_start = time.perf_counter()
+                        output_file = self._write_output(wav, sample_rate, "advanced_tts")
+                        self.synthesis_cache.put(cache_keys[index], str(output_file))
+                        
+                        responses[index] = TTSResponse(
+                            success=True,
+                            message="Text converted to speech successfully",
+                            file_path=str(output_file),
+                            timings={
+                                "setup": round(setup_time, 4),
+                                "synthesis": round(synth_time, 4),
+                                "write": round(time.perf_counter() - write_start, 4),
+                            }
+                        )
+                    except Exception as e:
+                        logger.error(f"Error in advanced TTS batch item {index}: {str(e)}")
+                        responses[index] = TTSResponse(
+                            success=False, message="Failed to convert text to speech", error=str(e)
+                        )
+                    synth_start = time.perf_counter()
+        
+        logger.info(f"Converted batch of {len(requests)} requests in {time.perf_counter() - batch_start:.2f}s")
+        return responses
+    
+    def convert_stream(
+        self,
+        request: AdvancedTTSRequest,
+        output_path: Optional[str] = None
+    ) -> Iterator[AudioChunk]:
+        """
+        Convert text sentence by sentence, yielding audio as each sentence is ready.
+        
+        Args:
+            request: AdvancedTTSRequest with text and model options
+            output_path: If given, the full WAV is assembled here as chunks arrive
+            
+        Yields:
+            AudioChunk with float32 PCM and its sample rate
+        """
+        logger.info(f"Streaming advanced TTS: {len(request.text)} characters")
+        model_name = self._registry_name(request.model_name, request.backend)
+        scheduler = InferenceScheduler.for_model(model_name, self.registry)
+        speed = self._effective_speed(request)
+        # Borrowed until the last chunk, so a slow consumer cannot lose the model mid-stream
+        with self.registry.borrow(model_name) as tts:
+            yield from stream_synthesis(
+                request.text,
+                lambda sentence: scheduler.run(_TextJob(sentence, speed), self._synthesize_jobs),
+                tts.synthesizer.output_sample_rate,
+                output_path=output_path
+            )
+    
     def convert_multilingual(self, text: str, language: str = "en") -> TTSResponse:
         """
         Convert text to speech using multilingual model.
@@ -102,21 +293,17 @@ class AdvancedTTS:
         try:
             logger.info(f"Converting multilingual text: {len(text)} characters in {language}")
             
-            # Generate filename
-            output_file = self.output_dir / f"multilingual_tts_{self._generate_timestamp()}.wav"
+            # Reuse an identical earlier synthesis
+            cache_key = self._cache_key(self.MULTILINGUAL_MODEL, text, language=language, effects=self._effects_key())
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return cached
             
-            # Load multilingual model
-            model_name = "tts_models/multilingual/multi-dataset/your_tts"
-            if self._tts is None or getattr(self._tts, 'model_name', None) != model_name:
-                logger.info(f"Loading multilingual model: {model_name}")
-                self._tts = TTS(model_name=model_name, progress_bar=True)
-            
-            # Generate speech
-            self.tts.tts_to_file(
-                text=text,
-                file_path=str(output_file),
-                language=language
+            # Run on the multilingual model (loaded once per process)
+            output_file = self._synthesize_to_file(
+                self.MULTILINGUAL_MODEL, "multilingual_tts", text=text, language=language
             )
+            self.synthesis_cache.put(cache_key, str(output_file))
             
             logger.info(f"Audio saved to: {output_file}")
             
@@ -135,10 +322,235 @@ class AdvancedTTS:
             )
     
     @staticmethod
-    def _generate_timestamp() -> str:
-        """Generate unique timestamp for filename."""
-        from datetime import datetime
-        return datetime.now().strftime("%Y%m%d_%H%M%S")
+    def _cache_key(
+        model_name: str,
+        text: str,
+        language: Optional[str] = None,
+        speed: float = 1.0,
+        effects: Optional[str] = None,
+        backend: str = "torch"
+    ) -> str:
+        """Synthesis cache key for a request."""
+        fields = dict(engine="coqui", model=model_name, text=text, language=language, speed=speed)
+        if effects is not None:
+            # Only present with an output chain, so plain keys are unchanged
+            fields["effects"] = effects
+        if backend != "torch":
+            fields["backend"] = backend
+        return SynthesisCache.make_key(**fields)
+    
+    def _effects_key(self) -> Optional[str]:
+        """Cache key field for the output chain."""
+        return self.output_chain.key if self.output_chain is not None else None
+    
+    def _effective_speed(self, request: AdvancedTTSRequest) -> float:
+        """Speed the request is synthesized at (1.0 on models without a duration predictor)."""
+        return request.speed if self.supports_speed(request.model_name) else 1.0
+    
+    @staticmethod
+    def _at_speed(tts, speed: float, synthesize: Callable[[], Any]) -> Any:
+        """
+        Call ``synthesize()`` with the speaking rate of ``tts`` scaled by ``speed``.
+        
+        Glow-TTS and VITS stretch predicted durations by ``length_scale``, so
+        it is divided by ``speed`` for this one call. Must run on the model's
+        scheduler worker, the only user of the model, so the change is never
+        seen by another request.
+        """
+        # The ONNX runtime feeds its own length_scale to the acoustic graph
+        owner = tts if hasattr(tts, "length_scale") else getattr(tts.synthesizer, "tts_model", None)
+        if speed == 1.0 or not hasattr(owner, "length_scale"):
+            return synthesize()
+        length_scale = owner.length_scale
+        owner.length_scale = length_scale / speed
+        try:
+            return synthesize()
+        finally:
+            owner.length_scale = length_scale
+    
+    def _synthesize_to_file(self, model_name: str, prefix: str, **kwargs) -> Path:
+        """
+        Synthesize into a new file in the output store.
+        
+        Synthesis runs on the model's scheduler, one request at a time.
+        Without an output chain Coqui writes its own WAV; with one, the
+        waveform goes through the chain in a single pass.
+        
+        Args:
+            model_name: Registry name of the model to synthesize with
+            prefix: File name prefix
+            **kwargs: Arguments for tts.tts (text, language, ...)
+            
+        Returns:
+            Path of the written file
+        """
+        scheduler = InferenceScheduler.for_model(model_name, self.registry)
+        if self.output_chain is None:
+            with self.output_store.reserve(prefix, ".wav") as output_file:
+                scheduler.run(lambda tts: tts.tts_to_file(file_path=str(output_file), **kwargs))
+            return output_file
+        wav, sample_rate = scheduler.run(
+            lambda tts: (np.asarray(tts.tts(**kwargs), dtype=np.float32), tts.synthesizer.output_sample_rate)
+        )
+        return self._write_output(wav, sample_rate, prefix)
+    
+    def _synthesize_text_to_file(self, model_name: str, prefix: str, text: str, speed: float = 1.0) -> Path:
+        """
+        Synthesize text on a single-speaker model into a new file in the output store.
+        
+        The text is queued as a batchable job, so its sentences share forward
+        passes with concurrent requests on the same model.
+        
+        Args:
+            model_name: Registry name of the model to synthesize with
+            prefix: File name prefix
+            text: Text to speak
+            speed: Speaking rate, applied through ``length_scale`` where the model has one
+            
+        Returns:
+            Path of the written file
+        """
+        scheduler = InferenceScheduler.for_model(model_name, self.registry)
+        with self.registry.borrow(model_name) as tts:
+            wav = scheduler.run(_TextJob(text, speed), self._synthesize_jobs)
+            sample_rate = tts.synthesizer.output_sample_rate
+        if self.output_chain is None and wav.size:
+            # Same peak scaling as Coqui's tts_to_file
+            wav = wav / max(0.01, float(np.max(np.abs(wav))))
+        return self._write_output(wav, sample_rate, prefix)
+    
+    @classmethod
+    def _synthesize_jobs(cls, tts: "TTS", jobs: List[_TextJob]) -> List[np.ndarray]:
+        """
+        Batch function for the scheduler: synthesize texts from any number of requests.
+        
+        On Glow-TTS the sentences of all jobs run in padded batches, one
+        batch per speed. Other models (Tacotron2, the ONNX runtime) have no
+        batched path and synthesize the jobs one after another. A
+        classmethod, so jobs from every engine instance share batches.
+        
+        Args:
+            tts: Model (borrowed by the scheduler)
+            jobs: Texts with their speed
+            
+        Returns:
+            Float32 waveform per job, in input order, as ``tts.tts`` returns it
+        """
+        if not cls._supports_batch_inference(tts):
+            return [
+                cls._at_speed(tts, job.speed, lambda: np.asarray(tts.tts(text=job.text), dtype=np.float32))
+                for job in jobs
+            ]
+        
+        sentences = [tts.synthesizer.split_into_sentences(job.text) for job in jobs]
+        by_speed: Dict[float, List[Tuple[int, int]]] = {}
+        for job_index, job in enumerate(jobs):
+            for sentence_index in range(len(sentences[job_index])):
+                by_speed.setdefault(job.speed, []).append((job_index, sentence_index))
+        
+        wavs: Dict[Tuple[int, int], np.ndarray] = {}
+        for speed, keys in by_speed.items():
+            texts = [sentences[j][s] for j, s in keys]
+            wavs.update(zip(keys, cls._at_speed(tts, speed, lambda: cls._infer_batched(tts, texts))))
+        
+        # Every sentence is followed by silence, as in Coqui's Synthesizer
+        silence = np.zeros(SENTENCE_SILENCE_SAMPLES, dtype=np.float32)
+        results = []
+        for job_index in range(len(jobs)):
+            pieces = []
+            for sentence_index in range(len(sentences[job_index])):
+                pieces += [wavs[(job_index, sentence_index)], silence]
+            results.append(np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32))
+        return results
+    
+    @staticmethod
+    def _supports_batch_inference(tts) -> bool:
+        """Whether a model can run padded multi-sentence batches (PyTorch Glow-TTS with a same-rate vocoder)."""
+        synthesizer = tts.synthesizer
+        model = getattr(synthesizer, "tts_model", None)
+        return (
+            type(model).__name__ == "GlowTTS"
+            and synthesizer.vocoder_model is not None
+            and synthesizer.vocoder_config.audio["sample_rate"] == model.ap.sample_rate
+        )
+    
+    @classmethod
+    def _infer_batched(cls, tts: "TTS", sentences: List[str]) -> List[np.ndarray]:
+        """Run Glow-TTS and its vocoder on length-sorted, padded batches of sentences."""
+        import torch
+        
+        synthesizer = tts.synthesizer
+        model = synthesizer.tts_model
+        vocoder = synthesizer.vocoder_model
+        device = next(model.parameters()).device
+        hop_length = synthesizer.vocoder_ap.hop_length
+        trim_silence = bool(synthesizer.tts_config.audio.get("do_trim_silence", False))
+        
+        token_ids = [torch.as_tensor(model.tokenizer.text_to_ids(sentence), dtype=torch.long) for sentence in sentences]
+        order = sorted(range(len(sentences)), key=lambda i: len(token_ids[i]))
+        
+        wavs: List[Optional[np.ndarray]] = [None] * len(sentences)
+        for start in range(0, len(order), cls.BATCH_SIZE):
+            chunk = order[start:start + cls.BATCH_SIZE]
+            lengths = [len(token_ids[i]) for i in chunk]
+            x = torch.zeros(len(chunk), max(lengths), dtype=torch.long, device=device)
+            for row, i in enumerate(chunk):
+                x[row, :lengths[row]] = token_ids[i]
+            
+            aux_input = {"x_lengths": torch.tensor(lengths, device=device), "speaker_ids": None, "d_vectors": None}
+            outputs = model.inference(x, aux_input=aux_input)
+            mels = outputs["model_outputs"].cpu().numpy()
+            # The alignment has one entry per frame, so its sum is the unpadded frame count
+            frames = outputs["alignments"].sum(dim=(1, 2)).round().long().cpu().numpy()
+            frames = np.minimum(frames, mels.shape[1])
+            
+            # Same mel hand-off as Coqui's Synthesizer, padded with each row's last frame
+            vocoder_input = np.empty((len(chunk), mels.shape[2], int(frames.max())), dtype=np.float32)
+            for row in range(len(chunk)):
+                mel = model.ap.denormalize(mels[row, :frames[row]].T).T
+                normalized = synthesizer.vocoder_ap.normalize(mel.T)
+                vocoder_input[row, :, :frames[row]] = normalized
+                vocoder_input[row, :, frames[row]:] = normalized[:, -1:]
+            waveforms = vocoder.inference(torch.as_tensor(vocoder_input, device=device)).squeeze(1).cpu().numpy()
+            
+            for row, i in enumerate(chunk):
+                wav = waveforms[row, :frames[row] * hop_length]
+                if trim_silence:
+                    wav = wav[:model.ap.find_endpoint(wav)]
+                wavs[i] = wav.astype(np.float32)
+        return wavs
+    
+    def _write_output(self, wav: np.ndarray, sample_rate: int, prefix: str) -> Path:
+        """
+        Write a waveform to a new file in the output store, through the output chain if set.
+        
+        Args:
+            wav: Float32 waveform
+            sample_rate: Sample rate of ``wav``
+            prefix: File name prefix
+            
+        Returns:
+            Path of the written file
+        """
+        suffix = f".{self.output_chain.format}" if self.output_chain is not None else ".wav"
+        with self.output_store.reserve(prefix, suffix) as output_file:
+            if self.output_chain is None:
+                sf.write(str(output_file), wav, sample_rate)
+            else:
+                self.output_chain.render(wav, sample_rate, str(output_file))
+        return output_file
+    
+    def _cached_response(self, cache_key: str) -> Optional[TTSResponse]:
+        """Response pointing at a cached artifact, if there is one."""
+        cached_file = self.synthesis_cache.get(cache_key)
+        if cached_file is None:
+            return None
+        logger.info(f"Synthesis cache hit: {cached_file}")
+        return TTSResponse(
+            success=True,
+            message="Text converted to speech successfully",
+            file_path=cached_file
+        )
     
     @classmethod
     def get_available_models(cls) -> dict:
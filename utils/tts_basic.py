@@ -1,11 +1,14 @@
 """
 Basic TTS functionality using Google gTTS.
 """
-import io
 import logging
 from pathlib import Path
+from typing import Optional
 from gtts import gTTS
 from models.schemas import BasicTTSRequest, TTSResponse
+from utils.output_store import OutputStore
+from utils.segment_fetcher import SegmentFetcher
+from utils.synthesis_cache import SynthesisCache
 
 logger = logging.getLogger(__name__)
 
@@ -31,10 +34,27 @@ class BasicTTS:
         'tr': 'Turkish',
     }
     
-    def __init__(self, output_dir: str = "outputs"):
-        """Initialize BasicTTS with output directory."""
+    def __init__(
+        self,
+        output_dir: str = "outputs",
+        synthesis_cache: Optional[SynthesisCache] = None,
+        output_store: Optional[OutputStore] = None,
+        fetcher: Optional[SegmentFetcher] = None
+    ):
+        """
+        Initialize BasicTTS with output directory.
+        
+        Args:
+            output_dir: Directory for generated audio
+            synthesis_cache: Cache of previous outputs (defaults to the process-wide one)
+            output_store: Store that names and garbage-collects outputs (defaults to the one for output_dir)
+            fetcher: Parallel segment fetcher (defaults to the process-wide one)
+        """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.synthesis_cache = synthesis_cache or SynthesisCache.shared()
+        self.output_store = output_store or OutputStore.for_directory(output_dir)
+        self.fetcher = fetcher or SegmentFetcher.shared()
     
     def convert(self, request: BasicTTSRequest) -> TTSResponse:
         """
@@ -49,6 +69,17 @@ class BasicTTS:
         try:
             logger.info(f"Converting text to speech: {len(request.text)} characters")
             
+            # Reuse an identical earlier synthesis
+            cache_key = self._cache_key(request)
+            cached_file = self.synthesis_cache.get(cache_key)
+            if cached_file is not None:
+                logger.info(f"Synthesis cache hit: {cached_file}")
+                return TTSResponse(
+                    success=True,
+                    message="Text converted to speech successfully",
+                    file_path=cached_file
+                )
+            
             # Create gTTS object
             tts = gTTS(
                 text=request.text,
@@ -56,11 +87,11 @@ class BasicTTS:
                 slow=request.slow
             )
             
-            # Generate filename
-            output_file = self.output_dir / f"basic_tts_{self._generate_timestamp()}.mp3"
-            
-            # Save to file
-            tts.save(str(output_file))
+            # Fetch all segments concurrently, then save them in order to a unique file
+            audio = self.fetcher.fetch(tts)
+            with self.output_store.reserve("basic_tts", ".mp3") as output_file:
+                output_file.write_bytes(audio)
+            self.synthesis_cache.put(cache_key, str(output_file))
             
             logger.info(f"Audio saved to: {output_file}")
             
@@ -95,22 +126,23 @@ class BasicTTS:
                 slow=request.slow
             )
             
-            # Save to bytes buffer
-            buffer = io.BytesIO()
-            tts.write_to_fp(buffer)
-            buffer.seek(0)
-            
-            return buffer.getvalue()
+            # Fetch all segments concurrently and join them in order
+            return self.fetcher.fetch(tts)
             
         except Exception as e:
             logger.error(f"Error converting to bytes: {str(e)}")
             raise
     
     @staticmethod
-    def _generate_timestamp() -> str:
-        """Generate unique timestamp for filename."""
-        from datetime import datetime
-        return datetime.now().strftime("%Y%m%d_%H%M%S")
+    def _cache_key(request: BasicTTSRequest) -> str:
+        """Synthesis cache key for a request."""
+        return SynthesisCache.make_key(
+            engine="gtts",
+            model="gtts",
+            text=request.text,
+            language=request.language,
+            speed="slow" if request.slow else "normal"
+        )
     
     @classmethod
     def get_supported_languages(cls) -> dict:
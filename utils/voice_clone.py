@@ -1,19 +1,59 @@
 """
 Voice cloning functionality using Coqui TTS.
 """
+import io
 import logging
+import time
+from dataclasses import dataclass
 import numpy as np
 import soundfile as sf
 from pathlib import Path
-from TTS.api import TTS
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, List, Optional, Union
 from models.schemas import VoiceCloneRequest, TTSResponse
+from utils.audio_probe import AudioProbe
+from utils.audio_utils import AudioUtils
+from utils.effects_chain import EffectsChain
+from utils.embedding_cache import SpeakerEmbeddingCache
+from utils.inference_scheduler import InferenceScheduler
+from utils.output_store import OutputStore
+from utils.model_registry import ModelRegistry
+from utils.resampler import resample
+from utils.streaming import AudioChunk, stream_synthesis
+from utils.synthesis_cache import SynthesisCache
+from utils.voice_library import VoiceLibrary, VoiceNotFoundError
+
+if TYPE_CHECKING:
+    # Imports torch; the registry loads it on first model use
+    from TTS.api import TTS
 
 logger = logging.getLogger(__name__)
 
+# Encoded reference audio held in memory (e.g. an upload buffer)
+AudioBuffer = Union[bytes, bytearray, memoryview]
+
+
+@dataclass
+class _SentenceJob:
+    """One sentence to speak in a given voice, as queued on the model's scheduler."""
+    
+    sentence: str
+    speaker_embedding: np.ndarray
+    language_id: Optional[int]
+    # Sentences per forward pass asked for by the caller (None for BATCH_SIZE)
+    batch_size: Optional[int] = None
+
 
 class VoiceClone:
     """Voice cloning using Coqui TTS."""
     
+    MODEL_NAME = "tts_models/multilingual/multi-dataset/your_tts"
+    
+    # Silence inserted between sentences, matching Coqui's Synthesizer
+    SENTENCE_PAUSE_SAMPLES = 10000
+    
+    # Sentences per forward pass in batched inference
+    BATCH_SIZE = 8
+    
     SUPPORTED_LANGUAGES = {
         'en': 'English',
         'es': 'Spanish',
@@ -27,64 +67,132 @@ class VoiceClone:
         'zh': 'Chinese',
     }
     
-    def __init__(self, output_dir: str = "outputs", temp_dir: str = "temp"):
-        """Initialize VoiceClone with output and temp directories."""
+    def __init__(
+        self,
+        output_dir: str = "outputs",
+        temp_dir: str = "temp",
+        registry: Optional[ModelRegistry] = None,
+        embedding_cache: Optional[SpeakerEmbeddingCache] = None,
+        voice_library: Optional[VoiceLibrary] = None,
+        synthesis_cache: Optional[SynthesisCache] = None,
+        output_chain: Optional[EffectsChain] = None,
+        output_store: Optional[OutputStore] = None
+    ):
+        """
+        Initialize VoiceClone with output and temp directories.
+        
+        Args:
+            output_dir: Directory for generated audio
+            temp_dir: Directory for intermediate files
+            registry: Model registry to borrow the model from (defaults to the process-wide one)
+            embedding_cache: Speaker embedding cache (defaults to the process-wide one)
+            voice_library: Library of enrolled voices (defaults to the process-wide one)
+            synthesis_cache: Cache of previous outputs (defaults to the process-wide one)
+            output_chain: Post-processing applied to every output in one pass (plain WAV if None)
+            output_store: Store that names and garbage-collects outputs (defaults to the one for
+                output_dir, which also clears stale files from temp_dir)
+        """
         self.output_dir = Path(output_dir)
         self.temp_dir = Path(temp_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
-        self._tts = None
+        self.registry = registry or ModelRegistry.shared()
+        self.embedding_cache = embedding_cache or SpeakerEmbeddingCache.shared()
+        self._voice_library = voice_library
+        self.synthesis_cache = synthesis_cache or SynthesisCache.shared()
+        self.output_chain = output_chain
+        self.output_store = output_store or OutputStore.for_directory(output_dir, temp_dir=temp_dir)
     
     @property
-    def tts(self) -> TTS:
-        """Lazy loading of TTS model."""
-        if self._tts is None:
-            logger.info("Loading voice cloning model...")
-            self._tts = TTS(
-                model_name="tts_models/multilingual/multi-dataset/your_tts",
-                progress_bar=True
-            )
-            logger.info("Voice cloning model loaded successfully")
-        return self._tts
+    def tts(self) -> "TTS":
+        """Cloning model from the shared registry (not held here, so the registry can unload it when idle)."""
+        return self.registry.get(self.MODEL_NAME)
+    
+    @property
+    def voice_library(self) -> VoiceLibrary:
+        """Library of enrolled voices, opened on first use."""
+        if self._voice_library is None:
+            self._voice_library = VoiceLibrary.shared()
+        return self._voice_library
+    
+    @property
+    def sample_rate(self) -> int:
+        """Output sample rate of the cloning model."""
+        return self.tts.synthesizer.output_sample_rate
     
     def clone_voice(
         self,
         request: VoiceCloneRequest,
-        reference_audio_path: str
+        reference_audio_path: Optional[str] = None,
+        voice_id: Optional[str] = None,
+        reference_audio: Optional[AudioBuffer] = None,
+        persist: bool = True
     ) -> TTSResponse:
         """
         Clone voice from reference audio and speak given text.
         
+        The speaker embedding is cached by reference content hash, so repeat
+        requests for the same voice skip preprocessing and the speaker encoder.
+        Enrolled voices can be used by ID instead of a reference file, and
+        uploads can be passed as an in-memory buffer.
+        
         Args:
             request: VoiceCloneRequest with text and language
             reference_audio_path: Path to reference audio file
+            voice_id: ID of a voice enrolled in the voice library
+            reference_audio: Encoded reference audio in memory
+            persist: Write the result to output_dir and the synthesis cache; otherwise
+                return the encoded bytes in audio_data without touching disk
             
         Returns:
-            TTSResponse with audio file path
+            TTSResponse with the audio file path or in-memory WAV
         """
         try:
             logger.info(f"Cloning voice: {len(request.text)} characters")
             
-            # Process reference audio
-            processed_audio_path = self._process_reference_audio(reference_audio_path)
+            # Reuse an identical earlier synthesis for the same speaker (the cache is on disk,
+            # so in-memory requests neither read nor write it)
+            speaker_key = self._speaker_key(reference_audio_path, voice_id, reference_audio)
+            cache_key = self._cache_key(request, speaker_key)
+            cached_file = self.synthesis_cache.get(cache_key) if persist else None
+            if cached_file is not None:
+                logger.info(f"Synthesis cache hit: {cached_file}")
+                return TTSResponse(
+                    success=True,
+                    message="Voice cloned successfully",
+                    file_path=cached_file
+                )
+            
+            # Get speaker embedding (enrolled or cached per reference content)
+            speaker_embedding = self.resolve_speaker_embedding(
+                reference_audio_path, voice_id, speaker_key, reference_audio
+            )
             
-            if processed_audio_path is None:
+            if speaker_embedding is None:
                 return TTSResponse(
                     success=False,
                     message="Failed to process reference audio",
-                    error="Could not process the audio file. Please ensure it's a valid audio file (5-10 seconds)."
+                    error="Could not process the audio file. Please ensure it's a valid audio file (5-10 seconds).",
+                    error_type="unprocessable"
                 )
             
-            # Generate filename
-            output_file = self.output_dir / f"cloned_voice_{self._generate_timestamp()}.wav"
-            
             # Generate cloned voice
-            self.tts.tts_to_file(
-                text=request.text,
-                speaker_wav=str(processed_audio_path),
-                file_path=str(output_file),
-                language=request.language
-            )
+            wav = self.synthesize(request.text, speaker_embedding, request.language)
+            
+            if not persist:
+                if self.output_chain is None:
+                    audio_data = AudioUtils.encode(wav, self.sample_rate, "wav")
+                else:
+                    audio_data = self.output_chain.render(wav, self.sample_rate)
+                return TTSResponse(
+                    success=True,
+                    message="Voice cloned successfully",
+                    audio_data=audio_data
+                )
+            
+            # Generate filename
+            output_file = self._write_output(wav, "cloned_voice")
+            self.synthesis_cache.put(cache_key, str(output_file))
             
             logger.info(f"Cloned voice saved to: {output_file}")
             
@@ -94,6 +202,13 @@ class VoiceClone:
                 file_path=str(output_file)
             )
             
+        except VoiceNotFoundError as e:
+            return TTSResponse(success=False, message="Failed to clone voice", error=str(e), error_type="not_found")
+        except ValueError as e:
+            # Missing reference or unsupported language
+            return TTSResponse(
+                success=False, message="Failed to clone voice", error=str(e), error_type="invalid_request"
+            )
         except Exception as e:
             logger.error(f"Error in voice cloning: {str(e)}")
             return TTSResponse(
@@ -102,58 +217,529 @@ class VoiceClone:
                 error=str(e)
             )
     
-    def _process_reference_audio(self, audio_path: str) -> Path:
+    def clone_voice_stream(
+        self,
+        request: VoiceCloneRequest,
+        reference_audio_path: Optional[str] = None,
+        voice_id: Optional[str] = None,
+        output_path: Optional[Union[str, BinaryIO]] = None,
+        reference_audio: Optional[AudioBuffer] = None
+    ) -> Iterator[AudioChunk]:
+        """
+        Clone voice sentence by sentence, yielding audio as each sentence is ready.
+        
+        Args:
+            request: VoiceCloneRequest with text and language
+            reference_audio_path: Path to reference audio file
+            voice_id: ID of a voice enrolled in the voice library
+            output_path: If given, the full WAV is assembled here (a path or a writable buffer)
+            reference_audio: Encoded reference audio in memory
+            
+        Yields:
+            AudioChunk with float32 PCM and its sample rate
+        """
+        speaker_embedding = self.resolve_speaker_embedding(
+            reference_audio_path, voice_id, reference_audio=reference_audio
+        )
+        if speaker_embedding is None:
+            raise ValueError("Could not process the reference audio file")
+        
+        logger.info(f"Streaming cloned voice: {len(request.text)} characters")
+        yield from stream_synthesis(
+            request.text,
+            lambda sentence: self.synthesize(sentence, speaker_embedding, request.language),
+            self.sample_rate,
+            output_path=output_path,
+            pause_samples=self.SENTENCE_PAUSE_SAMPLES
+        )
+    
+    def resolve_speaker_embedding(
+        self,
+        reference_audio_path: Optional[str] = None,
+        voice_id: Optional[str] = None,
+        audio_hash: Optional[str] = None,
+        reference_audio: Optional[AudioBuffer] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Get the speaker embedding from an enrolled voice ID or reference audio.
+        
+        Args:
+            reference_audio_path: Path to reference audio file
+            voice_id: ID of a voice enrolled in the voice library
+            audio_hash: Precomputed content hash of the reference audio
+            reference_audio: Encoded reference audio in memory (used instead of the path)
+            
+        Returns:
+            Speaker embedding, or None if the reference could not be processed
+        """
+        if voice_id is not None:
+            embedding = self.voice_library.get_embedding(voice_id)
+            if embedding is None:
+                raise VoiceNotFoundError(f"Voice '{voice_id}' is not enrolled")
+            return embedding
+        if reference_audio is not None:
+            return self.get_speaker_embedding(reference_audio, audio_hash)
+        if reference_audio_path is None:
+            raise ValueError("Either reference_audio_path or voice_id is required")
+        return self.get_speaker_embedding(reference_audio_path, audio_hash)
+    
+    def get_speaker_embedding(
+        self,
+        reference_audio: Union[str, AudioBuffer],
+        audio_hash: Optional[str] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Get the speaker embedding for reference audio.
+        
+        Args:
+            reference_audio: Path to reference audio file or encoded audio in memory
+            audio_hash: Precomputed content hash of the audio
+            
+        Returns:
+            Speaker embedding, or None if the reference could not be processed
+        """
+        if audio_hash is None:
+            if isinstance(reference_audio, (bytes, bytearray, memoryview)):
+                audio_hash = self.embedding_cache.hash_bytes(reference_audio)
+            else:
+                audio_hash = self.embedding_cache.hash_file(reference_audio)
+        embedding = self.embedding_cache.get(audio_hash)
+        if embedding is not None:
+            logger.info(f"Speaker embedding cache hit: {audio_hash[:12]}")
+            return embedding
+        
+        speaker_manager = self.tts.synthesizer.tts_model.speaker_manager
+        audio = self._process_reference_audio(reference_audio, speaker_manager.encoder_ap.sample_rate)
+        if audio is None:
+            return None
+        
+        embedding = self._compute_embedding(audio)
+        logger.info(f"Speaker embedding computed: {audio_hash[:12]}")
+        return self.embedding_cache.put(audio_hash, embedding)
+    
+    def _compute_embedding(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Run the speaker encoder on a waveform already at the encoder sample rate.
+        
+        Mirrors SpeakerManager.compute_embedding_from_clip without reading a file.
+        
+        Args:
+            audio: Mono float32 waveform
+            
+        Returns:
+            1-D speaker embedding
+        """
+        import torch
+        
+        with self.registry.borrow(self.MODEL_NAME) as tts:
+            speaker_manager = tts.synthesizer.tts_model.speaker_manager
+            encoder_ap = speaker_manager.encoder_ap
+            if encoder_ap.do_trim_silence:
+                try:
+                    audio = encoder_ap.trim_silence(audio)
+                except ValueError:
+                    logger.warning("Reference audio cannot be trimmed for silence")
+            if encoder_ap.do_sound_norm:
+                audio = encoder_ap.sound_norm(audio)
+            if encoder_ap.do_rms_norm:
+                audio = encoder_ap.rms_volume_norm(audio, encoder_ap.db_level)
+            
+            if speaker_manager.encoder_config.model_params.get("use_torch_spec", False):
+                m_input = torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32))
+            else:
+                m_input = torch.from_numpy(encoder_ap.melspectrogram(audio))
+            if speaker_manager.use_cuda:
+                m_input = m_input.cuda()
+            
+            # The encoder forward pass runs on the model's worker, like synthesis
+            embedding = self._scheduler().run(
+                lambda model: speaker_manager.encoder.compute_embedding(m_input.unsqueeze(0))
+            )
+        return embedding[0].cpu().numpy()
+    
+    def synthesize(self, text: str, speaker_embedding: np.ndarray, language: str = "en") -> np.ndarray:
+        """
+        Synthesize text with a precomputed speaker embedding.
+        
+        Sentences are queued on the model's scheduler, which batches them
+        with sentences from concurrent requests.
+        
+        Args:
+            text: Text to speak
+            speaker_embedding: Embedding from get_speaker_embedding
+            language: Language code
+            
+        Returns:
+            Float32 waveform at ``sample_rate``
+        """
+        with self.registry.borrow(self.MODEL_NAME) as tts:
+            language_id = self._language_id(language)
+            jobs = [
+                _SentenceJob(sentence, speaker_embedding, language_id)
+                for sentence in tts.synthesizer.split_into_sentences(text)
+            ]
+            wavs = [future.result() for future in self._scheduler().submit_many(jobs, self._synthesize_jobs)]
+        
+        pieces = []
+        for wav in wavs:
+            if pieces:
+                pieces.append(np.zeros(self.SENTENCE_PAUSE_SAMPLES, dtype=np.float32))
+            pieces.append(wav)
+        
+        if not pieces:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(pieces)
+    
+    def synthesize_batch(
+        self,
+        texts: List[str],
+        speaker_embedding: np.ndarray,
+        language: str = "en",
+        batch_size: Optional[int] = None
+    ) -> List[np.ndarray]:
+        """
+        Synthesize several texts with one speaker embedding.
+        
+        All sentences of all texts are queued on the model's scheduler together
+        and run length-sorted in padded batches when the model supports
+        batched inference (VITS/YourTTS), and one at a time otherwise.
+        
+        Args:
+            texts: Texts to speak
+            speaker_embedding: Embedding from get_speaker_embedding
+            language: Language code shared by all texts
+            batch_size: Sentences per forward pass (defaults to BATCH_SIZE; at most
+                the scheduler's max_batch_size)
+            
+        Returns:
+            Float32 waveform per text, in input order
+        """
+        with self.registry.borrow(self.MODEL_NAME) as tts:
+            language_id = self._language_id(language)
+            sentences = [
+                (index, sentence)
+                for index, text in enumerate(texts)
+                for sentence in tts.synthesizer.split_into_sentences(text)
+            ]
+            # The shared batch function lets these sentences batch with other sessions' too
+            futures = self._scheduler().submit_many(
+                [_SentenceJob(sentence, speaker_embedding, language_id, batch_size) for _, sentence in sentences],
+                self._synthesize_jobs
+            )
+            wavs = [future.result() for future in futures]
+        
+        pieces: List[List[np.ndarray]] = [[] for _ in texts]
+        for (index, _), wav in zip(sentences, wavs):
+            if pieces[index]:
+                pieces[index].append(np.zeros(self.SENTENCE_PAUSE_SAMPLES, dtype=np.float32))
+            pieces[index].append(wav)
+        return [np.concatenate(p) if p else np.zeros(0, dtype=np.float32) for p in pieces]
+    
+    def clone_batch(
+        self,
+        texts: List[Union[str, VoiceCloneRequest]],
+        voice: str,
+        language: str = "en",
+        batch_size: Optional[int] = None
+    ) -> List[TTSResponse]:
         """
-        Process reference audio to required format (22050Hz mono).
+        Clone one voice for many texts, sharing reference processing and model setup.
         
         Args:
-            audio_path: Path to reference audio file
+            texts: Texts (or VoiceCloneRequests) to speak
+            voice: Enrolled voice ID or path to a reference audio file
+            language: Language for plain-string texts
+            batch_size: Sentences per forward pass (defaults to BATCH_SIZE)
             
         Returns:
-            Path to processed audio file
+            TTSResponse per text, in input order, with per-item timings
         """
+        batch_start = time.perf_counter()
+        responses: List[Optional[TTSResponse]] = [None] * len(texts)
+        requests: Dict[int, VoiceCloneRequest] = {}
+        for index, item in enumerate(texts):
+            try:
+                requests[index] = item if isinstance(item, VoiceCloneRequest) else VoiceCloneRequest(
+                    text=item, language=language
+                )
+            except Exception as e:
+                responses[index] = TTSResponse(success=False, message="Invalid request", error=str(e))
+        
+        if not requests:
+            return responses
+        
+        # Process the reference once for the whole batch
         try:
-            import librosa
+            setup_start = time.perf_counter()
+            if Path(voice).is_file():
+                reference_audio_path, voice_id = voice, None
+            else:
+                reference_audio_path, voice_id = None, voice
+            speaker_key = self._speaker_key(reference_audio_path, voice_id)
+            speaker_embedding = self.resolve_speaker_embedding(reference_audio_path, voice_id, speaker_key)
+            if speaker_embedding is None:
+                raise ValueError("Could not process the reference audio file")
+            setup_time = (time.perf_counter() - setup_start) / len(requests)
+        except Exception as e:
+            logger.error(f"Error in batch voice cloning: {str(e)}")
+            for index in requests:
+                responses[index] = TTSResponse(success=False, message="Failed to clone voice", error=str(e))
+            return responses
+        
+        # One model pass per language group, skipping cached items
+        groups: Dict[str, List[int]] = {}
+        cache_keys: Dict[int, str] = {}
+        for index, request in requests.items():
+            cache_keys[index] = self._cache_key(request, speaker_key)
+            cached_file = self.synthesis_cache.get(cache_keys[index])
+            if cached_file is not None:
+                responses[index] = TTSResponse(
+                    success=True, message="Voice cloned successfully", file_path=cached_file
+                )
+                continue
+            groups.setdefault(request.language, []).append(index)
+        
+        for group_language, indices in groups.items():
+            try:
+                synth_start = time.perf_counter()
+                wavs = self.synthesize_batch(
+                    [requests[i].text for i in indices], speaker_embedding, group_language, batch_size
+                )
+                synth_time = time.perf_counter() - synth_start
+            except Exception as e:
+                logger.error(f"Error in batch voice cloning ({group_language}): {str(e)}")
+                for index in indices:
+                    responses[index] = TTSResponse(success=False, message="Failed to clone voice", error=str(e))
+                continue
             
-            # Read audio file
-            audio, sr = sf.read(audio_path)
+            total_samples = sum(len(wav) for wav in wavs) or 1
+            for index, wav in zip(indices, wavs):
+                write_start = time.perf_counter()
+                output_file = self._write_output(wav, "cloned_voice")
+                self.synthesis_cache.put(cache_keys[index], str(output_file))
+                responses[index] = TTSResponse(
+                    success=True,
+                    message="Voice cloned successfully",
+                    file_path=str(output_file),
+                    timings={
+                        "setup": round(setup_time, 4),
+                        "synthesis": round(synth_time * len(wav) / total_samples, 4),
+                        "write": round(time.perf_counter() - write_start, 4),
+                    }
+                )
+        
+        logger.info(f"Cloned batch of {len(texts)} texts in {time.perf_counter() - batch_start:.2f}s")
+        return responses
+    
+    def _speaker_key(
+        self,
+        reference_audio_path: Optional[str],
+        voice_id: Optional[str],
+        reference_audio: Optional[AudioBuffer] = None
+    ) -> str:
+        """Content identity of the speaker: enrolled clip hashes or the reference audio hash."""
+        if voice_id is not None:
+            profile = self.voice_library.get_profile(voice_id)
+            if profile is None:
+                raise VoiceNotFoundError(f"Voice '{voice_id}' is not enrolled")
+            return "voice:" + ",".join(profile.source_hashes)
+        if reference_audio is not None:
+            return self.embedding_cache.hash_bytes(reference_audio)
+        if reference_audio_path is None:
+            raise ValueError("Either reference_audio_path or voice_id is required")
+        return self.embedding_cache.hash_file(reference_audio_path)
+    
+    def _cache_key(self, request: VoiceCloneRequest, speaker_key: str) -> str:
+        """Synthesis cache key for a request."""
+        return SynthesisCache.make_key(
+            engine="coqui",
+            model=self.MODEL_NAME,
+            text=request.text,
+            language=request.language,
+            speaker=speaker_key,
+            speed=1.0,
+            **self._effects_field()
+        )
+    
+    def _effects_field(self) -> dict:
+        """Cache key field for the output chain (absent without one, so plain keys are unchanged)."""
+        return {"effects": self.output_chain.key} if self.output_chain is not None else {}
+    
+    def _output_suffix(self) -> str:
+        """Extension of written outputs."""
+        return f".{self.output_chain.format}" if self.output_chain is not None else ".wav"
+    
+    def _write_output(self, wav: np.ndarray, prefix: str) -> Path:
+        """
+        Write synthesized audio to a new file in the output store, through the output chain if set.
+        
+        Args:
+            wav: Float32 waveform at the model sample rate
+            prefix: File name prefix
             
-            # Convert stereo to mono if needed
-            if len(audio.shape) > 1:
-                audio = np.mean(audio, axis=1)
+        Returns:
+            Path of the written file
+        """
+        with self.output_store.reserve(prefix, self._output_suffix()) as output_file:
+            if self.output_chain is None:
+                sf.write(str(output_file), wav, self.sample_rate)
+            else:
+                self.output_chain.render(wav, self.sample_rate, str(output_file))
+        return output_file
+    
+    def _language_id(self, language: str) -> Optional[int]:
+        """Map a language code to the cloning model's language ID."""
+        language_manager = getattr(self.tts.synthesizer.tts_model, "language_manager", None)
+        if language_manager is None:
+            return None
+        if language not in language_manager.name_to_id:
+            raise ValueError(f"Language '{language}' not supported by the cloning model")
+        return language_manager.name_to_id[language]
+    
+    def _scheduler(self) -> InferenceScheduler:
+        """Scheduler that owns the cloning model."""
+        return InferenceScheduler.for_model(self.MODEL_NAME, self.registry)
+    
+    @classmethod
+    def _synthesize_jobs(
+        cls,
+        tts: "TTS",
+        jobs: List[_SentenceJob]
+    ) -> List[np.ndarray]:
+        """
+        Batch function for the scheduler: synthesize sentences from any number of requests.
+        
+        A classmethod, so sentences queued by different VoiceClone instances
+        (one per session) share batches. Jobs that ask for a batch size run
+        at the smallest one in the batch, the others at BATCH_SIZE.
+        
+        Args:
+            tts: Cloning model (borrowed by the scheduler)
+            jobs: Sentences with their speaker embedding, language and batch size
             
-            # Resample to 22050Hz if needed
-            if sr != 22050:
-                audio = librosa.resample(audio, orig_sr=sr, target_sr=22050)
+        Returns:
+            Float32 waveform per job, in input order
+        """
+        model = tts.synthesizer.tts_model
+        if cls._supports_batch_inference(model):
+            sizes = [job.batch_size for job in jobs if job.batch_size]
+            return cls._infer_batched(model, jobs, min(sizes) if sizes else cls.BATCH_SIZE)
+        return [cls._synthesize_sentence(tts, job) for job in jobs]
+    
+    @staticmethod
+    def _synthesize_sentence(tts: "TTS", job: _SentenceJob) -> np.ndarray:
+        """Synthesize one sentence with Coqui's synthesis helper."""
+        from TTS.tts.utils.synthesis import synthesis
+        
+        synthesizer = tts.synthesizer
+        outputs = synthesis(
+            model=synthesizer.tts_model,
+            text=job.sentence,
+            CONFIG=synthesizer.tts_config,
+            use_cuda=synthesizer.use_cuda,
+            d_vector=job.speaker_embedding,
+            language_id=job.language_id,
+        )
+        return np.asarray(outputs["wav"], dtype=np.float32).squeeze()
+    
+    @staticmethod
+    def _supports_batch_inference(model) -> bool:
+        """Whether a model can run padded multi-sentence batches."""
+        return type(model).__name__ == "Vits"
+    
+    @staticmethod
+    def _infer_batched(model, jobs: List[_SentenceJob], batch_size: int) -> List[np.ndarray]:
+        """Run VITS inference on length-sorted, padded batches, one speaker and language per row."""
+        import torch
+        
+        device = next(model.parameters()).device
+        hop_length = model.config.audio.hop_length
+        
+        token_ids = [
+            torch.as_tensor(model.tokenizer.text_to_ids(job.sentence, language=job.language_id), dtype=torch.long)
+            for job in jobs
+        ]
+        order = sorted(range(len(jobs)), key=lambda i: len(token_ids[i]))
+        
+        wavs: List[Optional[np.ndarray]] = [None] * len(jobs)
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            lengths = [len(token_ids[i]) for i in chunk]
+            x = torch.zeros(len(chunk), max(lengths), dtype=torch.long, device=device)
+            for row, i in enumerate(chunk):
+                x[row, :lengths[row]] = token_ids[i]
             
-            # Save processed audio
-            processed_path = self.temp_dir / f"processed_ref_{self._generate_timestamp()}.wav"
-            sf.write(str(processed_path), audio, 22050)
+            d_vectors = np.stack([np.asarray(jobs[i].speaker_embedding, dtype=np.float32).reshape(-1) for i in chunk])
+            language_ids = [jobs[i].language_id for i in chunk]
+            aux_input = {
+                "x_lengths": torch.tensor(lengths, device=device),
+                "d_vectors": torch.as_tensor(d_vectors, device=device),
+                "language_ids": (
+                    torch.tensor(language_ids, dtype=torch.long, device=device)
+                    if language_ids[0] is not None else None
+                ),
+            }
+            outputs = model.inference(x, aux_input=aux_input)
             
-            logger.info(f"Reference audio processed: {processed_path}")
-            return processed_path
+            waveforms = outputs["model_outputs"].squeeze(1).cpu().numpy()
+            wav_lengths = (outputs["y_mask"].sum(dim=(1, 2)).long() * hop_length).cpu().numpy()
+            for row, i in enumerate(chunk):
+                wavs[i] = waveforms[row, :wav_lengths[row]].astype(np.float32)
+        return wavs
+    
+    def embedding_cache_stats(self) -> dict:
+        """Get speaker embedding cache hit/miss counts."""
+        return self.embedding_cache.stats()
+    
+    def _process_reference_audio(
+        self,
+        reference_audio: Union[str, AudioBuffer],
+        target_sr: int
+    ) -> Optional[np.ndarray]:
+        """
+        Load reference audio as a mono float32 waveform at the speaker encoder rate.
+        
+        The clip is decoded, mixed down and resampled in memory, in a single
+        resampling step straight to ``target_sr``.
+        
+        Args:
+            reference_audio: Path to reference audio file or encoded audio in memory
+            target_sr: Sample rate expected by the speaker encoder
+            
+        Returns:
+            Processed waveform, or None if the file could not be read
+        """
+        try:
+            audio, sr = sf.read(self._audio_source(reference_audio), dtype="float32")
+            
+            # Convert stereo to mono if needed
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1, dtype=np.float32)
+            
+            audio = resample(audio, sr, target_sr)
+            logger.info(f"Reference audio processed: {len(audio) / target_sr:.2f}s at {target_sr}Hz")
+            return audio
             
         except Exception as e:
             logger.error(f"Error processing reference audio: {str(e)}")
             return None
     
-    def validate_reference_audio(self, audio_path: str) -> dict:
+    def validate_reference_audio(self, reference_audio: Union[str, AudioBuffer]) -> dict:
         """
-        Validate reference audio file.
+        Validate reference audio.
+        
+        Only the container header is parsed (and cached), so validating an
+        upload on every page rerun does not decode it.
         
         Args:
-            audio_path: Path to reference audio file
+            reference_audio: Path to reference audio file or encoded audio in memory
             
         Returns:
             Dictionary with validation results
         """
         try:
-            audio, sr = sf.read(audio_path)
-            duration = len(audio) / sr if sr else 0
-            
-            # Convert stereo to mono for duration calculation
-            if len(audio.shape) > 1:
-                audio = np.mean(audio, axis=1)
+            info = AudioProbe.shared().probe(reference_audio)
+            duration = info.duration
             
             # Check duration
             is_valid_duration = 3 <= duration <= 30
@@ -161,8 +747,8 @@ class VoiceClone:
             return {
                 "valid": True,
                 "duration": round(duration, 2),
-                "sample_rate": sr,
-                "channels": "stereo" if len(audio.shape) > 1 else "mono",
+                "sample_rate": info.sample_rate,
+                "channels": "stereo" if info.channels > 1 else "mono",
                 "message": "Audio is valid" if is_valid_duration else "Audio duration should be between 3-30 seconds"
             }
             
@@ -174,10 +760,11 @@ class VoiceClone:
             }
     
     @staticmethod
-    def _generate_timestamp() -> str:
-        """Generate unique timestamp for filename."""
-        from datetime import datetime
-        return datetime.now().strftime("%Y%m%d_%H%M%S")
+    def _audio_source(reference_audio: Union[str, AudioBuffer]) -> Union[str, BinaryIO]:
+        """Wrap in-memory audio in a file object that soundfile can read."""
+        if isinstance(reference_audio, (bytes, bytearray, memoryview)):
+            return io.BytesIO(reference_audio)
+        return str(reference_audio)
     
     @classmethod
     def get_supported_languages(cls) -> dict:
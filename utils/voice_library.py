@@ -0,0 +1,303 @@
+"""
+Persistent library of enrolled voices with precomputed speaker embeddings.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.schemas import VoiceProfile
+
+logger = logging.getLogger(__name__)
+
+
+class VoiceNotFoundError(ValueError):
+    """A voice ID that is not enrolled in the library."""
+
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.ogg', '.flac', '.m4a'}
+
+# Per-process VoiceClone used by bulk enrollment workers
+_worker_clone = None
+
+
+def _init_enrollment_worker(temp_dir: str) -> None:
+    """Load the cloning model once in each enrollment worker process."""
+    global _worker_clone
+    from utils.voice_clone import VoiceClone
+    _worker_clone = VoiceClone(temp_dir=temp_dir)
+
+
+def _compute_voice_embedding(job: Tuple[str, List[str]]) -> Tuple[str, Optional[np.ndarray], List[str]]:
+    """Average the speaker embeddings of one voice's clips inside a worker process."""
+    voice_id, clip_paths = job
+    try:
+        embedding, hashes = VoiceLibrary.average_embedding(_worker_clone, clip_paths)
+        return voice_id, embedding, hashes
+    except Exception as e:
+        logger.error(f"Error enrolling voice '{voice_id}': {str(e)}")
+        return voice_id, None, []
+
+
+class VoiceLibrary:
+    """Named speaker profiles stored on disk and memory-mapped on load."""
+
+    _shared: Optional["VoiceLibrary"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, library_dir: str = "voices"):
+        """
+        Initialize the library and map every stored profile.
+
+        Each voice is stored as ``<voice_id>.npy`` (float32 embedding) plus
+        ``<voice_id>.json`` (VoiceProfile metadata).
+
+        Args:
+            library_dir: Directory holding the stored profiles
+        """
+        self.library_dir = Path(library_dir)
+        self.library_dir.mkdir(parents=True, exist_ok=True)
+        self._profiles: Dict[str, VoiceProfile] = {}
+        self._embeddings: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def shared(cls) -> "VoiceLibrary":
+        """Get the library shared by every session in this process."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def _load(self) -> None:
+        """Memory-map all stored embeddings."""
+        for meta_path in sorted(self.library_dir.glob("*.json")):
+            embedding_path = meta_path.with_suffix(".npy")
+            try:
+                profile = VoiceProfile.model_validate_json(meta_path.read_text())
+                embedding = np.load(embedding_path, mmap_mode="r")
+            except Exception as e:
+                logger.error(f"Skipping voice profile {meta_path.name}: {str(e)}")
+                continue
+            self._profiles[profile.voice_id] = profile
+            self._embeddings[profile.voice_id] = embedding
+        logger.info(f"Voice library loaded: {len(self._profiles)} voices from {self.library_dir}")
+
+    def __contains__(self, voice_id: str) -> bool:
+        return voice_id in self._profiles
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def list_voices(self) -> List[VoiceProfile]:
+        """Get all enrolled voice profiles."""
+        return list(self._profiles.values())
+
+    def get_profile(self, voice_id: str) -> Optional[VoiceProfile]:
+        """Get a voice profile by ID."""
+        return self._profiles.get(voice_id)
+
+    def get_embedding(self, voice_id: str) -> Optional[np.ndarray]:
+        """Get the (memory-mapped) averaged embedding for a voice."""
+        return self._embeddings.get(voice_id)
+
+    def enroll(
+        self,
+        voice_id: str,
+        clip_paths: List[str],
+        voice_clone=None,
+        name: str = "",
+        metadata: Optional[Dict[str, str]] = None
+    ) -> VoiceProfile:
+        """
+        Enroll a voice from one or more reference clips.
+
+        Args:
+            voice_id: Unique voice identifier
+            clip_paths: Reference clips of the same speaker
+            voice_clone: VoiceClone used to compute embeddings (created if omitted)
+            name: Display name
+            metadata: Free-form metadata stored with the profile
+
+        Returns:
+            The saved VoiceProfile
+        """
+        if not clip_paths:
+            raise ValueError("At least one reference clip is required")
+        if voice_clone is None:
+            from utils.voice_clone import VoiceClone
+            voice_clone = VoiceClone()
+        embedding, hashes = self.average_embedding(voice_clone, clip_paths)
+        return self.save(voice_id, embedding, hashes, clip_paths, voice_clone.MODEL_NAME, name, metadata)
+
+    def enroll_directory(self, directory: str, workers: Optional[int] = None) -> List[VoiceProfile]:
+        """
+        Enroll every voice in a directory across a process pool.
+
+        Each subdirectory is one voice (named after the subdirectory) and each
+        loose audio file is a single-clip voice (named after the file stem).
+
+        Args:
+            directory: Directory of reference clips
+            workers: Number of worker processes (defaults to the CPU count)
+
+        Returns:
+            Profiles that were enrolled successfully
+        """
+        jobs = self._collect_voices(Path(directory))
+        if not jobs:
+            logger.warning(f"No audio clips found in {directory}")
+            return []
+
+        from utils.voice_clone import VoiceClone
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        logger.info(f"Enrolling {len(jobs)} voices with {workers} workers")
+
+        clips_by_voice = dict(jobs)
+        profiles = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_enrollment_worker,
+            initargs=("temp",)
+        ) as pool:
+            for voice_id, embedding, hashes in pool.map(_compute_voice_embedding, jobs):
+                if embedding is None:
+                    continue
+                try:
+                    profiles.append(self.save(
+                        voice_id, embedding, hashes, clips_by_voice[voice_id], VoiceClone.MODEL_NAME
+                    ))
+                except Exception as e:
+                    # One bad voice must not drop the ones still pending
+                    logger.error(f"Error saving voice '{voice_id}': {str(e)}")
+        return profiles
+
+    def save(
+        self,
+        voice_id: str,
+        embedding: np.ndarray,
+        source_hashes: List[str],
+        clip_paths: List[str],
+        model_name: str = "",
+        name: str = "",
+        metadata: Optional[Dict[str, str]] = None
+    ) -> VoiceProfile:
+        """
+        Write a profile to disk atomically and map it into the library.
+
+        Args:
+            voice_id: Unique voice identifier
+            embedding: Averaged speaker embedding
+            source_hashes: Content hashes of the enrolled clips
+            clip_paths: Enrolled clips
+            model_name: Model whose speaker encoder produced the embedding
+            name: Display name
+            metadata: Free-form metadata
+
+        Returns:
+            The saved VoiceProfile
+        """
+        embedding = np.asarray(embedding, dtype=np.float32)
+        profile = VoiceProfile(
+            voice_id=voice_id,
+            name=name or voice_id,
+            source_hashes=source_hashes,
+            source_files=[Path(p).name for p in clip_paths],
+            embedding_dim=int(embedding.size),
+            model_name=model_name,
+            created_at=datetime.now().isoformat(),
+            metadata=metadata or {},
+        )
+
+        embedding_path = self.library_dir / f"{voice_id}.npy"
+        meta_path = self.library_dir / f"{voice_id}.json"
+        tmp_embedding = embedding_path.with_suffix(".npy.tmp")
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        with open(tmp_embedding, "wb") as f:
+            np.save(f, embedding)
+        tmp_meta.write_text(profile.model_dump_json(indent=2))
+
+        with self._lock:
+            os.replace(tmp_embedding, embedding_path)
+            os.replace(tmp_meta, meta_path)
+            self._profiles[voice_id] = profile
+            self._embeddings[voice_id] = np.load(embedding_path, mmap_mode="r")
+
+        logger.info(f"Voice enrolled: {voice_id} ({len(clip_paths)} clips)")
+        return profile
+
+    def remove(self, voice_id: str) -> bool:
+        """
+        Delete a voice from the library.
+
+        Args:
+            voice_id: Voice to delete
+
+        Returns:
+            True if the voice existed, False otherwise
+        """
+        with self._lock:
+            existed = self._profiles.pop(voice_id, None) is not None
+            self._embeddings.pop(voice_id, None)
+            for suffix in (".json", ".npy"):
+                (self.library_dir / f"{voice_id}{suffix}").unlink(missing_ok=True)
+        return existed
+
+    @staticmethod
+    def average_embedding(voice_clone, clip_paths: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """
+        Compute the mean speaker embedding of several clips.
+
+        Args:
+            voice_clone: VoiceClone used to compute embeddings
+            clip_paths: Reference clips of the same speaker
+
+        Returns:
+            Tuple of (averaged embedding, content hashes of the clips)
+        """
+        embeddings = []
+        hashes = []
+        for clip_path in clip_paths:
+            embedding = voice_clone.get_speaker_embedding(str(clip_path))
+            if embedding is None:
+                raise ValueError(f"Could not process reference clip: {clip_path}")
+            embeddings.append(np.asarray(embedding, dtype=np.float32))
+            hashes.append(voice_clone.embedding_cache.hash_file(str(clip_path)))
+        return np.mean(np.stack(embeddings), axis=0), hashes
+
+    @staticmethod
+    def _collect_voices(directory: Path) -> List[Tuple[str, List[str]]]:
+        """
+        Group the clips in a directory by voice.
+
+        Voice IDs are derived from directory names and file stems and
+        sanitized to what VoiceProfile accepts ("John Smith" -> "John_Smith");
+        entries whose ID collides with an earlier one are skipped.
+        """
+        jobs = []
+        for entry in sorted(directory.iterdir()):
+            if entry.is_dir():
+                clips = [str(p) for p in sorted(entry.iterdir()) if p.suffix.lower() in AUDIO_EXTENSIONS]
+                if clips:
+                    jobs.append((entry.name, clips))
+            elif entry.suffix.lower() in AUDIO_EXTENSIONS:
+                jobs.append((entry.stem, [str(entry)]))
+
+        voices = {}
+        for name, clips in jobs:
+            voice_id = re.sub(r"[^A-Za-z0-9_-]", "_", name)[:64]
+            if voice_id in voices:
+                logger.warning(f"Skipping '{name}': voice ID '{voice_id}' is already used by another entry")
+                continue
+            if voice_id != name:
+                logger.info(f"Enrolling '{name}' as voice ID '{voice_id}'")
+            voices[voice_id] = clips
+        return list(voices.items())
@@ -0,0 +1,158 @@
+"""
+Progressive playback of streamed synthesis through a WebRTC audio track.
+"""
+import asyncio
+import fractions
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterator, Optional
+
+import av
+import numpy as np
+from aiortc import MediaStreamTrack
+
+from utils.streaming import AudioChunk
+
+logger = logging.getLogger(__name__)
+
+
+class PcmQueue:
+    """Thread-safe FIFO of mono float32 PCM fed by a synthesis thread."""
+
+    def __init__(self, sample_rate: int):
+        """
+        Initialize an empty queue.
+
+        Args:
+            sample_rate: Sample rate of every pushed chunk
+        """
+        self.sample_rate = sample_rate
+        self._chunks: deque = deque()
+        self._offset = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self.samples_pushed = 0
+        self.samples_played = 0
+
+    def push(self, samples: np.ndarray) -> None:
+        """Append a chunk of samples."""
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        with self._lock:
+            self._chunks.append(samples)
+            self.samples_pushed += len(samples)
+
+    def close(self) -> None:
+        """Mark the end of the stream."""
+        self._closed = True
+
+    @property
+    def finished(self) -> bool:
+        """Whether the producer is done and everything has been played."""
+        return self._closed and not self._chunks
+
+    def read(self, count: int) -> np.ndarray:
+        """
+        Pop exactly ``count`` samples, padding with silence on underrun.
+
+        Args:
+            count: Number of samples to read
+
+        Returns:
+            Float32 array of length ``count``
+        """
+        out = np.zeros(count, dtype=np.float32)
+        filled = 0
+        with self._lock:
+            while filled < count and self._chunks:
+                head = self._chunks[0]
+                take = min(count - filled, len(head) - self._offset)
+                out[filled:filled + take] = head[self._offset:self._offset + take]
+                filled += take
+                self._offset += take
+                if self._offset >= len(head):
+                    self._chunks.popleft()
+                    self._offset = 0
+            self.samples_played += filled
+        return out
+
+
+class QueuedAudioTrack(MediaStreamTrack):
+    """Audio track that plays a PcmQueue in real time (silence while waiting)."""
+
+    kind = "audio"
+
+    FRAME_SECONDS = 0.02
+
+    def __init__(self, pcm_queue: PcmQueue):
+        super().__init__()
+        self.pcm_queue = pcm_queue
+        self.samples_per_frame = int(pcm_queue.sample_rate * self.FRAME_SECONDS)
+        self._start: Optional[float] = None
+        self._timestamp = 0
+
+    async def recv(self) -> av.AudioFrame:
+        sample_rate = self.pcm_queue.sample_rate
+        if self._start is None:
+            self._start = time.time()
+        else:
+            self._timestamp += self.samples_per_frame
+            wait = self._start + self._timestamp / sample_rate - time.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        samples = self.pcm_queue.read(self.samples_per_frame)
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).reshape(1, -1)
+        frame = av.AudioFrame.from_ndarray(pcm, format="s16", layout="mono")
+        frame.sample_rate = sample_rate
+        frame.pts = self._timestamp
+        frame.time_base = fractions.Fraction(1, sample_rate)
+        return frame
+
+
+class PlaybackSession:
+    """Runs a streaming synthesis generator in the background and feeds a track."""
+
+    def __init__(
+        self,
+        chunks: Iterator[AudioChunk],
+        sample_rate: int,
+        output_path: Optional[str] = None,
+        on_finished: Optional[Callable[[], None]] = None
+    ):
+        """
+        Start synthesizing into a new queue.
+
+        Args:
+            chunks: Generator from convert_stream / clone_voice_stream
+            sample_rate: Sample rate of the generated chunks
+            output_path: WAV file the generator assembles (for download once done)
+            on_finished: Called from the synthesis thread once the generator is exhausted or fails
+        """
+        self.pcm_queue = PcmQueue(sample_rate)
+        self.track = QueuedAudioTrack(self.pcm_queue)
+        self.output_path = output_path
+        self.on_finished = on_finished
+        self.sentences_done = 0
+        self.time_to_first_audio: Optional[float] = None
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(chunks,), name="tts-playback", daemon=True)
+        self._thread.start()
+
+    def _run(self, chunks: Iterator[AudioChunk]) -> None:
+        try:
+            for chunk in chunks:
+                if self.time_to_first_audio is None:
+                    self.time_to_first_audio = chunk.elapsed
+                self.pcm_queue.push(chunk.samples)
+                self.sentences_done += 1
+        except Exception as e:
+            logger.error(f"Error in streaming synthesis: {str(e)}")
+            self.error = str(e)
+        finally:
+            self.pcm_queue.close()
+            if self.on_finished is not None:
+                self.on_finished()
+            self.done.set()